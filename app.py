@@ -1,13 +1,38 @@
 import streamlit as st
 import os
 from dotenv import load_dotenv
+from memo import TTLCache
+from metrics import collect_timings, start_http_server
 from product_analyzer import ProductAnalyzer
 
 # Load environment variables
 load_dotenv()
 
-# Initialize the product analyzer
-analyzer = ProductAnalyzer()
+@st.cache_resource
+def get_analyzer():
+    """
+    One analyzer (LLM client, catalog and caches) per process, shared across reruns and sessions.
+    Price ranges are served from canonical price bands so slider changes reuse earlier work.
+    """
+    return ProductAnalyzer(price_band_width=int(os.getenv("PRICE_BAND_WIDTH", 25000)))
+
+@st.cache_resource
+def get_results_memo():
+    """
+    Finished analyses per (platform, category, price range), shared across reruns and sessions.
+    """
+    return TTLCache(
+        ttl_seconds=float(os.getenv("RESULTS_CACHE_TTL", 3600)),
+        max_entries=int(os.getenv("RESULTS_CACHE_MAX_ENTRIES", 256))
+    )
+
+@st.cache_resource
+def start_metrics_server():
+    """
+    Serve Prometheus metrics on METRICS_PORT, once per process.
+    """
+    port = os.getenv("METRICS_PORT")
+    return start_http_server(int(port)) if port else None
 
 # Set page config
 st.set_page_config(
@@ -16,6 +41,11 @@ st.set_page_config(
     layout="wide"
 )
 
+# Shared across reruns, so widget changes don't rebuild the analyzer
+analyzer = get_analyzer()
+results_memo = get_results_memo()
+start_metrics_server()
+
 # Title and description
 st.title("🛍️ E-commerce Product Analyzer")
 st.markdown("""
@@ -48,52 +78,111 @@ with st.sidebar:
     )
     
     search_button = st.button("Analyze Products")
+    
+    show_timings = st.checkbox("Show timing breakdown")
+
+def render_results(results):
+    """
+    Render a (possibly partial) analysis; sections appear once their data has arrived.
+    """
+    st.header("Analysis Results")
+    
+    # Top Products
+    st.subheader("Top Products")
+    for product in results["top_products"]:
+        with st.expander(f"📱 {product['name']} - ₹{product['price']:,}"):
+            st.write("**Key Features:**")
+            for feature in product["features"]:
+                st.write(f"- {feature}")
+            st.write("**Customer Rating:**", product["rating"])
+    
+    # Price Analysis
+    if results["price_range"]:
+        st.subheader("Price Analysis")
+        st.write(f"Price Range: ₹{results['price_range']['min']:,} - ₹{results['price_range']['max']:,}")
+        st.write(f"Average Price: ₹{results['price_range']['average']:,.2f}")
+    
+    # Sentiment Analysis
+    st.subheader("Customer Sentiment")
+    if results['sentiment'].get('overall'):
+        st.write(f"Overall Sentiment: {results['sentiment']['overall']}")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.write("**Positive Points:**")
+        for point in results['sentiment']['positive_points']:
+            st.write(f"✅ {point}")
+    
+    with col2:
+        st.write("**Negative Points:**")
+        for point in results['sentiment']['negative_points']:
+            st.write(f"❌ {point}")
+
+def render_timings(timings):
+    """
+    Seconds spent per analysis stage; stages that ran in parallel can add up to more than the wall time.
+    """
+    st.subheader("Timing Breakdown")
+    if not timings:
+        st.write("Served from the results cache.")
+        return
+    st.table({
+        "Stage": list(timings),
+        "Time (ms)": [f"{seconds * 1000:,.1f}" for seconds in timings.values()],
+    })
 
 # Main content area
 if search_button and category:
-    with st.spinner("Analyzing products..."):
-        try:
-            # Get analysis results
-            results = analyzer.analyze_products(
-                platform=platform,
-                category=category,
-                min_price=price_range[0],
-                max_price=price_range[1]
-            )
-            
-            # Display results
-            st.header("Analysis Results")
-            
-            # Top Products
-            st.subheader("Top Products")
-            for product in results["top_products"]:
-                with st.expander(f"📱 {product['name']} - ₹{product['price']:,}"):
-                    st.write("**Key Features:**")
-                    for feature in product["features"]:
-                        st.write(f"- {feature}")
-                    st.write("**Customer Rating:**", product["rating"])
-            
-            # Price Analysis
-            st.subheader("Price Analysis")
-            st.write(f"Price Range: ₹{results['price_range']['min']:,} - ₹{results['price_range']['max']:,}")
-            st.write(f"Average Price: ₹{results['price_range']['average']:,.2f}")
-            
-            # Sentiment Analysis
-            st.subheader("Customer Sentiment")
-            st.write(f"Overall Sentiment: {results['sentiment']['overall']}")
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                st.write("**Positive Points:**")
-                for point in results['sentiment']['positive_points']:
-                    st.write(f"✅ {point}")
-            
-            with col2:
-                st.write("**Negative Points:**")
-                for point in results['sentiment']['negative_points']:
-                    st.write(f"❌ {point}")
+    analysis_key = (platform, " ".join(category.lower().split()), price_range[0], price_range[1])
+    results = results_memo.get(analysis_key)
+    if results is None:
+        with st.spinner("Analyzing products..."):
+            try:
+                # Stream analysis results and render each part as soon as it arrives
+                results = {
+                    "top_products": [],
+                    "price_range": None,
+                    "sentiment": {"overall": None, "positive_points": [], "negative_points": []}
+                }
+                placeholder = st.empty()
+                with collect_timings() as timings:
+                    for event, value in analyzer.analyze_products_stream(
+                        platform=platform,
+                        category=category,
+                        min_price=price_range[0],
+                        max_price=price_range[1]
+                    ):
+                        if event == "result":
+                            results = value
+                            results_memo.set(analysis_key, results)
+                        elif event == "product":
+                            results["top_products"].append(value)
+                        elif event == "price_range":
+                            results["price_range"] = value
+                        elif event == "overall":
+                            results["sentiment"]["overall"] = value
+                        elif event == "positive_point":
+                            results["sentiment"]["positive_points"].append(value)
+                        elif event == "negative_point":
+                            results["sentiment"]["negative_points"].append(value)
                     
-        except Exception as e:
-            st.error(f"An error occurred: {str(e)}")
+                        with placeholder.container():
+                            render_results(results)
+                st.session_state["last_results"] = results
+                st.session_state["last_timings"] = timings
+                        
+            except Exception as e:
+                st.error(f"An error occurred: {str(e)}")
+    else:
+        st.session_state["last_results"] = results
+        st.session_state["last_timings"] = {}
+        render_results(results)
+    if show_timings and "last_timings" in st.session_state:
+        render_timings(st.session_state["last_timings"])
+elif "last_results" in st.session_state:
+    # Widget changes rerun the script; show the last analysis without recomputing it
+    render_results(st.session_state["last_results"])
+    if show_timings:
+        render_timings(st.session_state.get("last_timings", {}))
 else:
-    st.info("👈 Please select a platform and enter a product category to begin analysis.") 
+    st.info("👈 Please select a platform and enter a product category to begin analysis.")
@@ -0,0 +1,303 @@
+"""
+Headless batch runner for bulk category analysis.
+
+Reads (platform, category, min_price, max_price) jobs from a JSONL or CSV
+file, analyzes them with a bounded worker pool and streams results to JSONL
+or Parquet. Ids of successful jobs are appended to a checkpoint file once
+their results are on disk, so rerunning the same command after a crash
+resumes where it stopped and retries failed jobs (a job may be written twice
+if the crash lands between the two writes).
+
+    python batch_runner.py jobs.jsonl --output results.jsonl --workers 8
+    python batch_runner.py jobs.csv --output results.parquet --workers 8
+    python batch_runner.py jobs.jsonl --output results.jsonl --llm-batch-size 4
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from dotenv import load_dotenv
+
+JOB_FIELDS = ("platform", "category", "min_price", "max_price")
+
+
+def _read_jsonl(f) -> Iterator[Any]:
+    """
+    Parsed JSONL lines; a line that is not valid JSON is yielded as the ValueError it raised.
+    """
+    for number, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield ValueError(f"line {number} is not valid JSON: {e}")
+
+
+def parse_job(row: Any) -> Dict:
+    """
+    Job fields of a row. Raises ValueError naming the first field that is missing or invalid.
+    """
+    if isinstance(row, Exception):
+        raise row
+    if not isinstance(row, dict):
+        raise ValueError(f"expected an object with {', '.join(JOB_FIELDS)}, got {row!r}")
+    job = {}
+    for field in JOB_FIELDS:
+        value = row.get(field)
+        if value is None or str(value).strip() == "":
+            raise ValueError(f"missing {field}")
+        if field in ("min_price", "max_price"):
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"invalid {field} {value!r}, expected an integer") from None
+        job[field] = value
+    return job
+
+
+def read_jobs(path: str) -> Iterator[Dict]:
+    """
+    Yield jobs from a .jsonl or .csv file. Each job gets a stable "id": the
+    file's own "id" field if present, otherwise a hash of the job fields.
+    Valid jobs have "error" None; rows that are not valid jobs (malformed
+    JSON, missing or non-integer fields) are yielded with the reason in
+    "error" and whichever text fields they had, so they can be reported as
+    failed without stopping the run.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = csv.DictReader(f) if path.endswith(".csv") else _read_jsonl(f)
+        for row in rows:
+            given_id = row.get("id") if isinstance(row, dict) else None
+            try:
+                job = parse_job(row)
+            except ValueError as e:
+                job = {field: None for field in JOB_FIELDS}
+                if isinstance(row, dict):
+                    job.update({field: row[field] for field in ("platform", "category") if isinstance(row.get(field), str)})
+                job_id = given_id or hashlib.sha1(repr(row).encode("utf-8")).hexdigest()[:16]
+                yield {"id": str(job_id), **job, "error": str(e)}
+                continue
+            job_id = given_id or hashlib.sha1(
+                json.dumps([job[field] for field in JOB_FIELDS]).encode("utf-8")
+            ).hexdigest()[:16]
+            yield {"id": str(job_id), **job, "error": None}
+
+
+def read_checkpoint(path: str) -> Set[str]:
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+class JsonlResultWriter:
+    """
+    Appends one JSON record per line; every record is on disk when `write` returns.
+    `write` and `close` return the records flushed to disk by the call.
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, record: Dict) -> List[Dict]:
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        return [record]
+
+    def close(self) -> List[Dict]:
+        self._file.close()
+        return []
+
+
+class ParquetResultWriter:
+    """
+    Writes records to the `path` directory as complete part files of up to
+    `batch_size` rows, so the dataset can be read back with
+    `pandas.read_parquet(path)`. A part file is written under a hidden name
+    and renamed into place once its footer is on disk, so a crash never
+    leaves a partial file in the dataset. `write` and `close` return the
+    records flushed to disk by the call.
+    """
+
+    def __init__(self, path: str, batch_size: int = 100):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet output needs pyarrow: pip install pyarrow")
+        self._pa = pa
+        self._schema = pa.schema([
+            ("id", pa.string()),
+            ("platform", pa.string()),
+            ("category", pa.string()),
+            ("min_price", pa.int64()),
+            ("max_price", pa.int64()),
+            ("result", pa.string()),
+            ("error", pa.string()),
+        ])
+        self._pq = pq
+        os.makedirs(path, exist_ok=True)
+        self._path = path
+        self._prefix = f"part-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self._parts = 0
+        self._batch_size = batch_size
+        self._rows: List[Dict] = []
+
+    def write(self, record: Dict) -> List[Dict]:
+        self._rows.append(record)
+        return self._flush() if len(self._rows) >= self._batch_size else []
+
+    def close(self) -> List[Dict]:
+        return self._flush()
+
+    def _flush(self) -> List[Dict]:
+        if not self._rows:
+            return []
+        rows = [
+            dict(row, result=json.dumps(row["result"], ensure_ascii=False) if row["result"] is not None else None)
+            for row in self._rows
+        ]
+        name = f"{self._prefix}-{self._parts:05d}.parquet"
+        # pyarrow skips dot-files when reading the directory, so the part only appears once complete
+        tmp = os.path.join(self._path, "." + name)
+        self._pq.write_table(self._pa.Table.from_pylist(rows, schema=self._schema), tmp)
+        os.replace(tmp, os.path.join(self._path, name))
+        self._parts += 1
+        flushed, self._rows = self._rows, []
+        return flushed
+
+
+def run_job(analyzer, job: Dict) -> Dict:
+    record = dict(job, result=None)
+    try:
+        record["result"] = analyzer.analyze_products(**{field: job[field] for field in JOB_FIELDS})
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    return record
+
+
+def run_batch(analyzer, jobs: List[Dict], llm_batch_size: int) -> List[Dict]:
+    """
+    Analyze a chunk of jobs, packing their product lists into shared LLM calls.
+    """
+    if llm_batch_size <= 1:
+        return [run_job(analyzer, job) for job in jobs]
+    try:
+        results = analyzer.analyze_products_batch(
+            [{field: job[field] for field in JOB_FIELDS} for job in jobs], batch_size=llm_batch_size
+        )
+    except Exception as e:
+        results = [e] * len(jobs)
+    records = []
+    for job, result in zip(jobs, results):
+        if isinstance(result, Exception):
+            records.append(dict(job, result=None, error=f"{type(result).__name__}: {result}"))
+        else:
+            records.append(dict(job, result=result, error=None))
+    return records
+
+
+def run(jobs_path: str, output: str, checkpoint: Optional[str] = None, workers: int = 4,
+        analysis_mode: Optional[str] = None, batch_size: int = 100, llm_batch_size: int = 1) -> Dict[str, int]:
+    """
+    Run every job not yet in the checkpoint and return counts of done, failed and skipped jobs.
+    With `llm_batch_size` > 1, each worker takes that many jobs at a time and
+    analyzes their product lists in shared LLM calls.
+    """
+    from product_analyzer import ProductAnalyzer
+
+    checkpoint = checkpoint or output + ".checkpoint"
+    done = read_checkpoint(checkpoint)
+    analyzer = ProductAnalyzer(analysis_mode=analysis_mode)
+    if output.endswith(".parquet"):
+        writer = ParquetResultWriter(output, batch_size)
+    else:
+        writer = JsonlResultWriter(output)
+
+    stats = {"done": 0, "failed": 0, "skipped": 0}
+    started = time.monotonic()
+    with open(checkpoint, "a", encoding="utf-8") as checkpoint_file, \
+            ThreadPoolExecutor(max_workers=workers) as pool:
+
+        def record_flushed(records: List[Dict]) -> None:
+            # Failed jobs stay out of the checkpoint so a rerun retries them
+            for record in records:
+                if record["error"] is None:
+                    checkpoint_file.write(record["id"] + "\n")
+            checkpoint_file.flush()
+
+        def collect(futures) -> None:
+            for future in futures:
+                for record in future.result():
+                    stats["failed" if record["error"] else "done"] += 1
+                    record_flushed(writer.write(record))
+
+        # Keep at most two chunks per worker in flight so huge job files stream through
+        in_flight = set()
+        chunk: List[Dict] = []
+        chunk_size = max(1, llm_batch_size)
+        try:
+            for job in read_jobs(jobs_path):
+                if job["id"] in done:
+                    stats["skipped"] += 1
+                    continue
+                done.add(job["id"])
+                if job["error"] is not None:
+                    # Invalid rows are reported, not analyzed
+                    stats["failed"] += 1
+                    record_flushed(writer.write(dict(job, result=None)))
+                    continue
+                chunk.append(job)
+                if len(chunk) < chunk_size:
+                    continue
+                in_flight.add(pool.submit(run_batch, analyzer, chunk, llm_batch_size))
+                chunk = []
+                if len(in_flight) >= workers * 2:
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(finished)
+            if chunk:
+                in_flight.add(pool.submit(run_batch, analyzer, chunk, llm_batch_size))
+        finally:
+            # Even if reading the jobs fails, finished work is written and checkpointed
+            collect(wait(in_flight).done)
+            record_flushed(writer.close())
+
+    elapsed = time.monotonic() - started
+    print(f"{stats['done']} done, {stats['failed']} failed, {stats['skipped']} skipped "
+          f"in {elapsed:.1f}s ({(stats['done'] + stats['failed']) / max(elapsed, 1e-9):.1f} jobs/s)")
+    print(f"LLM responses that could not be parsed: {analyzer.parse_failure_rate():.1%}")
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("jobs", help="Jobs file (.jsonl or .csv) with platform, category, min_price, max_price")
+    parser.add_argument("--output", required=True, help="Results file (.jsonl) or dataset directory (.parquet)")
+    parser.add_argument("--checkpoint", help="Completed job ids (default: <output>.checkpoint)")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--mode", choices=["llm", "hybrid", "local"], help="Analysis mode (default: ANALYSIS_MODE or llm)")
+    parser.add_argument("--batch-size", type=int, default=100, help="Rows per Parquet part file")
+    parser.add_argument("--llm-batch-size", type=int, default=1,
+                        help="Jobs whose product lists share one LLM call (default: 1, no batching)")
+    parser.add_argument("--metrics-out", help="Write stage timings and counters here in Prometheus text format")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    stats = run(args.jobs, args.output, args.checkpoint, args.workers, args.mode, args.batch_size,
+                args.llm_batch_size)
+    if args.metrics_out:
+        from metrics import METRICS
+        with open(args.metrics_out, "w", encoding="utf-8") as f:
+            f.write(METRICS.render_prometheus())
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Benchmark LLM round-trips offline with the local stand-in provider.
+
+Analyzes catalog product lists sequentially, concurrently through the async
+API and packed into batched prompts, each with a fresh cache, and reports
+throughput and per-call latency. The stand-in's latency is configurable, so
+the numbers model a remote API without needing network access.
+
+    python benchmarks/bench_llm.py --latency 0.3 --tokens-per-second 800
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from llm_cache import LLMCache  # noqa: E402
+from llm_providers import LocalProvider  # noqa: E402
+from product_analyzer import ProductAnalyzer  # noqa: E402
+
+# Price windows per category; windows selecting the same products are skipped
+PRICE_WINDOWS = [(0, 30000), (0, 60000), (0, 100000), (20000, 200000), (0, 200000)]
+
+
+def build_jobs(analyzer):
+    jobs = []
+    seen = set()
+    for category in analyzer.catalog.categories():
+        for min_price, max_price in PRICE_WINDOWS:
+            names = tuple(product["name"] for product in analyzer.catalog.query(category, min_price, max_price))
+            if names and names not in seen:
+                seen.add(names)
+                jobs.append({"platform": "Amazon.in", "category": category,
+                             "min_price": min_price, "max_price": max_price})
+    return jobs
+
+
+def new_analyzer(provider, mode, cache_dir):
+    analyzer = ProductAnalyzer(
+        cache=LLMCache(os.path.join(cache_dir, f"{time.perf_counter_ns()}.sqlite")),
+        analysis_mode=mode, provider=provider, price_band_width=0,
+    )
+    # Skip the placeholder scraper's simulated network delay
+    analyzer._scrape_products = lambda platform, category, min_price, max_price: \
+        analyzer.catalog.query(category, min_price, max_price)
+    return analyzer
+
+
+def run_sequential(analyzer, jobs):
+    latencies = []
+    for job in jobs:
+        start = time.perf_counter()
+        analyzer.analyze_products(**job)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def run_concurrent(analyzer, jobs, concurrency):
+    async def main():
+        latencies = []
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(job):
+            async with semaphore:
+                start = time.perf_counter()
+                await analyzer.analyze_products_async(**job)
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(one(job) for job in jobs))
+        return latencies
+
+    return asyncio.run(main())
+
+
+def run_batched(analyzer, jobs, batch_size, concurrency):
+    start = time.perf_counter()
+    analyzer.analyze_products_batch(jobs, batch_size=batch_size, max_concurrency=concurrency)
+    # Every job in a batch finishes with the batch, so report the whole run per job
+    return [time.perf_counter() - start] * len(jobs)
+
+
+def report(name, jobs, latencies, elapsed, calls):
+    p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+    print(f"{name:<12} {len(jobs) / elapsed:>9.1f} {statistics.median(latencies) * 1000:>9.1f} "
+          f"{p95 * 1000:>9.1f} {calls:>7}")
+
+
+class CountingProvider(LocalProvider):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = 0
+
+    def respond(self, prompt):
+        self.calls += 1
+        return super().respond(prompt)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.2, help="Simulated seconds per LLM call")
+    parser.add_argument("--tokens-per-second", type=float, default=1000, help="Simulated generation speed")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument("--mode", choices=["llm", "hybrid"], default="llm")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        jobs = build_jobs(new_analyzer(LocalProvider(), args.mode, cache_dir))
+        print(f"{len(jobs)} jobs, {args.latency * 1000:.0f} ms latency, {args.tokens_per_second:.0f} tokens/s")
+        print(f"{'run':<12} {'jobs/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'calls':>7}")
+        runs = [
+            ("sequential", lambda analyzer: run_sequential(analyzer, jobs)),
+            ("concurrent", lambda analyzer: run_concurrent(analyzer, jobs, args.concurrency)),
+            ("batched", lambda analyzer: run_batched(analyzer, jobs, args.batch_size, args.concurrency)),
+        ]
+        for name, run in runs:
+            provider = CountingProvider(latency=args.latency, tokens_per_second=args.tokens_per_second)
+            analyzer = new_analyzer(provider, args.mode, cache_dir)
+            start = time.perf_counter()
+            latencies = run(analyzer)
+            report(name, jobs, latencies, time.perf_counter() - start, provider.calls)
+
+
+if __name__ == "__main__":
+    main()
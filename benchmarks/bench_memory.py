@@ -0,0 +1,82 @@
+"""
+Measure memory per product: product dicts against compact ProductRecords.
+
+Two cases are measured with tracemalloc, retained bytes divided by the
+number of products:
+
+  query    products returned by a catalog query, as dicts holding copied
+           feature and review lists versus records sharing the catalog's tuples
+  loaded   products parsed from JSON (as scraped or read from a file), where
+           every product holds its own strings, versus records with interned strings
+
+The catalog is repeated until there are --products products, so repeated
+features and reviews behave like a large listing of similar products.
+
+    python benchmarks/bench_memory.py --products 50000
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from catalog import ProductCatalog, get_default_catalog  # noqa: E402
+from records import as_records  # noqa: E402
+
+
+def measure(build):
+    """
+    Bytes retained by the object `build()` returns, and the object itself.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        value = build()
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0] - before, value
+    finally:
+        tracemalloc.stop()
+
+
+def repeated_products(count):
+    catalog = get_default_catalog()
+    base = [product.to_dict() for category in catalog.categories()
+            for product in catalog.query(category, 0, float("inf"))]
+    return [dict(base[i % len(base)], name=f"{base[i % len(base)]['name']} #{i}") for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=20000)
+    args = parser.parse_args()
+
+    products = repeated_products(args.products)
+    catalog = ProductCatalog({"bench": products})
+    payload = json.dumps(products)
+    del products
+
+    rows = []
+    dict_bytes, dicts = measure(lambda: [record.to_dict() for record in catalog.query("bench", 0, float("inf"))])
+    record_bytes, records = measure(lambda: catalog.query("bench", 0, float("inf")))
+    rows.append(("query", len(records), dict_bytes, record_bytes))
+    del dicts, records
+
+    dict_bytes, dicts = measure(lambda: json.loads(payload))
+    del dicts
+    # Parse inside the measurement so only the records' own memory is left afterwards
+    record_bytes, records = measure(lambda: as_records(json.loads(payload)))
+    rows.append(("loaded", len(records), dict_bytes, record_bytes))
+
+    print(f"{'case':<8} {'products':>9} {'dict B/product':>15} {'record B/product':>17} {'saved':>7}")
+    for case, count, dict_bytes, record_bytes in rows:
+        print(f"{case:<8} {count:>9} {dict_bytes / count:>15.0f} {record_bytes / count:>17.0f} "
+              f"{1 - record_bytes / dict_bytes:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark the HTML parser backends over a corpus of saved listing pages.
+
+Each backend runs in its own subprocess so that peak RSS (which includes
+memory allocated by C parsers such as lxml and selectolax) is measured in
+isolation. Pages are grouped by platform directory: <corpus>/<platform>/*.html
+
+    python benchmarks/bench_parsers.py --corpus fixtures --repeat 200
+"""
+import argparse
+import glob
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from html_backends import available_backends, get_backend  # noqa: E402
+from scraper import AmazonAdapter, FlipkartAdapter  # noqa: E402
+
+ADAPTERS = {adapter_cls.name: adapter_cls for adapter_cls in (AmazonAdapter, FlipkartAdapter)}
+
+
+def load_corpus(corpus: str):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(corpus, "*", "*.html"))):
+        platform = os.path.basename(os.path.dirname(path))
+        if platform in ADAPTERS:
+            with open(path, encoding="utf-8") as f:
+                pages.append((ADAPTERS[platform](), f.read()))
+    return pages
+
+
+def run_backend(name: str, corpus: str, repeat: int) -> dict:
+    pages = load_corpus(corpus)
+    backend = get_backend(name)
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    products = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for adapter, html in pages:
+            products += len(adapter.parse(html, backend))
+    elapsed = time.perf_counter() - start
+
+    # Python-level peak for one pass, traced separately so tracing doesn't skew the timing
+    tracemalloc.start()
+    for adapter, html in pages:
+        adapter.parse(html, backend)
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # ru_maxrss is in KiB on Linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "backend": backend.name,
+        "pages": len(pages) * repeat,
+        "products": products,
+        "pages_per_second": len(pages) * repeat / elapsed,
+        "python_peak_kib": python_peak / 1024,
+        "rss_growth_kib": peak_rss - baseline_rss,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=os.path.join(ROOT, "fixtures"))
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--backend", help="Run a single backend in this process and print JSON")
+    args = parser.parse_args()
+
+    if args.backend:
+        print(json.dumps(run_backend(args.backend, args.corpus, args.repeat)))
+        return
+
+    print(f"{'backend':<22} {'pages/s':>10} {'py peak KiB':>12} {'RSS growth KiB':>15}")
+    for name in available_backends():
+        output = subprocess.run(
+            [sys.executable, __file__, "--backend", name, "--corpus", args.corpus, "--repeat", str(args.repeat)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        stats = json.loads(output)
+        print(f"{stats['backend']:<22} {stats['pages_per_second']:>10.1f} "
+              f"{stats['python_peak_kib']:>12.1f} {stats['rss_growth_kib']:>15}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark the batch keyword sentiment scorer against the original fallback loop,
+and the full summary with clustered positive and negative points.
+
+Reviews are drawn from the catalog and repeated with numbered suffixes, so the
+batch has both unique and duplicate reviews.
+
+    python benchmarks/bench_sentiment.py --reviews 5000
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from catalog import get_default_catalog  # noqa: E402
+from review_clustering import ClusteredSentimentScorer  # noqa: E402
+from sentiment import KeywordSentimentScorer  # noqa: E402
+
+
+def legacy_classify(all_reviews):
+    # The keyword loop _create_fallback_result used before the batch scorer
+    positive_keywords = ["good", "great", "excellent", "amazing", "love", "perfect", "best", "recommend"]
+    negative_keywords = ["bad", "poor", "terrible", "disappointed", "issue", "problem", "worst", "avoid"]
+    positive_points = []
+    negative_points = []
+    for review in all_reviews:
+        for keyword in positive_keywords:
+            if keyword in review.lower() and review not in positive_points:
+                positive_points.append(review)
+        for keyword in negative_keywords:
+            if keyword in review.lower() and review not in negative_points:
+                negative_points.append(review)
+    return positive_points, negative_points
+
+
+def build_reviews(count: int):
+    catalog = get_default_catalog()
+    base = [
+        review
+        for category in catalog.categories()
+        for product in catalog.query(category, 0, float("inf"))
+        for review in product["reviews"]
+    ]
+    # About half of the batch repeats earlier reviews
+    return [f"{base[(i // 2) % len(base)]} #{i // 2}" for i in range(count)]
+
+
+def timed(fn, reviews, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(reviews)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reviews", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    scorer = KeywordSentimentScorer()
+    clustered = ClusteredSentimentScorer()
+    print(f"{'reviews':>8} {'legacy reviews/s':>17} {'scorer reviews/s':>17} {'speedup':>8} {'clustered ms':>13}")
+    for count in args.reviews:
+        reviews = build_reviews(count)
+        legacy = timed(legacy_classify, reviews, args.repeat)
+        batch = timed(scorer.classify_batch, reviews, args.repeat)
+        summary = timed(clustered.summarize, reviews, args.repeat)
+        print(f"{count:>8} {count / legacy:>17,.0f} {count / batch:>17,.0f} {legacy / batch:>7.1f}x "
+              f"{summary * 1000:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Measure cold-start cost of the analyzer module.
+
+Runs `python -X importtime -c "import product_analyzer"` in a fresh
+interpreter, prints the slowest imports by cumulative time, then times
+constructing a ProductAnalyzer and serving a local fallback analysis in
+another fresh interpreter. With --max-import-ms the script exits non-zero
+when the module import exceeds the budget, so it can guard CI.
+
+    python benchmarks/bench_startup.py --top 15 --max-import-ms 500
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Time construction and one fallback analysis; heavy modules loaded along the way are reported
+FIRST_USE_SNIPPET = """
+import sys, time
+start = time.perf_counter()
+import product_analyzer
+imported = time.perf_counter()
+analyzer = product_analyzer.ProductAnalyzer()
+constructed = time.perf_counter()
+products = analyzer.catalog.query("laptop", 0, float("inf"))
+analyzer._create_fallback_result(products)
+analyzed = time.perf_counter()
+heavy = [m for m in ("langchain", "langchain_groq", "requests", "bs4") if m in sys.modules]
+print(f"{imported - start:.4f} {constructed - imported:.4f} {analyzed - constructed:.4f} {','.join(heavy) or '-'}")
+"""
+
+
+def import_profile():
+    """
+    Return (module, self_us, cumulative_us) for every import of product_analyzer.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import product_analyzer"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((module.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--max-import-ms", type=float)
+    args = parser.parse_args()
+
+    rows = import_profile()
+    total_ms = next(cumulative for module, _, cumulative in rows if module == "product_analyzer") / 1000
+    print(f"import product_analyzer: {total_ms:.1f} ms ({len(rows)} modules)")
+    print(f"{'module':<50} {'self ms':>9} {'cumulative ms':>14}")
+    for module, self_us, cumulative_us in sorted(rows, key=lambda row: row[2], reverse=True)[:args.top]:
+        print(f"{module:<50} {self_us / 1000:>9.1f} {cumulative_us / 1000:>14.1f}")
+
+    output = subprocess.run(
+        [sys.executable, "-c", FIRST_USE_SNIPPET], cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stdout.split()
+    print()
+    print(f"import: {float(output[0]) * 1000:.1f} ms, construct: {float(output[1]) * 1000:.1f} ms, "
+          f"first fallback analysis: {float(output[2]) * 1000:.1f} ms")
+    print(f"heavy modules loaded: {output[3]}")
+
+    if args.max_import_ms is not None and total_ms > args.max_import_ms:
+        print(f"FAIL: import took {total_ms:.1f} ms, budget is {args.max_import_ms:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import json
+import os
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List
+
+from records import ProductRecord, intern_all
+
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "catalog.json")
+
+
+class _CategoryColumns:
+    """
+    Columnar storage for one category, sorted by price so that a price range
+    maps to a contiguous slice of every column. Strings are interned, so a
+    review or feature repeated across products is stored once.
+    """
+
+    __slots__ = ("prices", "ratings", "names", "features", "reviews")
+
+    def __init__(self, products: Iterable[Dict]):
+        rows = sorted(products, key=lambda p: p["price"])
+        self.prices = array("d", (p["price"] for p in rows))
+        self.ratings = array("d", (p["rating"] for p in rows))
+        self.names = [sys.intern(p["name"]) for p in rows]
+        self.features = [intern_all(p["features"]) for p in rows]
+        self.reviews = [intern_all(p["reviews"]) for p in rows]
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+
+class ProductCatalog:
+    """
+    In-memory product catalog with a per-category sorted price index.
+    A [min_price, max_price] query is answered with a bisect slice.
+    """
+
+    def __init__(self, products_by_category: Dict[str, List[Dict]]):
+        self._categories = {
+            category: _CategoryColumns(products)
+            for category, products in products_by_category.items()
+        }
+
+    @classmethod
+    def from_json(cls, path: str) -> "ProductCatalog":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def categories(self) -> List[str]:
+        return list(self._categories)
+
+    def __contains__(self, category: str) -> bool:
+        return category in self._categories
+
+    def __len__(self) -> int:
+        return sum(len(columns) for columns in self._categories.values())
+
+    def query(self, category: str, min_price: float, max_price: float) -> List[ProductRecord]:
+        """
+        Return the products of `category` priced within [min_price, max_price], cheapest first.
+        Records share their feature and review tuples with the catalog.
+        """
+        return list(self.iter_query(category, min_price, max_price))
+
+    def iter_query(self, category: str, min_price: float, max_price: float) -> Iterator[ProductRecord]:
+        """
+        Like `query`, but yields the records one at a time.
+        """
+        columns = self._categories.get(category)
+        if columns is None:
+            return
+        start = bisect_left(columns.prices, min_price)
+        end = bisect_right(columns.prices, max_price)
+        for i in range(start, end):
+            yield ProductRecord(columns.names[i], columns.prices[i], columns.features[i],
+                                columns.ratings[i], columns.reviews[i])
+
+
+@lru_cache(maxsize=None)
+def get_default_catalog(path: str = DEFAULT_CATALOG_PATH) -> ProductCatalog:
+    """
+    Load the catalog once per process and share it between analyzers.
+    """
+    return ProductCatalog.from_json(path)
@@ -0,0 +1,145 @@
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class CategoryRouter:
+    """
+    Routes free-text category queries to catalog categories.
+
+    Categories register their keywords and synonyms, each with a weight. All
+    keywords are compiled into a single Aho-Corasick automaton, so a query is
+    resolved in one pass regardless of how many categories are registered.
+    Keywords only match on word boundaries (a trailing plural "s"/"es" is
+    allowed), so "phone" does not match inside "headphones".
+
+    The best category is the one with the highest total keyword weight; ties
+    go to the longer matched text, then to the category registered first.
+    """
+
+    def __init__(self):
+        # keyword -> (category, weight)
+        self._keywords: Dict[str, Tuple[str, float]] = {}
+        # category -> registration order, used as the final tie-breaker
+        self._order: Dict[str, int] = {}
+        self._automaton: Optional[Tuple[List[Dict[str, int]], List[List[str]]]] = None
+
+    def register(self, category: str, keywords: Iterable[str], weight: float = 1.0) -> None:
+        """
+        Register `keywords` as pointing to `category`.
+        A keyword registered again is reassigned to the latest category.
+        """
+        self._order.setdefault(category, len(self._order))
+        for keyword in keywords:
+            keyword = " ".join(keyword.lower().split())
+            if keyword:
+                self._keywords[keyword] = (category, weight)
+        self._automaton = None
+
+    def categories(self) -> List[str]:
+        return list(self._order)
+
+    def scores(self, query: str) -> Dict[str, Tuple[float, int]]:
+        """
+        Return (total weight, matched length) per category matched in `query`.
+        """
+        text = " ".join(query.lower().split())
+        goto, outputs = self._compile()
+        scores: Dict[str, Tuple[float, int]] = {}
+        seen = set()
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = goto[state]["\0fail"]
+            state = goto[state].get(char, 0)
+            for keyword in outputs[state]:
+                start = i - len(keyword) + 1
+                if keyword in seen or not self._is_word_match(text, start, i + 1):
+                    continue
+                seen.add(keyword)
+                category, weight = self._keywords[keyword]
+                total, length = scores.get(category, (0.0, 0))
+                scores[category] = (total + weight, length + len(keyword))
+        return scores
+
+    def resolve(self, query: str) -> Optional[str]:
+        """
+        Return the best matching category for `query`, or None if nothing matches.
+        """
+        scores = self.scores(query)
+        if not scores:
+            return None
+        return min(scores, key=lambda c: (-scores[c][0], -scores[c][1], self._order[c]))
+
+    @staticmethod
+    def _is_word_match(text: str, start: int, end: int) -> bool:
+        if start > 0 and text[start - 1].isalnum():
+            return False
+        for suffix in ("", "s", "es"):
+            if text.startswith(suffix, end):
+                after = end + len(suffix)
+                if after == len(text) or not text[after].isalnum():
+                    return True
+        return False
+
+    def _compile(self) -> Tuple[List[Dict[str, int]], List[List[str]]]:
+        """
+        Build the Aho-Corasick automaton for the registered keywords.
+        Failure links are stored under the "\\0fail" key of each goto table.
+        """
+        if self._automaton is not None:
+            return self._automaton
+
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[str]] = [[]]
+        for keyword in self._keywords:
+            state = 0
+            for char in keyword:
+                if char not in goto[state]:
+                    goto.append({})
+                    outputs.append([])
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            outputs[state].append(keyword)
+
+        # Breadth-first pass to set failure links and merge outputs
+        goto[0]["\0fail"] = 0
+        queue = deque()
+        for char, child in list(goto[0].items()):
+            if char != "\0fail":
+                goto[child]["\0fail"] = 0
+                queue.append(child)
+        while queue:
+            state = queue.popleft()
+            for char, child in list(goto[state].items()):
+                if char == "\0fail":
+                    continue
+                fallback = goto[state]["\0fail"]
+                while fallback and char not in goto[fallback]:
+                    fallback = goto[fallback]["\0fail"]
+                link = goto[fallback].get(char, 0)
+                goto[child]["\0fail"] = link
+                outputs[child] = outputs[child] + outputs[goto[child]["\0fail"]]
+                queue.append(child)
+
+        self._automaton = (goto, outputs)
+        return self._automaton
+
+
+def build_default_router() -> CategoryRouter:
+    """
+    Create a router with the categories shipped in the product catalog.
+    """
+    router = CategoryRouter()
+    router.register("laptop", ["laptop", "notebook"])
+    router.register("laptop", ["gaming"], weight=0.5)
+    router.register("earbuds", ["earbuds", "earbud", "headphone", "earphone", "tws"])
+    router.register("smartwatch", ["smartwatch", "smart watch", "watch"])
+    router.register("smartphone", ["smartphone", "phone", "mobile", "iphone"])
+    router.register("tv", ["tv", "television", "smart tv"])
+    router.register("refrigerator", ["refrigerator", "fridge"])
+    router.register("washing_machine", ["washing machine", "washing", "washer"])
+    router.register("camera", ["camera", "dslr", "mirrorless"])
+    router.register("tablet", ["tablet", "ipad"])
+    router.register("printer", ["printer"])
+    router.register("ac", ["ac", "air conditioner", "split ac", "window ac"])
+    return router
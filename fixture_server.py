@@ -0,0 +1,93 @@
+import argparse
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+class FixtureServer:
+    """
+    Local HTTP stand-in for the e-commerce platforms, for running the scraper offline.
+
+    A request for /<platform>/<any path>?page=N is answered with
+    <fixtures_dir>/<platform>/pageN.html, or a 404 if there is no such fixture.
+    Point the scraper at it with `ScraperEngine(base_urls=server.base_urls())`.
+    """
+
+    def __init__(self, fixtures_dir: str = DEFAULT_FIXTURES_DIR, host: str = "127.0.0.1", port: int = 0):
+        self.fixtures_dir = fixtures_dir
+        handler = type("FixtureHandler", (_FixtureHandler,), {"fixtures_dir": fixtures_dir})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def base_urls(self) -> Dict[str, str]:
+        """
+        Base URL per platform, for every platform that has a fixtures directory.
+        """
+        return {
+            platform: f"{self.url}/{platform}"
+            for platform in sorted(os.listdir(self.fixtures_dir))
+            if os.path.isdir(os.path.join(self.fixtures_dir, platform))
+        }
+
+    def start(self) -> "FixtureServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FixtureServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    fixtures_dir = DEFAULT_FIXTURES_DIR
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        platform = parsed.path.strip("/").split("/")[0]
+        page = parse_qs(parsed.query).get("page", ["1"])[0]
+        path = os.path.join(self.fixtures_dir, os.path.basename(platform), f"page{page}.html")
+        if not platform or not page.isdigit() or not os.path.isfile(path):
+            self.send_error(404)
+            return
+        with open(path, "rb") as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve recorded listing pages for offline scraping.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES_DIR)
+    args = parser.parse_args()
+
+    server = FixtureServer(args.fixtures, port=args.port)
+    print(f"Serving fixtures from {args.fixtures} at {server.url}")
+    for platform, base_url in server.base_urls().items():
+        print(f"  {platform}: {base_url}")
+    server.serve_forever()
@@ -0,0 +1,112 @@
+import importlib.util
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+# Backend to use instead when the requested one's parser library is not installed
+FALLBACKS = {
+    "selectolax": "lxml+strainer",
+    "lxml+strainer": "html.parser+strainer",
+    "lxml": "html.parser",
+}
+
+
+class ParserBackend(ABC):
+    """
+    Minimal HTML API used by the platform adapters: find the product cards on
+    a listing page and read text out of them with CSS selectors.
+    """
+
+    name = ""
+
+    @abstractmethod
+    def cards(self, html: str, selector: str, strainer: Optional[Tuple[str, Dict]] = None) -> list:
+        ...
+
+    @abstractmethod
+    def text(self, node, selector: str) -> str:
+        ...
+
+    @abstractmethod
+    def texts(self, node, selector: str) -> List[str]:
+        ...
+
+
+class SoupBackend(ParserBackend):
+    """
+    BeautifulSoup with the given tree builder. With `strain` set, only the
+    product-card elements described by the adapter's strainer are built.
+    """
+
+    def __init__(self, features: str = "html.parser", strain: bool = False):
+        self.features = features
+        self.strain = strain
+        self.name = features + ("+strainer" if strain else "")
+
+    def cards(self, html: str, selector: str, strainer: Optional[Tuple[str, Dict]] = None) -> list:
+        from bs4 import BeautifulSoup, SoupStrainer
+
+        parse_only = SoupStrainer(strainer[0], attrs=strainer[1]) if self.strain and strainer else None
+        soup = BeautifulSoup(html, self.features, parse_only=parse_only)
+        return soup.select(selector)
+
+    def text(self, node, selector: str) -> str:
+        found = node.select_one(selector)
+        return found.get_text(" ", strip=True) if found is not None else ""
+
+    def texts(self, node, selector: str) -> List[str]:
+        return [found.get_text(" ", strip=True) for found in node.select(selector)]
+
+
+class SelectolaxBackend(ParserBackend):
+    """
+    selectolax with the lexbor engine: a C HTML5 parser with CSS selector support.
+    """
+
+    name = "selectolax"
+
+    def cards(self, html: str, selector: str, strainer: Optional[Tuple[str, Dict]] = None) -> list:
+        from selectolax.lexbor import LexborHTMLParser
+
+        return LexborHTMLParser(html).css(selector)
+
+    def text(self, node, selector: str) -> str:
+        found = node.css_first(selector)
+        return " ".join(found.text(separator=" ", strip=True).split()) if found is not None else ""
+
+    def texts(self, node, selector: str) -> List[str]:
+        return [" ".join(found.text(separator=" ", strip=True).split()) for found in node.css(selector)]
+
+
+# Name -> (module that must be importable, factory)
+BACKENDS = {
+    "html.parser": (None, lambda: SoupBackend("html.parser")),
+    "html.parser+strainer": (None, lambda: SoupBackend("html.parser", strain=True)),
+    "lxml": ("lxml", lambda: SoupBackend("lxml")),
+    "lxml+strainer": ("lxml", lambda: SoupBackend("lxml", strain=True)),
+    "selectolax": ("selectolax.lexbor", SelectolaxBackend),
+}
+
+
+def _installed(module: str) -> bool:
+    # find_spec imports the parent package of a dotted name, which raises if it is missing
+    try:
+        return importlib.util.find_spec(module) is not None
+    except ModuleNotFoundError:
+        return False
+
+
+def available_backends() -> List[str]:
+    return [name for name, (module, _) in BACKENDS.items() if module is None or _installed(module)]
+
+
+def get_backend(name: str) -> ParserBackend:
+    """
+    Return the named backend, falling back to a pure-Python one if its parser
+    library is not installed.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown parser backend '{name}', expected one of {list(BACKENDS)}")
+    available = available_backends()
+    while name not in available:
+        name = FALLBACKS[name]
+    return BACKENDS[name][1]()
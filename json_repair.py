@@ -0,0 +1,83 @@
+import json
+from typing import Any, Tuple
+
+# Closing bracket for each opening one, used to close truncated output
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+def repair_json(text: str) -> str:
+    """
+    Cheap fixes for almost-JSON LLM output: drops text around the outermost
+    object (code fences, preambles), `//` and `/* */` comments and trailing
+    commas, and closes strings, arrays and objects left open by a truncated
+    response. Text inside strings is left untouched.
+    """
+    start = text.find("{")
+    if start < 0:
+        return text
+    out = []
+    stack = []
+    in_string = escape = False
+    i = start
+    while i < len(text):
+        char = text[i]
+        if in_string:
+            out.append(char)
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+            i += 1
+            continue
+        if text.startswith("//", i):
+            newline = text.find("\n", i)
+            i = len(text) if newline < 0 else newline
+            continue
+        if text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = len(text) if end < 0 else end + 2
+            continue
+        if char == '"':
+            in_string = True
+        elif char in _CLOSERS:
+            stack.append(char)
+        elif char in "}]":
+            _drop_trailing_comma(out)
+            if stack:
+                stack.pop()
+            out.append(char)
+            if not stack:
+                break
+            i += 1
+            continue
+        out.append(char)
+        i += 1
+
+    # Truncated response: close whatever is still open
+    if in_string:
+        out.append('"')
+    while stack:
+        _drop_trailing_comma(out)
+        out.append(_CLOSERS[stack.pop()])
+    return "".join(out)
+
+
+def _drop_trailing_comma(out: list) -> None:
+    j = len(out) - 1
+    while j >= 0 and out[j].isspace():
+        j -= 1
+    if j >= 0 and out[j] == ",":
+        del out[j]
+
+
+def loads_lenient(text: str) -> Tuple[Any, bool]:
+    """
+    Parse `text` as JSON, falling back to `repair_json` if it is not valid as is.
+    Returns (value, repaired); raises ValueError if the repaired text is still invalid.
+    """
+    try:
+        return json.loads(text), False
+    except ValueError:
+        return json.loads(repair_json(text)), True
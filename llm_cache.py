@@ -0,0 +1,126 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class LLMCache:
+    """
+    Disk-backed cache for LLM analysis results.
+
+    Entries are keyed by a hash of the serialized product list, the prompt
+    template and the model name. Each entry expires after `ttl_seconds`, and
+    once more than `max_entries` are stored the least recently used ones are
+    evicted. Hit/miss counters live in the same SQLite file, so they can be
+    read from another process (see `read_stats`).
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 24 * 3600, max_entries: int = 1000):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries(last_access)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    @staticmethod
+    def make_key(products: Any, template: str, model_name: str) -> str:
+        """
+        Build a content-addressed key for the serialized products, prompt template and model.
+        """
+        payload = json.dumps(
+            {"products": products, "template": template, "model": model_name},
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached value for `key`, or None if it is missing or expired.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._increment("misses")
+                return None
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+            self._increment("hits")
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Store `value` under `key`, evicting least recently used entries if needed.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            self._evict(now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute("DELETE FROM stats")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return self._read_stats(self._conn)
+
+    @classmethod
+    def read_stats(cls, path: str) -> Dict[str, int]:
+        """
+        Read hit/miss counters from a cache file without opening it for writing.
+        """
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            return cls._read_stats(conn)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _read_stats(conn: sqlite3.Connection) -> Dict[str, int]:
+        stats = {"hits": 0, "misses": 0, "evictions": 0}
+        stats.update(dict(conn.execute("SELECT name, value FROM stats").fetchall()))
+        stats["entries"] = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return stats
+
+    def _increment(self, name: str, amount: int = 1) -> None:
+        self._conn.execute(
+            "INSERT INTO stats (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount),
+        )
+
+    def _evict(self, now: float) -> None:
+        # Drop expired entries first, then trim the least recently used ones
+        expired = self._conn.execute(
+            "DELETE FROM entries WHERE created_at < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        overflow = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM entries WHERE key IN "
+                "(SELECT key FROM entries ORDER BY last_access ASC LIMIT ?)",
+                (overflow,),
+            )
+        evicted = expired + max(overflow, 0)
+        if evicted:
+            self._increment("evictions", evicted)
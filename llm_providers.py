@@ -0,0 +1,235 @@
+import asyncio
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from typing import Any, Dict, Iterator, List, Optional
+
+from prompt_encoder import LIST_SEPARATOR, TABLE_HEADER
+from sentiment import KeywordSentimentScorer
+
+
+class LLMProvider(ABC):
+    """
+    A chat model the analyzer sends prompts to. Subclasses implement
+    `invoke`; async, streaming and batch calls default to running it in a
+    worker thread, all at once, and on a thread pool respectively.
+    """
+
+    name = "base"
+    default_model = ""
+
+    def __init__(self, model_name: Optional[str] = None):
+        self.model_name = model_name or self.default_model
+
+    @property
+    def key(self) -> str:
+        """
+        "provider:model", used to keep cached results of different models apart.
+        """
+        return f"{self.name}:{self.model_name}"
+
+    @abstractmethod
+    def invoke(self, prompt: str, json_mode: bool = False) -> str:
+        ...
+
+    async def ainvoke(self, prompt: str, json_mode: bool = False) -> str:
+        return await asyncio.to_thread(self.invoke, prompt, json_mode)
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        yield self.invoke(prompt)
+
+    def batch(self, prompts: List[str], json_mode: bool = False, max_concurrency: int = 4) -> List[Any]:
+        """
+        Responses in prompt order; a failed call's entry is the raised exception.
+        """
+        def call(prompt: str) -> Any:
+            try:
+                return self.invoke(prompt, json_mode)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=max(1, min(len(prompts), max_concurrency))) as pool:
+            return list(pool.map(call, prompts))
+
+
+class GroqProvider(LLMProvider):
+    """
+    Groq chat models through LangChain. The client is created on first use so
+    cache hits and fallbacks never import LangChain.
+    """
+
+    name = "groq"
+    default_model = "llama-3.1-8b-instant"
+
+    @cached_property
+    def llm(self):
+        from langchain_groq import ChatGroq
+        return ChatGroq(
+            api_key=os.getenv("GROQ_API_KEY"),
+            model_name=self.model_name,
+            # Bounds calls the analyzer stopped waiting for (see resilience.py)
+            request_timeout=float(os.getenv("LLM_TIMEOUT", 30))
+        )
+
+    @cached_property
+    def json_llm(self):
+        """
+        The model constrained to emit a single JSON object (Groq JSON mode).
+        """
+        return self.llm.bind(response_format={"type": "json_object"})
+
+    def _model(self, json_mode: bool):
+        return self.json_llm if json_mode else self.llm
+
+    def invoke(self, prompt: str, json_mode: bool = False) -> str:
+        return self._model(json_mode).invoke(prompt).content
+
+    async def ainvoke(self, prompt: str, json_mode: bool = False) -> str:
+        return (await self._model(json_mode).ainvoke(prompt)).content
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        # Groq does not stream JSON mode, so streams use the plain model
+        for chunk in self.llm.stream(prompt):
+            yield chunk.content
+
+    def batch(self, prompts: List[str], json_mode: bool = False, max_concurrency: int = 4) -> List[Any]:
+        responses = self._model(json_mode).batch(
+            prompts, config={"max_concurrency": max_concurrency}, return_exceptions=True
+        )
+        return [response if isinstance(response, Exception) else response.content for response in responses]
+
+
+class LocalProvider(LLMProvider):
+    """
+    Deterministic offline stand-in for benchmarks and CI. It reads the product
+    table(s) from the prompt and answers in the requested JSON schema: the
+    highest-rated products, the price range and a keyword sentiment summary.
+    Model latency is simulated with `latency` seconds per call plus
+    `tokens_per_second` for the response (0 means instant).
+    """
+
+    name = "local"
+    default_model = "canned"
+
+    def __init__(self, model_name: Optional[str] = None, latency: Optional[float] = None,
+                 tokens_per_second: Optional[float] = None):
+        super().__init__(model_name)
+        self.latency = latency if latency is not None else float(os.getenv("LOCAL_LLM_LATENCY", 0))
+        self.tokens_per_second = (
+            tokens_per_second if tokens_per_second is not None
+            else float(os.getenv("LOCAL_LLM_TOKENS_PER_SECOND", 0))
+        )
+        self.scorer = KeywordSentimentScorer()
+
+    def invoke(self, prompt: str, json_mode: bool = False) -> str:
+        response = self.respond(prompt)
+        time.sleep(self.latency + self._generation_time(response))
+        return response
+
+    async def ainvoke(self, prompt: str, json_mode: bool = False) -> str:
+        response = self.respond(prompt)
+        await asyncio.sleep(self.latency + self._generation_time(response))
+        return response
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        response = self.respond(prompt)
+        time.sleep(self.latency)
+        for start in range(0, len(response), 16):
+            chunk = response[start:start + 16]
+            time.sleep(self._generation_time(chunk))
+            yield chunk
+
+    def _generation_time(self, text: str) -> float:
+        return len(text) / 4 / self.tokens_per_second if self.tokens_per_second else 0.0
+
+    def respond(self, prompt: str) -> str:
+        """
+        The response for `prompt`, always the same for the same prompt.
+        """
+        tables = _product_tables(prompt)
+        full = '"top_products"' in prompt
+        if '"results"' in prompt:
+            return json.dumps({"results": {
+                list_id: self._analysis(products, full) for list_id, products in tables.items()
+            }})
+        products = next(iter(tables.values()), [])
+        return json.dumps(self._analysis(products, full))
+
+    def _analysis(self, products: List[Dict], full: bool) -> Dict[str, Any]:
+        sentiment = self.scorer.summarize(review for product in products for review in product["reviews"])
+        if not full:
+            return sentiment
+        prices = [product["price"] for product in products]
+        return {
+            "top_products": sorted(products, key=lambda product: product["rating"], reverse=True)[:3],
+            "price_range": {
+                "min": min(prices, default=0),
+                "max": max(prices, default=0),
+                "average": sum(prices) / len(prices) if prices else 0,
+            },
+            "sentiment": sentiment,
+        }
+
+
+def _product_tables(prompt: str) -> Dict[str, List[Dict]]:
+    """
+    Product rows of every table in the prompt, keyed by the "## <id>" heading before it ("1" if none).
+    """
+    tables: Dict[str, List[Dict]] = {}
+    list_id, rows = "1", None
+    for line in prompt.splitlines():
+        if line.startswith("## "):
+            list_id, rows = line[3:].strip(), None
+        elif line == TABLE_HEADER:
+            rows = tables.setdefault(list_id, [])
+        elif rows is not None:
+            fields = line.split("|")
+            if len(fields) != 5:
+                rows = None
+                continue
+            name, price, rating, features, reviews = fields
+            try:
+                rows.append({
+                    "name": name,
+                    "price": float(price),
+                    "rating": float(rating),
+                    "features": features.split(LIST_SEPARATOR) if features else [],
+                    "reviews": reviews.split(LIST_SEPARATOR) if reviews else [],
+                })
+            except ValueError:
+                rows = None
+    return tables
+
+
+PROVIDERS = {
+    "groq": GroqProvider,
+    "local": LocalProvider,
+}
+
+
+def get_provider(spec: str) -> LLMProvider:
+    """
+    Build a provider from "name" or "name:model", e.g. "groq:llama-3.1-8b-instant" or "local".
+    """
+    name, _, model_name = spec.strip().partition(":")
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown LLM provider '{name}', expected one of {list(PROVIDERS)}")
+    return PROVIDERS[name](model_name or None)
+
+
+def parse_routes(spec: str) -> Dict[str, str]:
+    """
+    Parse per-category provider routes, e.g. "earbuds=local,laptop=groq:llama-3.3-70b-versatile".
+    """
+    routes = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        category, separator, provider = item.partition("=")
+        if not separator:
+            raise ValueError(f"Invalid LLM route '{item}', expected category=provider[:model]")
+        routes[category.strip()] = provider.strip()
+    return routes
@@ -0,0 +1,94 @@
+import heapq
+import random
+from itertools import count
+from typing import Dict, Iterable, List, Optional
+
+# Reviews kept by the reservoir sample of a ProductStats
+REVIEW_SAMPLE_SIZE = 1000
+
+
+class ProductStats:
+    """
+    Aggregates over a stream of products, computed in one pass and in constant
+    memory: running min, max and mean price, the `top_n` highest-rated
+    products (a heap) and a uniform reservoir sample of `review_sample` reviews.
+
+    Streams of up to `review_sample` reviews are kept whole and in order, so
+    small product lists give the same results as aggregating the full list.
+    """
+
+    def __init__(self, top_n: int = 3, review_sample: int = REVIEW_SAMPLE_SIZE, seed: Optional[int] = 0):
+        self.top_n = top_n
+        self.review_sample = review_sample
+        self.count = 0
+        self.min_price = float("inf")
+        self.max_price = float("-inf")
+        self.total_price = 0.0
+        self.reviews_seen = 0
+        # (rating, -position, product) min-heap; the lowest-rated, latest product is evicted first
+        self._top: List[tuple] = []
+        self._positions = count()
+        self._reviews: List[str] = []
+        self._random = random.Random(seed)
+
+    def add(self, product: Dict) -> None:
+        price = product["price"]
+        self.count += 1
+        self.min_price = min(self.min_price, price)
+        self.max_price = max(self.max_price, price)
+        self.total_price += price
+
+        if self.top_n > 0:
+            entry = (product["rating"], -next(self._positions), product)
+            if len(self._top) < self.top_n:
+                heapq.heappush(self._top, entry)
+            elif entry[:2] > self._top[0][:2]:
+                heapq.heapreplace(self._top, entry)
+
+        if not self.review_sample:
+            return
+        for review in product["reviews"]:
+            self.reviews_seen += 1
+            if len(self._reviews) < self.review_sample:
+                self._reviews.append(review)
+            else:
+                # Algorithm R: keep the new review with probability sample / seen
+                slot = self._random.randrange(self.reviews_seen)
+                if slot < self.review_sample:
+                    self._reviews[slot] = review
+
+    def extend(self, products: Iterable[Dict]) -> "ProductStats":
+        for product in products:
+            self.add(product)
+        return self
+
+    def price_range(self) -> Dict[str, float]:
+        """
+        Min, max and average price (all zero if no products were added).
+        """
+        if not self.count:
+            return {"min": 0, "max": 0, "average": 0}
+        return {"min": float(self.min_price), "max": float(self.max_price), "average": self.total_price / self.count}
+
+    def top_products(self) -> List[Dict]:
+        """
+        The highest-rated products, best first; ties keep their stream order.
+        """
+        return [product for _, _, product in sorted(self._top, key=lambda entry: entry[:2], reverse=True)]
+
+    def reviews(self) -> List[str]:
+        return list(self._reviews)
+
+
+def compute_price_range(products: Iterable[Dict]) -> Dict[str, float]:
+    """
+    Min, max and average price of the products (all zero for an empty list).
+    """
+    return ProductStats(top_n=0, review_sample=0).extend(products).price_range()
+
+
+def top_products_by_rating(products: Iterable[Dict], n: int = 3) -> List[Dict]:
+    """
+    The `n` highest-rated products; ties keep their original order.
+    """
+    return ProductStats(top_n=n, review_sample=0).extend(products).top_products()
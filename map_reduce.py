@@ -0,0 +1,54 @@
+from typing import Any, Dict, List, Sequence, Tuple
+
+from price_bands import merge_sentiments
+
+
+def chunked(items: Sequence, size: int) -> List[Sequence]:
+    """
+    `items` split into consecutive chunks of at most `size`.
+    """
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def merge_price_ranges(weighted: Sequence[Tuple[int, Dict[str, float]]]) -> Dict[str, float]:
+    """
+    Price range of the union of chunks, from each chunk's range and product count.
+    Min and max are exact, and so is the average, weighted by product count.
+    """
+    weighted = [(count, price_range) for count, price_range in weighted if count > 0]
+    if not weighted:
+        return {"min": 0, "max": 0, "average": 0}
+    total = sum(count for count, _ in weighted)
+    return {
+        "min": min(price_range["min"] for _, price_range in weighted),
+        "max": max(price_range["max"] for _, price_range in weighted),
+        "average": sum(count * price_range["average"] for count, price_range in weighted) / total,
+    }
+
+
+def merge_top_products(product_lists: Sequence[Sequence[Dict]], n: int = 3) -> List[Dict]:
+    """
+    The `n` highest-rated products across the chunks' top products. Every
+    product of the overall top `n` is in its chunk's top `n`, so this is exact.
+    Ties keep chunk order; a product listed by two chunks is kept once.
+    """
+    unique: Dict[str, Dict] = {}
+    for products in product_lists:
+        for product in products:
+            unique.setdefault(str(product["name"]).strip().lower(), product)
+    return sorted(unique.values(), key=lambda product: product["rating"], reverse=True)[:n]
+
+
+def merge_analyses(weighted: Sequence[Tuple[int, Dict[str, Any]]], top_n: int = 3,
+                   max_points: int = 3) -> Dict[str, Any]:
+    """
+    Reduce step: merge per-chunk analysis dicts, each weighted by its product
+    count, into one. Sentiment is merged like price bands (weighted overall
+    label, points round-robin without duplicates).
+    """
+    sentiment = merge_sentiments([(count, result["sentiment"]) for count, result in weighted], max_points)
+    return {
+        "top_products": merge_top_products([result["top_products"] for _, result in weighted], top_n),
+        "price_range": merge_price_ranges([(count, result["price_range"]) for count, result in weighted]),
+        "sentiment": sentiment or {"overall": "Mixed", "positive_points": [], "negative_points": []},
+    }
@@ -0,0 +1,96 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Sentiment labels on a numeric scale, so per-band summaries can be averaged
+SENTIMENT_SCORES = {
+    "very positive": 2,
+    "positive": 1,
+    "mixed": 0,
+    "neutral": 0,
+    "negative": -1,
+    "very negative": -2,
+}
+
+
+def price_bands(min_price: float, max_price: float, width: int) -> List[Tuple[int, int]]:
+    """
+    Canonical half-open [low, high) buckets of `width` that cover [min_price, max_price].
+    """
+    first = int(min_price // width)
+    last = int(max_price // width)
+    return [(band * width, (band + 1) * width) for band in range(first, last + 1)]
+
+
+def split_into_bands(products: Sequence[Dict], bands: Sequence[Tuple[int, int]]) -> List[List[Dict]]:
+    """
+    Group products by band; products outside every band are dropped.
+    """
+    groups: List[List[Dict]] = [[] for _ in bands]
+    if not bands:
+        return groups
+    first_low = bands[0][0]
+    width = bands[0][1] - bands[0][0]
+    for product in products:
+        index = int((product["price"] - first_low) // width)
+        if 0 <= index < len(bands):
+            groups[index].append(product)
+    return groups
+
+
+def _sentiment_score(label: str) -> float:
+    label = label.strip().lower()
+    if label in SENTIMENT_SCORES:
+        return SENTIMENT_SCORES[label]
+    # Free-form labels from the LLM, e.g. "Mostly positive"
+    for name in ("very positive", "very negative", "positive", "negative"):
+        if name in label:
+            return SENTIMENT_SCORES[name]
+    return 0
+
+
+def _sentiment_label(score: float) -> str:
+    if score >= 1.5:
+        return "Very Positive"
+    elif score >= 0.5:
+        return "Positive"
+    elif score <= -1.5:
+        return "Very Negative"
+    elif score <= -0.5:
+        return "Negative"
+    return "Mixed"
+
+
+def merge_sentiments(weighted: Sequence[Tuple[int, Dict[str, Any]]], max_points: int = 3) -> Optional[Dict[str, Any]]:
+    """
+    Merge per-band sentiment summaries, each weighted by its product count.
+    The overall label is the weighted average of the band labels (kept as is
+    when all bands agree); points are taken round-robin from the bands,
+    heaviest first, without duplicates. Returns None when there is nothing to merge.
+    """
+    weighted = [(weight, sentiment.get("sentiment", sentiment)) for weight, sentiment in weighted if weight > 0]
+    if not weighted:
+        return None
+    weighted.sort(key=lambda item: item[0], reverse=True)
+
+    labels = {str(sentiment.get("overall", "Mixed")) for _, sentiment in weighted}
+    if len(labels) == 1:
+        overall = labels.pop()
+    else:
+        total = sum(weight for weight, _ in weighted)
+        overall = _sentiment_label(
+            sum(weight * _sentiment_score(str(sentiment.get("overall", "Mixed"))) for weight, sentiment in weighted) / total
+        )
+
+    def round_robin(field: str) -> List[str]:
+        points: Dict[str, str] = {}
+        columns = [sentiment.get(field, []) for _, sentiment in weighted]
+        for row in range(max((len(column) for column in columns), default=0)):
+            for column in columns:
+                if row < len(column):
+                    points.setdefault(str(column[row]).strip().lower(), column[row])
+        return list(points.values())[:max_points]
+
+    return {
+        "overall": overall,
+        "positive_points": round_robin("positive_points"),
+        "negative_points": round_robin("negative_points"),
+    }
@@ -1,14 +1,110 @@
 import os
-import requests
-from bs4 import BeautifulSoup
-from langchain_groq import ChatGroq
-from langchain.prompts import ChatPromptTemplate
-from langchain.output_parsers import PydanticOutputParser
+import asyncio
+import contextvars
+import copy
+import functools
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any
-import json
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Iterable, Iterator, AsyncIterator, Tuple
 import time
 import random
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+from catalog import ProductCatalog, get_default_catalog
+from category_router import CategoryRouter, build_default_router
+from json_repair import loads_lenient
+from llm_providers import LLMProvider, get_provider, parse_routes
+from llm_cache import LLMCache
+from map_reduce import chunked, merge_analyses
+from local_analysis import REVIEW_SAMPLE_SIZE, ProductStats, compute_price_range, top_products_by_rating
+from memo import TTLCache
+from metrics import METRICS, Metrics
+from price_bands import merge_sentiments, price_bands, split_into_bands
+from prompt_encoder import encode_products, estimate_tokens, prompt_token_report
+from records import ProductRecord, as_records
+from resilience import LLMUnavailableError, ResilientProvider
+from review_clustering import ClusteredSentimentScorer
+from sentiment import KeywordSentimentScorer
+from single_flight import FlightAbandoned, SingleFlight
+from streaming_json import ANY, IncrementalJSONParser
+
+# The LLM and scraper stacks are slow to import, so they are only imported on first use
+if TYPE_CHECKING:
+    from scraper import ScraperEngine
+
+MODEL_NAME = "llama-3.1-8b-instant"
+
+# Prompt used to analyze a product list with the LLM
+ANALYSIS_PROMPT_TEMPLATE = """You are an e-commerce product analyst. Analyze the products below and respond in the exact JSON format specified.
+
+Products, one per line as name|price|rating|features|reviews (lists separated by "; ", price in INR, rating out of 5):
+{products}
+
+Provide:
+1. The top 3-5 products with their key features
+2. Price range analysis (min, max, average)
+3. Overall customer sentiment and common points from reviews
+
+Respond with ONLY this JSON structure, no other text:
+{{"top_products": [{{"name": "Product Name", "price": 49999, "features": ["Feature 1", "Feature 2"], "rating": 4.5, "reviews": ["Review 1", "Review 2"]}}],
+"price_range": {{"min": 19999, "max": 69999, "average": 44999}},
+"sentiment": {{"overall": "Positive", "positive_points": ["Point 1", "Point 2"], "negative_points": ["Point 1", "Point 2"]}}}}
+"""
+
+# Prompt used in hybrid mode, where prices and top products are computed locally
+SENTIMENT_PROMPT_TEMPLATE = """You are an e-commerce product analyst. Summarize customer sentiment for the products below.
+
+Products, one per line as name|price|rating|features|reviews (lists separated by "; ", price in INR, rating out of 5):
+{products}
+
+Respond with ONLY this JSON structure, no other text:
+{{"overall": "Positive", "positive_points": ["Point 1", "Point 2"], "negative_points": ["Point 1", "Point 2"]}}
+"""
+
+# Batched variants: several product lists, each under a "## <id>" heading, analyzed in one call
+BATCH_ANALYSIS_PROMPT_TEMPLATE = """You are an e-commerce product analyst. Analyze each product list below separately and respond in the exact JSON format specified.
+
+Each list starts with a "## <id>" line, followed by its products, one per line as name|price|rating|features|reviews (lists separated by "; ", price in INR, rating out of 5):
+{products}
+
+For each list provide:
+1. The top 3-5 products with their key features
+2. Price range analysis (min, max, average)
+3. Overall customer sentiment and common points from reviews
+
+Respond with ONLY this JSON structure, with one entry per list id, no other text:
+{{"results": {{"<id>": {{"top_products": [{{"name": "Product Name", "price": 49999, "features": ["Feature 1", "Feature 2"], "rating": 4.5, "reviews": ["Review 1", "Review 2"]}}],
+"price_range": {{"min": 19999, "max": 69999, "average": 44999}},
+"sentiment": {{"overall": "Positive", "positive_points": ["Point 1", "Point 2"], "negative_points": ["Point 1", "Point 2"]}}}}}}}}
+"""
+
+BATCH_SENTIMENT_PROMPT_TEMPLATE = """You are an e-commerce product analyst. Summarize customer sentiment for each product list below separately.
+
+Each list starts with a "## <id>" line, followed by its products, one per line as name|price|rating|features|reviews (lists separated by "; ", price in INR, rating out of 5):
+{products}
+
+Respond with ONLY this JSON structure, with one entry per list id, no other text:
+{{"results": {{"<id>": {{"overall": "Positive", "positive_points": ["Point 1", "Point 2"], "negative_points": ["Point 1", "Point 2"]}}}}}}
+"""
+
+# Approximate token budget for the encoded product table in the prompt
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", 2000))
+
+# Stream events reported while the LLM response is being generated, by JSON path
+STREAM_EVENTS = {
+    ("top_products", ANY): "product",
+    ("price_range",): "price_range",
+    ("sentiment", "overall"): "overall",
+    ("sentiment", "positive_points", ANY): "positive_point",
+    ("sentiment", "negative_points", ANY): "negative_point",
+}
+
+# Stream events for the sentiment-only response of hybrid mode
+SENTIMENT_STREAM_EVENTS = {
+    ("overall",): "overall",
+    ("positive_points", ANY): "positive_point",
+    ("negative_points", ANY): "negative_point",
+}
 
 class ProductFeature(BaseModel):
     name: str = Field(description="Name of the product")
@@ -17,875 +113,152 @@ class ProductFeature(BaseModel):
     rating: float = Field(description="Customer rating out of 5")
     reviews: List[str] = Field(description="Sample of customer reviews")
 
+    @classmethod
+    def from_record(cls, product: ProductRecord) -> "ProductFeature":
+        """
+        Convert a product record (or dict) into the output model.
+        """
+        return cls(**product.to_dict()) if isinstance(product, ProductRecord) else cls(**product)
+
 class AnalysisResult(BaseModel):
     top_products: List[ProductFeature] = Field(description="List of top products")
     price_range: Dict[str, float] = Field(description="Price range statistics")
     sentiment: Dict[str, Any] = Field(description="Sentiment analysis results")
 
 class ProductAnalyzer:
-    def __init__(self):
-        self.llm = ChatGroq(
-            api_key=os.getenv("GROQ_API_KEY"),
-            model_name="llama-3.1-8b-instant"
+    def __init__(self, cache: Optional[LLMCache] = None, catalog: Optional[ProductCatalog] = None,
+                 router: Optional[CategoryRouter] = None, scraper: Optional["ScraperEngine"] = None,
+                 analysis_mode: Optional[str] = None, price_band_width: Optional[int] = None,
+                 provider: Optional[LLMProvider] = None, metrics: Optional[Metrics] = None):
+        # In "hybrid" mode price range and top products are computed locally
+        # and the LLM is only asked for the sentiment summary; "local" mode
+        # never calls the LLM and aggregates products as they are scraped
+        self.analysis_mode = analysis_mode or os.getenv("ANALYSIS_MODE", "llm")
+        if self.analysis_mode not in ("llm", "hybrid", "local"):
+            raise ValueError(f"Unknown analysis mode '{self.analysis_mode}', expected 'llm', 'hybrid' or 'local'")
+        hybrid = self.analysis_mode == "hybrid"
+        self.prompt_template = SENTIMENT_PROMPT_TEMPLATE if hybrid else ANALYSIS_PROMPT_TEMPLATE
+        self.batch_prompt_template = BATCH_SENTIMENT_PROMPT_TEMPLATE if hybrid else BATCH_ANALYSIS_PROMPT_TEMPLATE
+        self.stream_events = SENTIMENT_STREAM_EVENTS if hybrid else STREAM_EVENTS
+        
+        # Product lists packed into one prompt by `analyze_products_batch`
+        self.llm_batch_size = int(os.getenv("LLM_BATCH_SIZE", 4))
+        
+        # Longer product lists are split into chunks analyzed by parallel LLM
+        # calls, whose results are merged (0 sends every list in one prompt)
+        self.llm_chunk_size = int(os.getenv("LLM_CHUNK_SIZE", 25))
+        self.llm_map_concurrency = int(os.getenv("LLM_MAP_CONCURRENCY", 8))
+        
+        self.prompt_token_budget = PROMPT_TOKEN_BUDGET
+        
+        # Cache LLM results on disk so repeated queries skip the Groq round-trip
+        if cache is None:
+            cache = LLMCache(
+                os.getenv("ANALYZER_CACHE_PATH", ".analyzer_cache.sqlite"),
+                ttl_seconds=float(os.getenv("ANALYZER_CACHE_TTL", 24 * 3600)),
+                max_entries=int(os.getenv("ANALYZER_CACHE_MAX_ENTRIES", 1000))
+            )
+        self.cache = cache
+        
+        # Local sentiment scoring for fallback results, over a bounded sample of reviews.
+        # Points are representatives of review clusters, or the first matching
+        # reviews with SENTIMENT_POINTS=first
+        scorer_cls = KeywordSentimentScorer if os.getenv("SENTIMENT_POINTS", "cluster") == "first" else ClusteredSentimentScorer
+        self.sentiment_scorer = scorer_cls(use_vader=os.getenv("SENTIMENT_BACKEND") == "vader")
+        self.review_sample_size = int(os.getenv("REVIEW_SAMPLE_SIZE", REVIEW_SAMPLE_SIZE))
+        
+        # Product data is loaded once per process and indexed by price
+        self.catalog = catalog if catalog is not None else get_default_catalog()
+        self.router = router if router is not None else build_default_router()
+        
+        # Live scraping is opt-in; without it products come from the catalog
+        if scraper is None and os.getenv("SCRAPER_MODE", "catalog") == "live":
+            from scraper import ScraperEngine
+            scraper = ScraperEngine()
+        self.scraper = scraper
+        self.scrape_pages = int(os.getenv("SCRAPER_PAGES", 1))
+        
+        # Stage timings and counters, shared process-wide by default
+        self.metrics = metrics if metrics is not None else METRICS
+        
+        # Identical concurrent analyses share one scrape and LLM call
+        self.flights = SingleFlight()
+        
+        # With a band width, products and sentiment are fetched per canonical
+        # price band and arbitrary ranges are answered by merging bands
+        if price_band_width is None:
+            price_band_width = int(os.getenv("PRICE_BAND_WIDTH", 0))
+        self.price_band_width = price_band_width
+        self.bands = TTLCache(
+            ttl_seconds=float(os.getenv("PRICE_BAND_CACHE_TTL", 3600)),
+            max_entries=int(os.getenv("PRICE_BAND_CACHE_MAX_ENTRIES", 1024))
         )
-        self.output_parser = PydanticOutputParser(pydantic_object=AnalysisResult)
+        self.band_workers = int(os.getenv("PRICE_BAND_WORKERS", 4))
+        
+        # Ask the model for a JSON object (Groq JSON mode) and count how its responses parse
+        self.json_mode = os.getenv("LLM_JSON_MODE", "1") != "0"
+        self.parse_stats = {"parsed": 0, "repaired": 0, "failed": 0}
+        self._parse_stats_lock = threading.Lock()
+        
+        # The LLM backend is configured as "provider[:model]"; LLM_ROUTES can
+        # send individual catalog categories to other models or providers.
+        # Every provider gets deadlines, retries, hedging and a circuit breaker.
+        if provider is None:
+            provider = get_provider(os.getenv("LLM_PROVIDER", f"groq:{MODEL_NAME}"))
+        self.provider = ResilientProvider.from_env(provider)
+        self.routes = {
+            category: ResilientProvider.from_env(get_provider(spec))
+            for category, spec in parse_routes(os.getenv("LLM_ROUTES", "")).items()
+        }
         
-    def _scrape_products(self, platform: str, category: str, min_price: int, max_price: int) -> List[Dict]:
+    def _provider_for(self, category: str) -> LLMProvider:
         """
-        Scrape product information from the specified platform.
-        This is a placeholder implementation. In a real application, you would need to:
-        1. Handle different platforms' specific HTML structures
-        2. Implement proper rate limiting and error handling
-        3. Consider using official APIs if available
+        Provider routed to the category, or the default one.
         """
-        # Simulate network delay
-        time.sleep(1)
-        
-        # Generate sample data based on the category
-        category_lower = category.lower()
-        
-        # Check for specific product categories
-        if "laptop" in category_lower or "gaming" in category_lower:
-            return self._get_laptop_data(min_price, max_price)
-        elif "earbuds" in category_lower or "headphone" in category_lower or "earphone" in category_lower:
-            return self._get_earbuds_data(min_price, max_price)
-        elif "smartwatch" in category_lower or "watch" in category_lower:
-            return self._get_smartwatch_data(min_price, max_price)
-        elif "smartphone" in category_lower or "phone" in category_lower or "mobile" in category_lower:
-            return self._get_smartphone_data(min_price, max_price)
-        elif "tv" in category_lower or "television" in category_lower:
-            return self._get_tv_data(min_price, max_price)
-        elif "refrigerator" in category_lower or "fridge" in category_lower:
-            return self._get_refrigerator_data(min_price, max_price)
-        elif "washing" in category_lower or "washer" in category_lower:
-            return self._get_washing_machine_data(min_price, max_price)
-        elif "camera" in category_lower or "dslr" in category_lower:
-            return self._get_camera_data(min_price, max_price)
-        elif "tablet" in category_lower or "ipad" in category_lower:
-            return self._get_tablet_data(min_price, max_price)
-        elif "printer" in category_lower:
-            return self._get_printer_data(min_price, max_price)
-        else:
-            return self._get_generic_data(category, min_price, max_price)
-    
-    def _get_laptop_data(self, min_price, max_price):
-        laptops = [
-            {
-                "name": "ASUS ROG Strix G16 (2024)",
-                "price": 159990,
-                "features": [
-                    "Intel Core i9-14900HX",
-                    "NVIDIA RTX 4070 8GB",
-                    "16GB DDR5 RAM",
-                    "1TB PCIe 4.0 SSD",
-                    "16\" QHD+ 240Hz"
-                ],
-                "rating": 4.7,
-                "reviews": [
-                    "Exceptional gaming performance",
-                    "Beautiful display with high refresh rate",
-                    "Great build quality",
-                    "Effective cooling system",
-                    "Premium features throughout"
-                ]
-            },
-            {
-                "name": "Lenovo Legion Pro 7i (2024)",
-                "price": 189990,
-                "features": [
-                    "Intel Core i9-14900HX",
-                    "NVIDIA RTX 4080 12GB",
-                    "32GB DDR5 RAM",
-                    "1TB PCIe 4.0 SSD",
-                    "16\" Mini LED 240Hz"
-                ],
-                "rating": 4.8,
-                "reviews": [
-                    "Top-tier gaming performance",
-                    "Mini LED display is stunning",
-                    "Excellent build quality",
-                    "Great keyboard and trackpad",
-                    "Advanced cooling solution"
-                ]
-            },
-            {
-                "name": "HP Omen 16 (2024)",
-                "price": 139990,
-                "features": [
-                    "AMD Ryzen 9 7940HS",
-                    "NVIDIA RTX 4060 8GB",
-                    "16GB DDR5 RAM",
-                    "1TB PCIe 4.0 SSD",
-                    "16\" QHD 165Hz"
-                ],
-                "rating": 4.6,
-                "reviews": [
-                    "Great value for performance",
-                    "Solid build quality",
-                    "Good battery life for a gaming laptop",
-                    "Effective cooling",
-                    "Nice display quality"
-                ]
-            },
-            {
-                "name": "MSI Katana 15 (2024)",
-                "price": 89990,
-                "features": [
-                    "Intel Core i7-13620H",
-                    "NVIDIA RTX 4050 6GB",
-                    "16GB DDR5 RAM",
-                    "512GB PCIe 4.0 SSD",
-                    "15.6\" FHD 144Hz"
-                ],
-                "rating": 4.4,
-                "reviews": [
-                    "Good entry-level gaming performance",
-                    "Decent build quality",
-                    "144Hz display is smooth",
-                    "Good value for money",
-                    "Runs a bit warm under load"
-                ]
-            },
-            {
-                "name": "Acer Nitro V 15 (2024)",
-                "price": 69990,
-                "features": [
-                    "Intel Core i5-13420H",
-                    "NVIDIA RTX 3050 6GB",
-                    "16GB DDR5 RAM",
-                    "512GB PCIe SSD",
-                    "15.6\" FHD 144Hz"
-                ],
-                "rating": 4.3,
-                "reviews": [
-                    "Great budget gaming laptop",
-                    "Good performance for the price",
-                    "Decent display",
-                    "Adequate cooling",
-                    "Value for money"
-                ]
-            },
-            {
-                "name": "Dell G15 Gaming (2024)",
-                "price": 74990,
-                "features": [
-                    "AMD Ryzen 5 7535HS",
-                    "NVIDIA RTX 3050 6GB",
-                    "16GB DDR5 RAM",
-                    "512GB PCIe SSD",
-                    "15.6\" FHD 120Hz"
-                ],
-                "rating": 4.4,
-                "reviews": [
-                    "Reliable performance",
-                    "Good build quality",
-                    "Decent battery life",
-                    "Effective cooling system",
-                    "Good value proposition"
-                ]
-            }
-        ]
-        
-        # Filter by price range
-        filtered_laptops = [laptop for laptop in laptops if min_price <= laptop["price"] <= max_price]
-        return filtered_laptops
-    
-    def _get_earbuds_data(self, min_price, max_price):
-        earbuds = [
-            {
-                "name": "OnePlus Buds Pro 2",
-                "price": 9990,
-                "features": ["Active Noise Cancellation", "Dual Dynamic Drivers", "IP55 Water Resistance", "Up to 39 hours with case", "Fast Charging"],
-                "rating": 4.6,
-                "reviews": [
-                    "Excellent sound quality",
-                    "Great ANC performance",
-                    "Comfortable for long wear",
-                    "Battery life is impressive",
-                    "App integration is seamless"
-                ]
-            },
-            {
-                "name": "Samsung Galaxy Buds2 Pro",
-                "price": 14990,
-                "features": ["Intelligent Active Noise Cancellation", "Hi-Fi Sound", "IPX7 Water Resistance", "Up to 29 hours with case", "Spatial Audio"],
-                "rating": 4.7,
-                "reviews": [
-                    "Premium sound quality",
-                    "Superior ANC compared to competitors",
-                    "Very comfortable fit",
-                    "Seamless integration with Samsung devices",
-                    "Battery life could be better"
-                ]
-            },
-            {
-                "name": "boAt Airdopes 141",
-                "price": 1499,
-                "features": ["Low Latency Mode", "IPX4 Water Resistance", "Up to 42 hours with case", "Touch Controls", "Voice Assistant Support"],
-                "rating": 4.3,
-                "reviews": [
-                    "Great value for money",
-                    "Good sound quality for the price",
-                    "Battery life is excellent",
-                    "Build quality is decent",
-                    "Call quality could be better"
-                ]
-            },
-            {
-                "name": "Apple AirPods Pro",
-                "price": 19990,
-                "features": ["Active Noise Cancellation", "Transparency Mode", "Spatial Audio", "IPX4 Water Resistance", "Up to 24 hours with case"],
-                "rating": 4.8,
-                "reviews": [
-                    "Best-in-class ANC",
-                    "Seamless integration with Apple ecosystem",
-                    "Comfortable for all-day wear",
-                    "Sound quality is excellent",
-                    "Price is a bit high"
-                ]
-            }
-        ]
-        
-        # Filter by price range
-        filtered_earbuds = [earbud for earbud in earbuds if min_price <= earbud["price"] <= max_price]
-        return filtered_earbuds
-    
-    def _get_smartwatch_data(self, min_price, max_price):
-        smartwatches = [
-            {
-                "name": "Apple Watch Series 7",
-                "price": 32990,
-                "features": ["Always-On Retina Display", "Heart Rate Monitoring", "ECG App", "Blood Oxygen Monitoring", "Water Resistant"],
-                "rating": 4.8,
-                "reviews": [
-                    "Best smartwatch for iPhone users",
-                    "Excellent health tracking features",
-                    "Premium build quality",
-                    "Battery life could be better",
-                    "Seamless integration with Apple ecosystem"
-                ]
-            },
-            {
-                "name": "Samsung Galaxy Watch 5",
-                "price": 24990,
-                "features": ["BioActive Sensor", "Sleep Tracking", "Body Composition Analysis", "Water Resistant", "Up to 50 hours battery life"],
-                "rating": 4.6,
-                "reviews": [
-                    "Great for Android users",
-                    "Comprehensive health tracking",
-                    "Good battery life",
-                    "Comfortable to wear",
-                    "App ecosystem is growing"
-                ]
-            },
-            {
-                "name": "Noise ColorFit Pro 4",
-                "price": 2499,
-                "features": ["1.78\" AMOLED Display", "SpO2 Monitoring", "Heart Rate Monitoring", "14 Sports Modes", "Water Resistant"],
-                "rating": 4.2,
-                "reviews": [
-                    "Excellent value for money",
-                    "Good display quality",
-                    "Battery life is decent",
-                    "Build quality is acceptable",
-                    "App could be improved"
-                ]
-            },
-            {
-                "name": "Fire-Boltt Ninja",
-                "price": 1999,
-                "features": ["1.69\" HD Display", "Heart Rate Monitoring", "Sleep Tracking", "14 Sports Modes", "IP67 Water Resistant"],
-                "rating": 4.1,
-                "reviews": [
-                    "Very affordable",
-                    "Good basic fitness tracking",
-                    "Battery life is good",
-                    "Build quality is basic",
-                    "App needs improvement"
-                ]
-            }
-        ]
-        
-        # Filter by price range
-        filtered_watches = [watch for watch in smartwatches if min_price <= watch["price"] <= max_price]
-        return filtered_watches
-    
-    def _get_smartphone_data(self, min_price, max_price):
-        smartphones = [
-            {
-                "name": "iPhone 15 Pro Max",
-                "price": 159900,
-                "features": ["A17 Pro chip", "6.7-inch Super Retina XDR display", "48MP Main + 12MP Ultra Wide + 12MP Telephoto", "Titanium design", "USB-C"],
-                "rating": 4.8,
-                "reviews": [
-                    "Best iPhone camera system yet",
-                    "Titanium build feels premium",
-                    "Excellent performance",
-                    "Great battery life",
-                    "USB-C is a welcome addition"
-                ]
-            },
-            {
-                "name": "Samsung Galaxy S24 Ultra",
-                "price": 129999,
-                "features": ["Snapdragon 8 Gen 3", "6.8-inch QHD+ Dynamic AMOLED", "200MP Main + 12MP Ultra + Dual Telephoto", "Titanium frame", "AI features"],
-                "rating": 4.7,
-                "reviews": [
-                    "Excellent camera system",
-                    "Galaxy AI features are useful",
-                    "S Pen functionality is great",
-                    "Premium build quality",
-                    "Impressive battery life"
-                ]
-            },
-            {
-                "name": "OnePlus 12",
-                "price": 64999,
-                "features": ["Snapdragon 8 Gen 3", "6.82-inch LTPO AMOLED", "50MP Main + 48MP Ultra + 64MP Telephoto", "100W charging", "Hasselblad cameras"],
-                "rating": 4.6,
-                "reviews": [
-                    "Excellent value flagship",
-                    "Super fast charging",
-                    "Great display quality",
-                    "Improved camera system",
-                    "Strong performance"
-                ]
-            },
-            {
-                "name": "Nothing Phone (2)",
-                "price": 44999,
-                "features": ["Snapdragon 8+ Gen 1", "6.7-inch LTPO OLED", "50MP Main + 50MP Ultra", "Glyph Interface", "Wireless charging"],
-                "rating": 4.4,
-                "reviews": [
-                    "Unique design with Glyph",
-                    "Clean software experience",
-                    "Good camera performance",
-                    "Solid build quality",
-                    "Decent battery life"
-                ]
-            },
-            {
-                "name": "Pixel 8 Pro",
-                "price": 106999,
-                "features": ["Google Tensor G3", "6.7-inch Super Actua display", "50MP Main + 48MP Ultra + 48MP Telephoto", "AI features", "7 years updates"],
-                "rating": 4.7,
-                "reviews": [
-                    "Best camera experience",
-                    "AI features are impressive",
-                    "Clean Android experience",
-                    "Great display quality",
-                    "Long software support"
-                ]
-            },
-            {
-                "name": "Redmi Note 13 Pro+ 5G",
-                "price": 31999,
-                "features": ["Dimensity 7200 Ultra", "6.67-inch 1.5K AMOLED", "200MP Main camera", "120W charging", "IP68 rating"],
-                "rating": 4.3,
-                "reviews": [
-                    "Great value for money",
-                    "Premium build quality",
-                    "Fast charging is amazing",
-                    "Good camera performance",
-                    "MIUI has some bloatware"
-                ]
-            }
-        ]
-        
-        # Filter by price range
-        filtered_phones = [phone for phone in smartphones if min_price <= phone["price"] <= max_price]
-        return filtered_phones
-    
-    def _get_tv_data(self, min_price, max_price):
-        tvs = [
-            {
-                "name": "Samsung 65-inch Neo QLED QN90C",
-                "price": 189990,
-                "features": ["4K Neo QLED", "Mini LED Technology", "Neural Quantum Processor 4K", "Gaming Hub", "Object Tracking Sound+"],
-                "rating": 4.8,
-                "reviews": [
-                    "Exceptional picture quality",
-                    "Great for gaming with low latency",
-                    "Impressive brightness levels",
-                    "Good sound system",
-                    "Premium build quality"
-                ]
-            },
-            {
-                "name": "LG C3 65-inch OLED evo",
-                "price": 209990,
-                "features": ["4K OLED evo", "α9 AI Processor Gen6", "Dolby Vision IQ", "NVIDIA G-SYNC", "4 HDMI 2.1 ports"],
-                "rating": 4.9,
-                "reviews": [
-                    "Perfect blacks and contrast",
-                    "Excellent for gaming",
-                    "WebOS is smooth",
-                    "Great upscaling",
-                    "Best-in-class picture quality"
-                ]
-            },
-            {
-                "name": "Sony Bravia XR X90L 65-inch",
-                "price": 159990,
-                "features": ["Full Array LED", "XR Cognitive Processor", "Google TV", "Acoustic Multi-Audio", "HDMI 2.1"],
-                "rating": 4.7,
-                "reviews": [
-                    "Natural picture quality",
-                    "Great motion handling",
-                    "Good for PS5 gaming",
-                    "Excellent upscaling",
-                    "Google TV works well"
-                ]
-            },
-            {
-                "name": "OnePlus 65-inch Q2 Pro",
-                "price": 99990,
-                "features": ["QLED Technology", "4K Resolution", "Google TV", "Dolby Vision & Atmos", "HDMI 2.1"],
-                "rating": 4.5,
-                "reviews": [
-                    "Great value for money",
-                    "Good picture quality",
-                    "Smooth performance",
-                    "Decent sound output",
-                    "Premium design"
-                ]
-            },
-            {
-                "name": "Hisense 65U7K QLED",
-                "price": 84990,
-                "features": ["QLED Technology", "144Hz Refresh Rate", "Full Array Local Dimming", "Dolby Vision IQ", "IMAX Enhanced"],
-                "rating": 4.4,
-                "reviews": [
-                    "Excellent value proposition",
-                    "Good gaming features",
-                    "Bright HDR performance",
-                    "Decent sound quality",
-                    "Feature-rich for the price"
-                ]
-            },
-            {
-                "name": "TCL 65-inch QLED C645",
-                "price": 69990,
-                "features": ["4K QLED", "Google TV", "Dolby Vision", "HDMI 2.1", "Game Master 2.0"],
-                "rating": 4.3,
-                "reviews": [
-                    "Great budget option",
-                    "Good picture quality",
-                    "Gaming features work well",
-                    "Value for money",
-                    "Google TV is smooth"
-                ]
-            }
-        ]
-        
-        # Filter by price range
-        filtered_tvs = [tv for tv in tvs if min_price <= tv["price"] <= max_price]
-        return filtered_tvs
-    
-    def _get_refrigerator_data(self, min_price, max_price):
-        refrigerators = [
-            {
-                "name": "LG 687L French Door Refrigerator",
-                "price": 129990,
-                "features": [
-                    "Linear Inverter Compressor",
-                    "Door-in-Door",
-                    "Smart Diagnosis",
-                    "Fresh Air Filter",
-                    "Smart Connect"
-                ],
-                "rating": 4.8,
-                "reviews": [
-                    "Spacious and well-organized",
-                    "Excellent cooling performance",
-                    "Smart features are useful",
-                    "Premium build quality",
-                    "Energy efficient"
-                ]
-            },
-            {
-                "name": "Samsung 638L French Door Refrigerator",
-                "price": 119990,
-                "features": [
-                    "Digital Inverter Technology",
-                    "Twin Cooling Plus",
-                    "Power Cool",
-                    "LED Lighting",
-                    "Frost Free"
-                ],
-                "rating": 4.7,
-                "reviews": [
-                    "Great storage space",
-                    "Efficient cooling",
-                    "Good organization",
-                    "Quiet operation",
-                    "Premium features"
-                ]
-            },
-            {
-                "name": "Whirlpool 340L Frost Free Double Door",
-                "price": 32990,
-                "features": [
-                    "6th Sense Technology",
-                    "IntelliSense Inverter",
-                    "Microblock Technology",
-                    "Stabilizer Free Operation",
-                    "Frost Free"
-                ],
-                "rating": 4.5,
-                "reviews": [
-                    "Good value for money",
-                    "Reliable performance",
-                    "Spacious enough",
-                    "Easy to maintain",
-                    "Energy efficient"
-                ]
-            },
-            {
-                "name": "Haier 253L Frost Free Double Door",
-                "price": 24990,
-                "features": [
-                    "Cooling on Wheels",
-                    "Anti-Bacterial Gasket",
-                    "Stabilizer Free Operation",
-                    "Frost Free",
-                    "Energy Efficient"
-                ],
-                "rating": 4.4,
-                "reviews": [
-                    "Compact and efficient",
-                    "Good for small families",
-                    "Cools well",
-                    "Easy to maintain",
-                    "Affordable option"
-                ]
-            },
-            {
-                "name": "Godrej 236L Frost Free Double Door",
-                "price": 22990,
-                "features": [
-                    "Cool-Touch Technology",
-                    "Stabilizer Free Operation",
-                    "Frost Free",
-                    "Energy Efficient",
-                    "Spill-Proof Shelves"
-                ],
-                "rating": 4.3,
-                "reviews": [
-                    "Reliable brand",
-                    "Good basic features",
-                    "Value for money",
-                    "Easy to clean",
-                    "Suitable for Indian conditions"
-                ]
-            }
-        ]
-        
-        # Filter by price range
-        filtered_fridges = [fridge for fridge in refrigerators if min_price <= fridge["price"] <= max_price]
-        return filtered_fridges
+        if not self.routes:
+            return self.provider
+        return self.routes.get(self.router.resolve(category), self.provider)
     
-    def _get_washing_machine_data(self, min_price, max_price):
-        washing_machines = [
-            {
-                "name": "LG 8kg Front Load",
-                "price": 45990,
-                "features": ["Inverter Direct Drive Motor", "Steam Function", "6 Motion DD", "Smart Diagnosis", "Child Lock"],
-                "rating": 4.6,
-                "reviews": [
-                    "Excellent washing performance",
-                    "Very quiet operation",
-                    "Steam function works well",
-                    "Energy efficient",
-                    "Premium price but worth it"
-                ]
-            },
-            {
-                "name": "Samsung 7kg Front Load",
-                "price": 39990,
-                "features": ["Digital Inverter Motor", "Ecobubble Technology", "AddWash Door", "Smart Check", "Child Lock"],
-                "rating": 4.5,
-                "reviews": [
-                    "Great washing results",
-                    "Quiet operation",
-                    "AddWash is convenient",
-                    "Good for large loads",
-                    "App connectivity is useful"
-                ]
-            },
-            {
-                "name": "Whirlpool 6.5kg Top Load",
-                "price": 24990,
-                "features": ["Power Clean Technology", "ZPF Technology", "Aqua Energie", "Magic Filter", "Child Lock"],
-                "rating": 4.3,
-                "reviews": [
-                    "Good value for money",
-                    "Cleans clothes well",
-                    "Easy to use",
-                    "Durable build",
-                    "Suitable for Indian conditions"
-                ]
-            },
-            {
-                "name": "IFB 6.5kg Front Load",
-                "price": 32990,
-                "features": ["Aqua Energie", "Built-in Heater", "16 Programs", "Child Lock", "Delay End"],
-                "rating": 4.4,
-                "reviews": [
-                    "Good washing performance",
-                    "Built-in heater is useful",
-                    "Multiple programs",
-                    "Water efficient",
-                    "After-sales service is good"
-                ]
-            }
-        ]
-        
-        # Filter by price range
-        filtered_machines = [machine for machine in washing_machines if min_price <= machine["price"] <= max_price]
-        return filtered_machines
+    def _scrape_products(self, platform: str, category: str, min_price: int, max_price: int) -> List[ProductRecord]:
+        """
+        Scrape product information from the specified platform.
+        Uses the live scraper when one is configured, and falls back to the
+        placeholder catalog data if scraping fails or finds nothing.
+        Products are returned as compact records; they become `ProductFeature`
+        models only when a result is built.
+        """
+        return list(self._iter_products(platform, category, min_price, max_price))
     
-    def _get_camera_data(self, min_price, max_price):
-        cameras = [
-            {
-                "name": "Canon EOS 250D",
-                "price": 49990,
-                "features": ["24.1MP APS-C Sensor", "4K Video Recording", "Dual Pixel CMOS AF", "Vari-angle Touch Screen", "Wi-Fi & Bluetooth"],
-                "rating": 4.6,
-                "reviews": [
-                    "Great for beginners",
-                    "Good image quality",
-                    "Touch screen is responsive",
-                    "Lightweight and portable",
-                    "Battery life is decent"
-                ]
-            },
-            {
-                "name": "Nikon D3500",
-                "price": 39990,
-                "features": ["24.2MP DX Sensor", "1080p Video Recording", "11-point AF System", "Guide Mode", "Long Battery Life"],
-                "rating": 4.5,
-                "reviews": [
-                    "Excellent for learning photography",
-                    "Good image quality",
-                    "Easy to use",
-                    "Durable build",
-                    "Great battery life"
-                ]
-            },
-            {
-                "name": "Sony Alpha A7 III",
-                "price": 149990,
-                "features": ["24.2MP Full-Frame Sensor", "4K Video Recording", "5-axis Stabilization", "Fast AF", "Weather Sealed"],
-                "rating": 4.8,
-                "reviews": [
-                    "Professional-grade camera",
-                    "Excellent low-light performance",
-                    "Great video capabilities",
-                    "Robust build quality",
-                    "Expensive but worth it"
-                ]
-            },
-            {
-                "name": "Fujifilm X-T30",
-                "price": 69990,
-                "features": ["26.1MP APS-C Sensor", "4K Video Recording", "Fast AF", "Compact Design", "Film Simulation Modes"],
-                "rating": 4.7,
-                "reviews": [
-                    "Great image quality",
-                    "Compact and portable",
-                    "Film simulations are excellent",
-                    "Good for both photos and videos",
-                    "Battery life could be better"
-                ]
-            }
-        ]
-        
-        # Filter by price range
-        filtered_cameras = [camera for camera in cameras if min_price <= camera["price"] <= max_price]
-        return filtered_cameras
+    def _iter_products(self, platform: str, category: str, min_price: int, max_price: int) -> Iterator[ProductRecord]:
+        """
+        Like `_scrape_products`, but yields products as the scraper parses them
+        (or as the catalog is read), timed as the "scrape" stage.
+        """
+        return self.metrics.timed_iter("scrape", self._generate_products(platform, category, min_price, max_price))
     
-    def _get_tablet_data(self, min_price, max_price):
-        tablets = [
-            {
-                "name": "iPad Pro 12.9-inch (2024)",
-                "price": 119900,
-                "features": [
-                    "M2 chip",
-                    "12.9-inch Liquid Retina XDR display",
-                    "ProMotion & True Tone",
-                    "12MP Wide + 10MP Ultra Wide cameras",
-                    "Face ID"
-                ],
-                "rating": 4.9,
-                "reviews": [
-                    "Incredible performance",
-                    "Best tablet display ever",
-                    "Great for creative work",
-                    "Premium build quality",
-                    "Excellent for productivity"
-                ]
-            },
-            {
-                "name": "Samsung Galaxy Tab S9 Ultra",
-                "price": 108999,
-                "features": [
-                    "Snapdragon 8 Gen 2",
-                    "14.6-inch Dynamic AMOLED 2X",
-                    "S Pen included",
-                    "12MP + 12MP Dual front cameras",
-                    "IP68 water resistance"
-                ],
-                "rating": 4.8,
-                "reviews": [
-                    "Massive beautiful display",
-                    "Great for multitasking",
-                    "S Pen works perfectly",
-                    "Good battery life",
-                    "Premium Android tablet"
-                ]
-            },
-            {
-                "name": "iPad Air (5th gen)",
-                "price": 59900,
-                "features": [
-                    "M1 chip",
-                    "10.9-inch Liquid Retina display",
-                    "Touch ID",
-                    "12MP Ultra Wide front camera",
-                    "USB-C"
-                ],
-                "rating": 4.7,
-                "reviews": [
-                    "Great performance",
-                    "Perfect size for most users",
-                    "Good value for money",
-                    "Nice display quality",
-                    "Versatile device"
-                ]
-            },
-            {
-                "name": "Xiaomi Pad 6 Pro",
-                "price": 29999,
-                "features": [
-                    "Snapdragon 8+ Gen 1",
-                    "11-inch 144Hz LCD",
-                    "8600mAh battery",
-                    "13MP rear camera",
-                    "Quad speakers"
-                ],
-                "rating": 4.5,
-                "reviews": [
-                    "Great value tablet",
-                    "Smooth performance",
-                    "Good display quality",
-                    "Long battery life",
-                    "MIUI optimized well"
-                ]
-            },
-            {
-                "name": "OnePlus Pad",
-                "price": 37999,
-                "features": [
-                    "Dimensity 9000",
-                    "11.61-inch 144Hz LCD",
-                    "9510mAh battery",
-                    "67W SUPERVOOC charging",
-                    "Dolby Vision"
-                ],
-                "rating": 4.4,
-                "reviews": [
-                    "Premium build quality",
-                    "Great performance",
-                    "Good battery life",
-                    "Nice display",
-                    "Clean software"
-                ]
-            },
-            {
-                "name": "realme Pad 2",
-                "price": 19999,
-                "features": [
-                    "MediaTek Helio G99",
-                    "11-inch 2K display",
-                    "8360mAh battery",
-                    "Quad speakers",
-                    "33W fast charging"
-                ],
-                "rating": 4.3,
-                "reviews": [
-                    "Good budget tablet",
-                    "Nice display for price",
-                    "Decent performance",
-                    "Good battery life",
-                    "Value for money"
-                ]
-            }
-        ]
+    def _generate_products(self, platform: str, category: str, min_price: int, max_price: int) -> Iterator[ProductRecord]:
+        if self.scraper is not None:
+            from scraper import ScraperError
+            found = False
+            try:
+                for product in self.scraper.iter_scrape(platform, category, min_price, max_price, pages=self.scrape_pages):
+                    found = True
+                    yield ProductRecord.from_dict(product)
+            except ScraperError as e:
+                # Products already handed out are kept; placeholder data is only used if nothing was found
+                print(f"Error scraping {platform}: {str(e)}")
+            if found:
+                return
         
-        # Filter by price range
-        filtered_tablets = [tablet for tablet in tablets if min_price <= tablet["price"] <= max_price]
-        return filtered_tablets
-    
-    def _get_printer_data(self, min_price, max_price):
-        printers = [
-            {
-                "name": "HP LaserJet Pro M428",
-                "price": 19990,
-                "features": ["Laser Printing", "20 PPM Print Speed", "1200 x 1200 dpi", "Automatic Duplex", "Wi-Fi Connectivity"],
-                "rating": 4.5,
-                "reviews": [
-                    "Fast printing speed",
-                    "Good print quality",
-                    "Reliable performance",
-                    "Easy to set up",
-                    "Toner lasts long"
-                ]
-            },
-            {
-                "name": "Canon PIXMA TS5370",
-                "price": 12990,
-                "features": ["Inkjet Printing", "Color Printing", "4800 x 1200 dpi", "Automatic Duplex", "Wi-Fi & Bluetooth"],
-                "rating": 4.3,
-                "reviews": [
-                    "Good for home use",
-                    "Color prints are vibrant",
-                    "Easy to use",
-                    "Ink can be expensive",
-                    "Wi-Fi setup is simple"
-                ]
-            },
-            {
-                "name": "Epson L3150",
-                "price": 15990,
-                "features": ["EcoTank Technology", "Color Printing", "5760 x 1440 dpi", "Automatic Duplex", "Wi-Fi Connectivity"],
-                "rating": 4.6,
-                "reviews": [
-                    "Very economical to run",
-                    "Good print quality",
-                    "Large ink capacity",
-                    "Initial cost is high",
-                    "Reliable performance"
-                ]
-            },
-            {
-                "name": "Brother DCP-T426W",
-                "price": 17990,
-                "features": ["Ink Tank System", "Color Printing", "1200 x 6000 dpi", "Automatic Duplex", "Wi-Fi & USB Connectivity"],
-                "rating": 4.4,
-                "reviews": [
-                    "Cost-effective printing",
-                    "Good for small office",
-                    "Easy to refill",
-                    "Print quality is good",
-                    "Setup is straightforward"
-                ]
-            }
-        ]
+        # Simulate network delay
+        time.sleep(1)
         
-        # Filter by price range
-        filtered_printers = [printer for printer in printers if min_price <= printer["price"] <= max_price]
-        return filtered_printers
+        # Route the free-text category to a catalog category
+        catalog_category = self.router.resolve(category)
+        if catalog_category is None or catalog_category not in self.catalog:
+            yield from as_records(self._get_generic_data(category, min_price, max_price))
+            return
+        yield from self.catalog.iter_query(catalog_category, min_price, max_price)
     
     def _get_generic_data(self, category, min_price, max_price):
         # Generate generic product data based on the category
@@ -940,260 +313,650 @@ class ProductAnalyzer:
         
         return products
 
-    def _analyze_with_llm(self, products: List[Dict]) -> AnalysisResult:
+    def _template(self, sentiment_only: bool = False) -> str:
         """
-        Analyze the scraped products using the LLM.
+        Prompt template of the analysis mode, or the sentiment-only one.
         """
-        # Create a more explicit prompt with examples
-        template = """
-        You are an e-commerce product analyst. Analyze the following product information and provide insights in the exact format specified below.
-        
-        Products:
-        {products}
-        
-        Based on these products, provide:
-        
-        1. A list of the top 3-5 products with their key features
-        2. Price range analysis (min, max, average)
-        3. Overall customer sentiment and common points from reviews
-        
-        Your response MUST be in the following JSON format:
-        {{
-          "top_products": [
-            {{
-              "name": "Product Name",
-              "price": 49999,
-              "features": ["Feature 1", "Feature 2", "Feature 3"],
-              "rating": 4.5,
-              "reviews": ["Review 1", "Review 2", "Review 3"]
-            }},
-            // More products...
-          ],
-          "price_range": {{
-            "min": 19999,
-            "max": 69999,
-            "average": 44999
-          }},
-          "sentiment": {{
-            "overall": "Positive",
-            "positive_points": ["Point 1", "Point 2"],
-            "negative_points": ["Point 1", "Point 2"]
-          }}
-        }}
-        
-        DO NOT include any explanations or text outside this JSON structure.
+        return SENTIMENT_PROMPT_TEMPLATE if sentiment_only else self.prompt_template
+
+    def _cache_key(self, products: List[Dict], provider: Optional[LLMProvider] = None,
+                   sentiment_only: bool = False) -> str:
         """
-        
-        prompt = ChatPromptTemplate.from_template(template)
-        
-        # Format the products data
-        products_text = json.dumps(products, indent=2)
-        
-        # Create the chain
-        chain = prompt | self.llm
-        
-        # Run the chain
-        result = chain.invoke({
-            "products": products_text
-        })
-        
-        # Extract the JSON from the response
+        Cache key of the analysis of `products`: a hash of their raw fields, the
+        prompt template, the prompt token budget and the provider. It does not
+        need the encoded prompt, so cache hits skip encoding altogether.
+        """
+        provider = provider or self.provider
+        with self.metrics.span("cache_key"):
+            fields = [
+                [product["name"], product["price"], product["rating"], list(product["features"]), list(product["reviews"])]
+                for product in products
+            ]
+            return LLMCache.make_key(
+                {"products": fields, "token_budget": self.prompt_token_budget}, self._template(sentiment_only), provider.key
+            )
+
+    def _encode_for_llm(self, products: List[Dict]) -> str:
+        """
+        Encode products into the compact prompt table (on a cache miss).
+        """
+        with self.metrics.span("prompt_build"):
+            return encode_products(products, self.prompt_token_budget)
+
+    def prompt_report(self, products: List[Dict], sentiment_only: bool = False) -> Dict[str, int]:
+        """
+        Estimated prompt tokens for `products` with the verbose JSON encoding
+        and with the compact table sent to the LLM. Computed only on request;
+        the size of every prompt sent is counted in `analyzer_llm_tokens_total`.
+        """
+        products_text = encode_products(products, self.prompt_token_budget)
+        return prompt_token_report(products, self._template(sentiment_only), products_text)
+
+    def _cached_result(self, cache_key: str) -> Optional[Dict]:
+        with self.metrics.span("cache_lookup"):
+            cached = self.cache.get(cache_key)
+        self.metrics.inc("analyzer_cache_total", result="miss" if cached is None else "hit")
+        return cached
+
+    def _cache_lookup(self, products: List[Dict], provider: LLMProvider,
+                      sentiment_only: bool = False) -> Tuple[str, Optional[Dict]]:
+        """
+        (cache key, cached result or None) for analyzing `products` with `provider`.
+        """
+        cache_key = self._cache_key(products, provider, sentiment_only)
+        return cache_key, self._cached_result(cache_key)
+
+    def _record_llm_call(self, provider: LLMProvider, prompt: str, response: str) -> None:
+        # Token counts are estimated from the text, the same way prompt budgets are
+        self.metrics.inc("analyzer_llm_calls_total", provider=provider.key)
+        self.metrics.inc("analyzer_llm_tokens_total", estimate_tokens(prompt), provider=provider.key, direction="in")
+        self.metrics.inc("analyzer_llm_tokens_total", estimate_tokens(response), provider=provider.key, direction="out")
+
+    def _analyze_with_llm(self, products: List[Dict], provider: Optional[LLMProvider] = None,
+                          sentiment_only: bool = False) -> AnalysisResult:
+        """
+        Analyze the scraped products using the LLM.
+        Results are served from the disk cache when the same products were analyzed before.
+        With `sentiment_only`, the LLM is only asked for the sentiment summary
+        and the rest is computed locally, as in hybrid mode.
+        """
+        provider = provider or self.provider
+        if self._needs_map_reduce(products):
+            return self._analyze_map_reduce(products, provider, sentiment_only)
+        cache_key, cached = self._cache_lookup(products, provider, sentiment_only)
+        if cached is not None:
+            return AnalysisResult(**cached)
+        
+        prompt = self._template(sentiment_only).format(products=self._encode_for_llm(products))
         try:
-            # Find JSON in the response
-            response_text = result.content
-            json_start = response_text.find('{')
-            json_end = response_text.rfind('}') + 1
-            
-            if json_start >= 0 and json_end > json_start:
-                json_str = response_text[json_start:json_end]
-                # Parse the JSON
-                data = json.loads(json_str)
-                # Convert to Pydantic model
-                return AnalysisResult(**data)
+            with self.metrics.span("llm"):
+                response = provider.invoke(prompt, json_mode=self.json_mode)
+        except LLMUnavailableError as e:
+            print(f"LLM unavailable, using local analysis: {str(e)}")
+            return self._create_fallback_result(products, reason="unavailable")
+        self._record_llm_call(provider, prompt, response)
+        
+        return self._parse_llm_response(response, products, cache_key, sentiment_only)
+    
+    def _needs_map_reduce(self, products: List[Dict]) -> bool:
+        return bool(self.llm_chunk_size) and len(products) > self.llm_chunk_size
+    
+    def _analyze_map_reduce(self, products: List[Dict], provider: LLMProvider,
+                            sentiment_only: bool = False) -> AnalysisResult:
+        """
+        Analyze a long product list in chunks of `llm_chunk_size` products.
+        Chunks missing from the cache are sent as parallel LLM calls (map), each
+        giving a partial analysis that is cached on its own; the partials are
+        then merged (reduce), so the analysis takes about as long as one chunk.
+        A chunk whose call fails or cannot be parsed gets the local fallback.
+        """
+        chunks = chunked(products, self.llm_chunk_size)
+        partials: List[Optional[AnalysisResult]] = [None] * len(chunks)
+        pending = []
+        for i, chunk in enumerate(chunks):
+            cache_key = self._cache_key(chunk, provider, sentiment_only)
+            cached = self._cached_result(cache_key)
+            if cached is not None:
+                partials[i] = AnalysisResult(**cached)
             else:
-                # Fallback to manual parsing if JSON not found
-                return self._create_fallback_result(products)
+                pending.append((i, self._template(sentiment_only).format(products=self._encode_for_llm(chunk)), cache_key))
+        
+        if pending:
+            with self.metrics.span("llm"):
+                responses = provider.batch([prompt for _, prompt, _ in pending], json_mode=self.json_mode,
+                                           max_concurrency=self.llm_map_concurrency)
+            for (i, prompt, cache_key), response in zip(pending, responses):
+                if isinstance(response, LLMUnavailableError):
+                    print(f"LLM unavailable for chunk {i + 1}/{len(chunks)}, using local analysis: {str(response)}")
+                    partials[i] = self._create_fallback_result(chunks[i], reason="unavailable")
+                elif isinstance(response, Exception):
+                    raise response
+                else:
+                    self._record_llm_call(provider, prompt, response)
+                    partials[i] = self._parse_llm_response(response, chunks[i], cache_key, sentiment_only)
+        
+        with self.metrics.span("reduce"):
+            return AnalysisResult(**merge_analyses(
+                [(len(chunk), partial.dict()) for chunk, partial in zip(chunks, partials)]
+            ))
+    
+    @staticmethod
+    async def _run_in_thread(executor: Optional[Executor], fn, *args) -> Any:
+        """
+        Like `asyncio.to_thread`, but on `executor` when one is given. The
+        context is copied either way, so spans reach the request's timings.
+        """
+        if executor is None:
+            return await asyncio.to_thread(fn, *args)
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(executor, functools.partial(context.run, fn, *args))
+
+    async def _analyze_with_llm_async(self, products: List[Dict], provider: Optional[LLMProvider] = None,
+                                      executor: Optional[Executor] = None) -> AnalysisResult:
+        """
+        Async variant of `_analyze_with_llm` that does not block the event loop.
+        Blocking work runs on `executor` (the default executor if None).
+        """
+        provider = provider or self.provider
+        if self._needs_map_reduce(products):
+            return await self._run_in_thread(executor, self._analyze_map_reduce, products, provider)
+        # Hashing the products, the cache (sqlite) and encoding block, so they run off the loop
+        cache_key, cached = await self._run_in_thread(executor, self._cache_lookup, products, provider)
+        if cached is not None:
+            return AnalysisResult(**cached)
+        
+        # Encoding samples reviews and can take a while for long lists
+        products_text = await self._run_in_thread(executor, self._encode_for_llm, products)
+        prompt = self.prompt_template.format(products=products_text)
+        try:
+            with self.metrics.span("llm"):
+                response = await provider.ainvoke(prompt, json_mode=self.json_mode)
+        except LLMUnavailableError as e:
+            print(f"LLM unavailable, using local analysis: {str(e)}")
+            return await self._run_in_thread(executor, self._create_fallback_result, products, "unavailable")
+        self._record_llm_call(provider, prompt, response)
+        
+        # Parsing writes the result to the cache
+        return await self._run_in_thread(executor, self._parse_llm_response, response, products, cache_key)
+    
+    def _analyze_with_llm_stream(self, products: List[Dict], provider: Optional[LLMProvider] = None) -> Iterator[Tuple[str, Any]]:
+        """
+        Streaming variant of `_analyze_with_llm`.
+        Yields (event, value) pairs as soon as each part of the analysis is
+        complete in the model's token stream (see `analyze_products_stream`),
+        then ("result", full analysis dict).
+        Chunked (map-reduce) analyses are only replayed once merged.
+        """
+        provider = provider or self.provider
+        if self._needs_map_reduce(products):
+            result = self._analyze_map_reduce(products, provider).dict()
+            yield from self._result_events(result)
+            yield "result", result
+            return
+        cache_key, cached = self._cache_lookup(products, provider)
+        if cached is not None:
+            yield from self._result_events(cached)
+            yield "result", cached
+            return
+        
+        # Locally computed parts can be shown before the LLM responds
+        if self.analysis_mode == "hybrid":
+            for product in top_products_by_rating(products):
+                yield "product", ProductFeature.from_record(product).dict()
+            yield "price_range", compute_price_range(products)
+        
+        parser = IncrementalJSONParser(self.stream_events)
+        prompt = self.prompt_template.format(products=self._encode_for_llm(products))
+        try:
+            for chunk in self.metrics.timed_iter("llm", provider.stream(prompt)):
+                for path, value in parser.feed(chunk):
+                    event = self._stream_event(path, value)
+                    if event is not None:
+                        yield event
+        except LLMUnavailableError as e:
+            # The final result replaces anything streamed before the failure
+            print(f"LLM unavailable, using local analysis: {str(e)}")
+            yield "result", self._create_fallback_result(products, reason="unavailable").dict()
+            return
+        self._record_llm_call(provider, prompt, parser.text)
+        
+        analysis = self._parse_llm_response(parser.text, products, cache_key)
+        yield "result", analysis.dict()
+    
+    def _stream_event(self, path: Tuple, value: Any) -> Optional[Tuple[str, Any]]:
+        """
+        Turn a value completed by the incremental parser into an (event, value) pair.
+        """
+        event = self.stream_events[tuple(ANY if isinstance(p, int) else p for p in path)]
+        if event == "product":
+            try:
+                value = ProductFeature(**value).dict()
+            except Exception:
+                return None
+        return event, value
+    
+    @staticmethod
+    def _result_events(result: Dict) -> Iterator[Tuple[str, Any]]:
+        """
+        Replay a complete analysis as stream events.
+        """
+        for product in result["top_products"]:
+            yield "product", product
+        yield "price_range", result["price_range"]
+        sentiment = result["sentiment"]
+        if "overall" in sentiment:
+            yield "overall", sentiment["overall"]
+        for point in sentiment.get("positive_points", []):
+            yield "positive_point", point
+        for point in sentiment.get("negative_points", []):
+            yield "negative_point", point
+    
+    def _parse_llm_response(self, response_text: str, products: List[Dict], cache_key: str,
+                            sentiment_only: bool = False) -> AnalysisResult:
+        """
+        Parse and validate the analysis JSON from an LLM response and cache it.
+        Almost-valid JSON is repaired first; the local fallback result is only
+        used when that fails too.
+        """
+        try:
+            with self.metrics.span("parse"):
+                data, repaired = loads_lenient(response_text)
+                analysis = self._result_from_data(data, products, sentiment_only)
         except Exception as e:
+            self._record_parse("failed")
             print(f"Error parsing LLM response: {str(e)}")
-            # Fallback to manual parsing
             return self._create_fallback_result(products)
+        self._record_parse("repaired" if repaired else "parsed")
+        self.cache.set(cache_key, analysis.dict())
+        return analysis
+    
+    def _record_parse(self, outcome: str) -> None:
+        with self._parse_stats_lock:
+            self.parse_stats[outcome] += 1
+        self.metrics.inc("analyzer_llm_parse_total", outcome=outcome)
     
-    def _create_fallback_result(self, products: List[Dict]) -> AnalysisResult:
+    def parse_failure_rate(self) -> float:
         """
-        Create a fallback result when LLM parsing fails.
+        Share of LLM responses (or batched parts) that could not be parsed, even after repair.
         """
-        # Sort products by rating
-        sorted_products = sorted(products, key=lambda x: x["rating"], reverse=True)
-        top_products = sorted_products[:min(3, len(sorted_products))]
-        
-        # Calculate price range
-        prices = [p["price"] for p in products]
-        min_price = min(prices) if prices else 0
-        max_price = max(prices) if prices else 0
-        avg_price = sum(prices) / len(prices) if prices else 0
-        
-        # Extract sentiment from reviews
-        all_reviews = []
-        for product in products:
-            all_reviews.extend(product["reviews"])
-        
-        # Simple sentiment analysis
-        positive_keywords = ["good", "great", "excellent", "amazing", "love", "perfect", "best", "recommend"]
-        negative_keywords = ["bad", "poor", "terrible", "disappointed", "issue", "problem", "worst", "avoid"]
-        
-        positive_points = []
-        negative_points = []
-        
-        for review in all_reviews:
-            for keyword in positive_keywords:
-                if keyword in review.lower() and review not in positive_points:
-                    positive_points.append(review)
-            
-            for keyword in negative_keywords:
-                if keyword in review.lower() and review not in negative_points:
-                    negative_points.append(review)
-        
-        # Limit to top 3 points
-        positive_points = positive_points[:3]
-        negative_points = negative_points[:3]
-        
-        # Determine overall sentiment
-        if len(positive_points) > len(negative_points) * 2:
-            overall_sentiment = "Very Positive"
-        elif len(positive_points) > len(negative_points):
-            overall_sentiment = "Positive"
-        elif len(negative_points) > len(positive_points) * 2:
-            overall_sentiment = "Very Negative"
-        elif len(negative_points) > len(positive_points):
-            overall_sentiment = "Negative"
-        else:
-            overall_sentiment = "Mixed"
-        
+        with self._parse_stats_lock:
+            total = sum(self.parse_stats.values())
+            return self.parse_stats["failed"] / total if total else 0.0
+    
+    def _result_from_data(self, data: Dict[str, Any], products: List[Dict], sentiment_only: bool = False) -> AnalysisResult:
+        """
+        Build the analysis from the parsed LLM JSON; in hybrid mode (or for
+        sentiment-only prompts) it is only the sentiment part.
+        """
+        if sentiment_only or self.analysis_mode == "hybrid":
+            return self._create_local_result(products, data)
+        return AnalysisResult(**data)
+    
+    @staticmethod
+    def _split_batch_response(response_text: str) -> Tuple[Dict[str, Any], bool]:
+        """
+        Per-list parts of a batched response, keyed by list id, and whether the JSON needed repair.
+        """
+        data, repaired = loads_lenient(response_text)
+        results = data.get("results", data) if isinstance(data, dict) else None
+        if not isinstance(results, dict):
+            return {}, repaired
+        return {str(list_id).strip("# "): part for list_id, part in results.items()}, repaired
+    
+    def _create_local_result(self, products: Iterable[Dict], sentiment: Dict[str, Any]) -> AnalysisResult:
+        """
+        Combine locally computed price range and top products with a sentiment summary.
+        """
+        return self._result_from_stats(ProductStats(review_sample=0).extend(products), sentiment)
+    
+    @staticmethod
+    def _result_from_stats(stats: ProductStats, sentiment: Dict[str, Any]) -> AnalysisResult:
+        # The model may wrap the summary in a "sentiment" key
+        sentiment = sentiment.get("sentiment", sentiment)
         return AnalysisResult(
-            top_products=top_products,
-            price_range={
-                "min": min_price,
-                "max": max_price,
-                "average": avg_price
-            },
-            sentiment={
-                "overall": overall_sentiment,
-                "positive_points": positive_points,
-                "negative_points": negative_points
-            }
+            top_products=[ProductFeature.from_record(product) for product in stats.top_products()],
+            price_range=stats.price_range(),
+            sentiment=sentiment
         )
+    
+    def _local_result(self, products: Iterable[Dict]) -> AnalysisResult:
+        """
+        Price range, top products and keyword sentiment over a review sample, in one pass over `products`.
+        """
+        stats = ProductStats(review_sample=self.review_sample_size).extend(products)
+        return self._result_from_stats(stats, self.sentiment_scorer.summarize(stats.reviews()))
+    
+    def _create_fallback_result(self, products: Iterable[Dict], reason: str = "parse") -> AnalysisResult:
+        """
+        Create a fallback result when LLM parsing fails (or the LLM is unavailable).
+        """
+        self.metrics.inc("analyzer_fallbacks_total", reason=reason)
+        with self.metrics.span("fallback"):
+            return self._local_result(products)
+    
+    def _fallback_sentiment(self, products: Iterable[Dict]) -> Dict[str, Any]:
+        """
+        Keyword-based sentiment summary used when the LLM result is unavailable.
+        """
+        stats = ProductStats(top_n=0, review_sample=self.review_sample_size).extend(products)
+        return self.sentiment_scorer.summarize(stats.reviews())
+    
+    def _analyze_locally(self, platform: str, category: str, min_price: int, max_price: int) -> Dict:
+        """
+        "local" mode analysis: products are aggregated as they stream in from
+        the scraper or catalog and never held as a list, so memory use stays
+        the same however many listings the category has.
+        """
+        return self._local_result(self._iter_products(platform, category, min_price, max_price)).dict()
+    
+    def _analyze_locally_stream(self, platform: str, category: str, min_price: int, max_price: int) -> Iterator[Tuple[str, Any]]:
+        result = self._analyze_locally(platform, category, min_price, max_price)
+        yield from self._result_events(result)
+        yield "result", result
+
+    def _band_entries(self, platform: str, category: str, bands: List[Tuple[int, int]]) -> List[Dict]:
+        """
+        Cached {"products", "sentiment"} entry per band. Bands missing from the
+        cache are scraped together in one call covering their span.
+        """
+        prefix = self._flight_key(platform, category, 0, 0)[:2]
+        entries = [self.bands.get(prefix + (low,)) for low, _ in bands]
+        missing = [i for i, entry in enumerate(entries) if entry is None]
+        if missing:
+            span = bands[missing[0]:missing[-1] + 1]
+            products = self._scrape_products(platform, category, span[0][0], span[-1][1])
+            for band, band_products in zip(range(missing[0], missing[-1] + 1), split_into_bands(products, span)):
+                if entries[band] is None:
+                    entries[band] = {"products": band_products, "sentiment": None}
+                    self.bands.set(prefix + (bands[band][0],), entries[band])
+        return entries
+
+    def _band_sentiment(self, products: List[Dict], provider: LLMProvider) -> Dict[str, Any]:
+        # Price range and top products are computed locally from the bands, so
+        # the LLM is only asked for the sentiment whatever the analysis mode
+        return self._analyze_with_llm(products, provider, sentiment_only=True).sentiment
+
+    def _analyze_banded_stream(self, platform: str, category: str, min_price: int, max_price: int) -> Iterator[Tuple[str, Any]]:
+        """
+        Price-band variant of `_analyze_with_llm_stream`: merges cached bands,
+        computes price range and top products locally for the exact range and
+        runs the LLM only for bands without a sentiment summary yet.
+        Sentiment is only known once every band's summary is merged, so the
+        band LLM calls are not streamed; the sentiment events follow them.
+        """
+        entries = self._band_entries(platform, category, price_bands(min_price, max_price, self.price_band_width))
+        in_range = [
+            [product for product in entry["products"] if min_price <= product["price"] <= max_price]
+            for entry in entries
+        ]
+        products = [product for band_products in in_range for product in band_products]
+        stats = ProductStats(review_sample=0).extend(products)
+        top_products = [ProductFeature.from_record(product) for product in stats.top_products()]
+        price_range = stats.price_range()
+        for product in top_products:
+            yield "product", product.dict()
+        yield "price_range", price_range
+        
+        entries = [entry for entry, band_products in zip(entries, in_range) if band_products]
+        pending = [entry for entry in entries if entry["sentiment"] is None]
+        if pending:
+            provider = self._provider_for(category)
+            # Each worker runs in a copy of this context so its spans reach the request's timings
+            contexts = [contextvars.copy_context() for _ in pending]
+            with ThreadPoolExecutor(max_workers=min(len(pending), self.band_workers)) as pool:
+                sentiments = pool.map(
+                    lambda context, products: context.run(self._band_sentiment, products, provider),
+                    contexts, [entry["products"] for entry in pending]
+                )
+                for entry, sentiment in zip(pending, sentiments):
+                    entry["sentiment"] = sentiment
+        
+        # Band sentiment covers whole bands, so edge bands may include products
+        # just outside the range; each band is weighted by its in-range products
+        sentiment = merge_sentiments([
+            (len(band_products), entry["sentiment"])
+            for entry, band_products in zip(entries, filter(None, in_range))
+        ])
+        if sentiment is None:
+            sentiment = self._fallback_sentiment(products)
+        result = AnalysisResult(top_products=top_products, price_range=price_range, sentiment=sentiment).dict()
+        yield "overall", result["sentiment"]["overall"]
+        for point in result["sentiment"]["positive_points"]:
+            yield "positive_point", point
+        for point in result["sentiment"]["negative_points"]:
+            yield "negative_point", point
+        yield "result", result
+
+    def _analyze_banded(self, platform: str, category: str, min_price: int, max_price: int) -> Dict:
+        for event, value in self._analyze_banded_stream(platform, category, min_price, max_price):
+            if event == "result":
+                return value
+
+    def _uses_price_bands(self, category: str) -> bool:
+        # Generic placeholder data is generated for the requested range only, so
+        # bands are limited to categories the catalog can answer for a whole band
+        return bool(self.price_band_width) and self.router.resolve(category) in self.catalog
+
+    @staticmethod
+    def _flight_key(platform: str, category: str, min_price: int, max_price: int) -> Tuple:
+        return (platform.strip().lower(), " ".join(category.lower().split()), int(min_price), int(max_price))
 
     def analyze_products(self, platform: str, category: str, min_price: int, max_price: int) -> Dict:
         """
         Main method to analyze products from the specified platform.
+        Concurrent calls for the same (platform, category, price band) share one analysis.
         """
+        key = self._flight_key(platform, category, min_price, max_price)
+        return self.flights.do(key, self._analyze_products, platform, category, min_price, max_price)
+
+    def _analyze_products(self, platform: str, category: str, min_price: int, max_price: int) -> Dict:
+        self.metrics.inc("analyzer_requests_total")
+        if self.analysis_mode == "local":
+            return self._analyze_locally(platform, category, min_price, max_price)
+        if self._uses_price_bands(category):
+            return self._analyze_banded(platform, category, min_price, max_price)
+        
         # Scrape products
         products = self._scrape_products(platform, category, min_price, max_price)
         
         # Analyze with LLM
-        analysis = self._analyze_with_llm(products)
+        analysis = self._analyze_with_llm(products, self._provider_for(category))
         
         return analysis.dict()
 
-    def _get_ac_data(self, min_price, max_price):
-        acs = [
-            {
-                "name": "LG 1.5 Ton 5 Star AI Dual Inverter Split AC",
-                "price": 44990,
-                "features": [
-                    "AI Convertible 6-in-1",
-                    "Dual Inverter Compressor",
-                    "Ocean Black Protection",
-                    "HD Filter with Anti-Virus",
-                    "Smart AC with IoT"
-                ],
-                "rating": 4.7,
-                "reviews": [
-                    "Excellent cooling performance",
-                    "Very energy efficient",
-                    "Smart features work well",
-                    "Quiet operation",
-                    "Premium build quality"
-                ]
-            },
-            {
-                "name": "Samsung 1.5 Ton 5 Star WindFree™ Split AC",
-                "price": 42990,
-                "features": [
-                    "WindFree™ Cooling",
-                    "Digital Inverter Technology",
-                    "Triple Protection Filter",
-                    "Auto Clean",
-                    "SmartThings App Control"
-                ],
-                "rating": 4.6,
-                "reviews": [
-                    "Gentle cooling is amazing",
-                    "Great energy savings",
-                    "Easy to maintain",
-                    "Good app integration",
-                    "Premium features"
-                ]
-            },
-            {
-                "name": "Daikin 1.5 Ton 5 Star Inverter Split AC",
-                "price": 39990,
-                "features": [
-                    "Coanda Airflow",
-                    "Inverter Technology",
-                    "PM 2.5 Filter",
-                    "Powerful Mode",
-                    "Auto Restart"
-                ],
-                "rating": 4.8,
-                "reviews": [
-                    "Best cooling performance",
-                    "Very reliable",
-                    "Energy efficient",
-                    "Easy to clean",
-                    "Worth the investment"
-                ]
-            },
-            {
-                "name": "Voltas 1.5 Ton 5 Star Inverter Split AC",
-                "price": 32990,
-                "features": [
-                    "iFeel Technology",
-                    "Inverter Compressor",
-                    "Anti-Dust Filter",
-                    "Sleep Mode",
-                    "Auto Restart"
-                ],
-                "rating": 4.4,
-                "reviews": [
-                    "Good value for money",
-                    "Efficient cooling",
-                    "Quiet operation",
-                    "Easy to install",
-                    "Reliable performance"
-                ]
-            },
-            {
-                "name": "Blue Star 1.5 Ton 5 Star Inverter Split AC",
-                "price": 34990,
-                "features": [
-                    "Flexi Cool Technology",
-                    "Inverter Compressor",
-                    "PM 2.5 Filter",
-                    "Sleep Mode",
-                    "Auto Restart"
-                ],
-                "rating": 4.5,
-                "reviews": [
-                    "Great cooling performance",
-                    "Energy efficient",
-                    "Good build quality",
-                    "Easy maintenance",
-                    "Value for money"
-                ]
-            }
-        ]
-        
-        # Filter by price range
-        filtered_acs = [ac for ac in acs if min_price <= ac["price"] <= max_price]
-        return filtered_acs 
+    def analyze_products_stream(self, platform: str, category: str, min_price: int, max_price: int) -> Iterator[Tuple[str, Any]]:
+        """
+        Streaming variant of `analyze_products`.
+        Yields ("product", dict), ("price_range", dict), ("overall", str),
+        ("positive_point", str) and ("negative_point", str) events while the
+        LLM is still generating, then ("result", dict) with the final analysis,
+        which may differ if the streamed response could not be parsed.
+        If the same analysis is already in flight, waits for it and replays its result.
+        """
+        key = self._flight_key(platform, category, min_price, max_price)
+        while True:
+            future, leader = self.flights.begin(key)
+            if leader:
+                break
+            try:
+                with self.metrics.span("coalesced_wait"):
+                    result = copy.deepcopy(future.result())
+            except FlightAbandoned:
+                continue
+            yield from self._result_events(result)
+            yield "result", result
+            return
+        
+        self.metrics.inc("analyzer_requests_total")
+        finished = False
+        try:
+            if self.analysis_mode == "local":
+                events = self._analyze_locally_stream(platform, category, min_price, max_price)
+            elif self._uses_price_bands(category):
+                events = self._analyze_banded_stream(platform, category, min_price, max_price)
+            else:
+                products = self._scrape_products(platform, category, min_price, max_price)
+                events = self._analyze_with_llm_stream(products, self._provider_for(category))
+            for event, value in events:
+                if event == "result":
+                    # Release waiters before handing the result to the consumer
+                    self.flights.finish(key, future, result=copy.deepcopy(value))
+                    finished = True
+                yield event, value
+        except BaseException as e:
+            if not finished:
+                self.flights.finish(key, future, error=e)
+            raise
+        if not finished:
+            self.flights.finish(key, future, error=FlightAbandoned("stream ended without a result"))
+
+    async def analyze_products_async(self, platform: str, category: str, min_price: int, max_price: int,
+                                     executor: Optional[Executor] = None) -> Dict:
+        """
+        Async variant of `analyze_products`.
+        Scraping runs in a worker thread of `executor` (the event loop's default
+        executor if None) and the LLM call uses the provider's async API.
+        Coalesces with in-flight sync, streaming and async calls for the same analysis.
+        """
+        key = self._flight_key(platform, category, min_price, max_price)
+        return await self.flights.do_async(key, self._analyze_products_async, platform, category, min_price, max_price,
+                                           executor)
+
+    async def _analyze_products_async(self, platform: str, category: str, min_price: int, max_price: int,
+                                      executor: Optional[Executor] = None) -> Dict:
+        self.metrics.inc("analyzer_requests_total")
+        if self.analysis_mode == "local":
+            return await self._run_in_thread(executor, self._analyze_locally, platform, category, min_price, max_price)
+        if self._uses_price_bands(category):
+            return await self._run_in_thread(executor, self._analyze_banded, platform, category, min_price, max_price)
+        products = await self._run_in_thread(executor, self._scrape_products, platform, category, min_price, max_price)
+        analysis = await self._analyze_with_llm_async(products, self._provider_for(category), executor)
+        return analysis.dict()
+
+    def analyze_products_batch(self, analysis_requests: Iterable[Dict], batch_size: Optional[int] = None,
+                               max_concurrency: int = 4) -> List[Any]:
+        """
+        Analyze several (platform, category, min_price, max_price) requests with few LLM round-trips.
+        Each request is a dict with the keyword arguments of `analyze_products`.
+        Product lists that miss the cache are packed `batch_size` at a time into
+        one prompt; lists whose part of the response is missing or invalid are
+        retried on their own through the provider's `batch` API. Returns one result
+        per request, in order; if a request fails, its result is the raised
+        exception instead of the analysis dict. Price bands are not used.
+        """
+        analysis_requests = list(analysis_requests)
+        batch_size = batch_size or self.llm_batch_size
+        results: List[Any] = [None] * len(analysis_requests)
+        self.metrics.inc("analyzer_requests_total", len(analysis_requests))
+        
+        if self.analysis_mode == "local":
+            # No LLM calls to batch; each request is aggregated as its products stream in
+            with ThreadPoolExecutor(max_workers=max(1, min(len(analysis_requests), max_concurrency))) as pool:
+                analyses = [pool.submit(self._analyze_locally, **request) for request in analysis_requests]
+            return [analysis.exception() or analysis.result() for analysis in analyses]
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(len(analysis_requests), max_concurrency))) as pool:
+            scrapes = [pool.submit(self._scrape_products, **request) for request in analysis_requests]
+        
+        # (request index, products, products_text, cache_key) for every cache miss, by provider
+        pending: Dict[str, List[Tuple]] = {}
+        providers: Dict[str, LLMProvider] = {}
+        for index, (request, scrape) in enumerate(zip(analysis_requests, scrapes)):
+            try:
+                products = scrape.result()
+            except Exception as e:
+                results[index] = e
+                continue
+            provider = self._provider_for(request["category"])
+            if self._needs_map_reduce(products):
+                # Too long to share a prompt; its chunks are sent in parallel on their own
+                try:
+                    results[index] = self._analyze_map_reduce(products, provider).dict()
+                except Exception as e:
+                    results[index] = e
+                continue
+            cache_key = self._cache_key(products, provider)
+            cached = self._cached_result(cache_key)
+            if cached is not None:
+                results[index] = AnalysisResult(**cached).dict()
+            else:
+                providers[provider.key] = provider
+                pending.setdefault(provider.key, []).append((index, products, self._encode_for_llm(products), cache_key))
+        
+        for provider_key, provider_pending in pending.items():
+            provider = providers[provider_key]
+            groups = [provider_pending[start:start + batch_size] for start in range(0, len(provider_pending), batch_size)]
+            retry = [group[0] for group in groups if len(group) == 1]
+            groups = [group for group in groups if len(group) > 1]
+            if groups:
+                prompts = [self.batch_prompt_template.format(
+                    products="\n".join(f"## {n}\n{text}" for n, (_, _, text, _) in enumerate(group, 1))
+                ) for group in groups]
+                with self.metrics.span("llm"):
+                    responses = provider.batch(prompts, json_mode=self.json_mode, max_concurrency=max_concurrency)
+                for group, prompt, response in zip(groups, prompts, responses):
+                    if isinstance(response, Exception):
+                        # No response to parse; the lists are retried without counting a parse failure
+                        print(f"Error in batched LLM call: {str(response)}")
+                        retry.extend(group)
+                        continue
+                    self._record_llm_call(provider, prompt, response)
+                    try:
+                        parts, repaired = self._split_batch_response(response)
+                    except Exception as e:
+                        print(f"Error parsing batched LLM response: {str(e)}")
+                        parts, repaired = {}, False
+                    for n, (index, products, products_text, cache_key) in enumerate(group, 1):
+                        try:
+                            analysis = self._result_from_data(parts[str(n)], products)
+                        except Exception:
+                            self._record_parse("failed")
+                            retry.append((index, products, products_text, cache_key))
+                            continue
+                        self._record_parse("repaired" if repaired else "parsed")
+                        self.cache.set(cache_key, analysis.dict())
+                        results[index] = analysis.dict()
+            
+            # Lists the batched calls could not answer get a call of their own
+            if retry:
+                prompts = [self.prompt_template.format(products=products_text) for _, _, products_text, _ in retry]
+                with self.metrics.span("llm"):
+                    responses = provider.batch(prompts, json_mode=self.json_mode, max_concurrency=max_concurrency)
+                for (index, products, _, cache_key), prompt, response in zip(retry, prompts, responses):
+                    if isinstance(response, LLMUnavailableError):
+                        results[index] = self._create_fallback_result(products, reason="unavailable").dict()
+                    elif isinstance(response, Exception):
+                        results[index] = response
+                    else:
+                        self._record_llm_call(provider, prompt, response)
+                        results[index] = self._parse_llm_response(response, products, cache_key).dict()
+        return results
+
+    async def analyze_many(self, analysis_requests: Iterable[Dict], max_concurrency: int = 4) -> AsyncIterator[Tuple[Dict, Any]]:
+        """
+        Analyze several (platform, category, min_price, max_price) requests concurrently.
+        Each request is a dict with the keyword arguments of `analyze_products`.
+        Yields (request, result) pairs in completion order; if a request fails,
+        its result is the raised exception instead of the analysis dict.
+        Scrapes run on a thread pool of `max_concurrency` workers rather than
+        the event loop's default executor, which may have fewer.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        executor = ThreadPoolExecutor(max_workers=max(1, max_concurrency))
+
+        async def run(request: Dict) -> Tuple[Dict, Any]:
+            async with semaphore:
+                try:
+                    return request, await self.analyze_products_async(**request, executor=executor)
+                except Exception as e:
+                    return request, e
+
+        tasks = [asyncio.ensure_future(run(request)) for request in analysis_requests]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Don't leave work running if the caller stops iterating early
+            for task in tasks:
+                task.cancel()
+            executor.shutdown(wait=False)
@@ -0,0 +1,110 @@
+import json
+import math
+from typing import Dict, List, Optional
+
+from review_sampling import sample_reviews
+from sentiment import KeywordSentimentScorer
+
+# Column layout of the compact product table; the prompt template explains it to the model
+TABLE_HEADER = "name|price|rating|features|reviews"
+LIST_SEPARATOR = "; "
+
+# Splits reviews into positive, negative and neutral strata for sampling
+_scorer = KeywordSentimentScorer()
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count for Llama-style BPE tokenizers (about 4 characters per token).
+    """
+    return math.ceil(len(text) / 4)
+
+
+def _clean(value: str) -> str:
+    # Keep every product on one line and the column separator unambiguous
+    return " ".join(str(value).split()).replace("|", "/")
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else str(value)
+
+
+def _review_tokens(review: str) -> int:
+    return estimate_tokens(review + LIST_SEPARATOR)
+
+
+def encode_products(products: List[Dict], token_budget: Optional[int] = None) -> str:
+    """
+    Encode products as a compact pipe-separated table, one product per line.
+
+    Reviews repeated across products are kept only the first time they appear,
+    and near-duplicate reviews of a product are dropped (see `review_sampling`).
+    With a `token_budget`, each product gets an equal share of it. The part of
+    the share left after name, price, rating and features is filled with a
+    sample of reviews stratified by sentiment, preferring informative lengths;
+    if the row is still too long it loses features from the end. Name, price
+    and rating are always kept, so prompt size is bounded however many
+    reviews a product has.
+    """
+    seen_reviews = set()
+    rows = []
+    per_product = token_budget // max(len(products), 1) if token_budget else None
+    for product in products:
+        features = [_clean(f) for f in product["features"]]
+        # Only reviews kept in a row count as seen for the products after it
+        reviews = []
+        candidates = set()
+        for review in product["reviews"]:
+            review = _clean(review)
+            if review.lower() not in seen_reviews and review.lower() not in candidates:
+                candidates.add(review.lower())
+                reviews.append(review)
+
+        head = f"{_clean(product['name'])}|{_number(product['price'])}|{_number(product['rating'])}"
+        review_budget = None
+        if per_product:
+            review_budget = max(0, per_product - estimate_tokens(f"{head}|{LIST_SEPARATOR.join(features)}|"))
+        reviews = sample_reviews(reviews, review_budget, cost=_review_tokens, classify=_scorer.classify)
+        row = f"{head}|{LIST_SEPARATOR.join(features)}|{LIST_SEPARATOR.join(reviews)}"
+        while per_product and estimate_tokens(row) > per_product and (reviews or features):
+            if reviews:
+                reviews.pop()
+            else:
+                features.pop()
+            row = f"{head}|{LIST_SEPARATOR.join(features)}|{LIST_SEPARATOR.join(reviews)}"
+        seen_reviews.update(review.lower() for review in reviews)
+        rows.append(row)
+    return "\n".join([TABLE_HEADER] + rows)
+
+
+def prompt_token_report(products: List[Dict], template: str, products_text: str) -> Dict[str, int]:
+    """
+    Compare the prompt size with the verbose `json.dumps(products, indent=2)` encoding against the compact one.
+    """
+    # Product records serialize through their mapping interface
+    verbose = template.format(products=json.dumps(products, indent=2, default=dict))
+    compact = template.format(products=products_text)
+    return {
+        "products": len(products),
+        "tokens_before": estimate_tokens(verbose),
+        "tokens_after": estimate_tokens(compact),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from catalog import get_default_catalog
+    from product_analyzer import ANALYSIS_PROMPT_TEMPLATE, PROMPT_TOKEN_BUDGET
+
+    parser = argparse.ArgumentParser(description="Report prompt token counts per catalog category.")
+    parser.add_argument("--budget", type=int, default=PROMPT_TOKEN_BUDGET)
+    args = parser.parse_args()
+
+    catalog = get_default_catalog()
+    print(f"{'category':<18} {'products':>8} {'before':>8} {'after':>8} {'saved':>7}")
+    for category in catalog.categories():
+        products = catalog.query(category, 0, float("inf"))
+        report = prompt_token_report(products, ANALYSIS_PROMPT_TEMPLATE, encode_products(products, args.budget))
+        saved = 1 - report["tokens_after"] / report["tokens_before"]
+        print(f"{category:<18} {report['products']:>8} {report['tokens_before']:>8} {report['tokens_after']:>8} {saved:>7.0%}")
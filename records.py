@@ -0,0 +1,90 @@
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Tuple
+
+FIELDS = ("name", "price", "features", "rating", "reviews")
+
+
+def intern_all(strings: Iterable[str]) -> Tuple[str, ...]:
+    """
+    The strings as a tuple, each replaced by its interned copy so repeated
+    features and reviews are stored once per process.
+    """
+    return tuple(sys.intern(s) for s in strings)
+
+
+class ProductRecord:
+    """
+    Compact product: a slotted object with float price and rating and tuples
+    of interned feature and review strings, instead of a dict holding two lists.
+
+    Records read like the product dicts they replace (`product["price"]`,
+    `dict(product)`, `ProductFeature(**product)`), so code written against
+    dicts keeps working. They are meant to be shared and are not modified.
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(self, name: str, price: float, features: Tuple[str, ...], rating: float,
+                 reviews: Tuple[str, ...]):
+        self.name = name
+        self.price = price
+        self.features = features
+        self.rating = rating
+        self.reviews = reviews
+
+    @classmethod
+    def from_dict(cls, product: Mapping[str, Any]) -> "ProductRecord":
+        if isinstance(product, cls):
+            return product
+        return cls(
+            sys.intern(product["name"]),
+            float(product["price"]),
+            intern_all(product.get("features") or ()),
+            float(product.get("rating") or 0.0),
+            intern_all(product.get("reviews") or ()),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "price": self.price,
+            "features": list(self.features),
+            "rating": self.rating,
+            "reviews": list(self.reviews),
+        }
+
+    # Read-only mapping protocol
+    def keys(self) -> Tuple[str, ...]:
+        return FIELDS
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in FIELDS else default
+
+    def __contains__(self, key: object) -> bool:
+        return key in FIELDS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(FIELDS)
+
+    def __len__(self) -> int:
+        return len(FIELDS)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ProductRecord):
+            return all(getattr(self, field) == getattr(other, field) for field in FIELDS)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ProductRecord(name={self.name!r}, price={self.price!r}, rating={self.rating!r})"
+
+
+def as_records(products: Iterable[Mapping[str, Any]]) -> List[ProductRecord]:
+    """
+    Convert product dicts (e.g. fresh from a scraper) to records; records pass through.
+    """
+    return [ProductRecord.from_dict(product) for product in products]
@@ -0,0 +1,314 @@
+import asyncio
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterator, Optional
+
+from llm_providers import LLMProvider
+
+
+class LLMUnavailableError(Exception):
+    """The provider did not answer in time or kept failing; callers should fall back."""
+
+
+class CircuitOpenError(LLMUnavailableError):
+    """The provider's circuit breaker is open, so the call was not attempted."""
+
+
+class LLMTimeoutError(TimeoutError):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker. Opens after `failure_threshold` consecutive
+    failed calls; once `reset_timeout` seconds have passed it lets one trial
+    call through, which closes it again on success or reopens it on failure.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._trial or time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if not self._trial and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._trial = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial = False
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+class LatencyTracker:
+    """
+    Latencies of the last `window` successful calls, for percentile estimates.
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        The `q` quantile (0-1) of recent latencies, or None until `min_samples` calls were recorded.
+        """
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+class ResilientProvider(LLMProvider):
+    """
+    Wraps a provider with a per-attempt deadline, retries with full-jitter
+    backoff, optional hedging and a circuit breaker.
+
+    With hedging, a second identical request is sent if the first has not
+    answered after the `hedge_percentile` latency of recent calls (or
+    `hedge_delay` seconds until enough calls were seen), and whichever answers
+    first wins. Calls that exhaust their retries, and calls made while the
+    breaker is open, raise `LLMUnavailableError`. Streams get the deadline as
+    an idle timeout between chunks and are only retried before their first chunk.
+    """
+
+    def __init__(self, provider: LLMProvider, timeout: float = 30.0, max_retries: int = 2,
+                 backoff_base: float = 0.5, backoff_max: float = 8.0, hedge: bool = False,
+                 hedge_delay: float = 2.0, hedge_percentile: float = 0.95,
+                 breaker: Optional[CircuitBreaker] = None, max_workers: int = 32):
+        super().__init__(provider.model_name)
+        self.provider = provider
+        self.name = provider.name
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay
+        self.hedge_percentile = hedge_percentile
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.latency = LatencyTracker()
+        self.stats = {"calls": 0, "retries": 0, "timeouts": 0, "hedges": 0, "rejected": 0}
+        self._stats_lock = threading.Lock()
+        # Abandoned attempts keep running here; Python threads cannot be cancelled
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+
+    @classmethod
+    def from_env(cls, provider: LLMProvider) -> "ResilientProvider":
+        return cls(
+            provider,
+            timeout=float(os.getenv("LLM_TIMEOUT", 30)),
+            max_retries=int(os.getenv("LLM_MAX_RETRIES", 2)),
+            backoff_base=float(os.getenv("LLM_BACKOFF_BASE", 0.5)),
+            backoff_max=float(os.getenv("LLM_BACKOFF_MAX", 8)),
+            hedge=os.getenv("LLM_HEDGING", "0") == "1",
+            hedge_delay=float(os.getenv("LLM_HEDGE_DELAY", 2)),
+            breaker=CircuitBreaker(
+                failure_threshold=int(os.getenv("LLM_BREAKER_FAILURES", 5)),
+                reset_timeout=float(os.getenv("LLM_BREAKER_RESET", 30)),
+            ),
+        )
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: a random delay up to the exponential cap
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _hedge_after(self) -> Optional[float]:
+        if not self.hedge:
+            return None
+        delay = self.latency.percentile(self.hedge_percentile)
+        delay = self.hedge_delay if delay is None else delay
+        return delay if delay < self.timeout else None
+
+    def _check_breaker(self) -> None:
+        self._count("calls")
+        if not self.breaker.allow():
+            self._count("rejected")
+            raise CircuitOpenError(f"{self.key} is unavailable (circuit open)")
+
+    def _give_up(self, error: BaseException) -> LLMUnavailableError:
+        self.breaker.record_failure()
+        return LLMUnavailableError(f"{self.key} failed after {self.max_retries + 1} attempts: {error}")
+
+    def _timed_invoke(self, prompt: str, json_mode: bool) -> str:
+        start = time.monotonic()
+        response = self.provider.invoke(prompt, json_mode)
+        self.latency.record(time.monotonic() - start)
+        return response
+
+    def _attempt(self, prompt: str, json_mode: bool) -> str:
+        deadline = time.monotonic() + self.timeout
+        attempts = [self._pool.submit(self._timed_invoke, prompt, json_mode)]
+        hedge_after = self._hedge_after()
+        if hedge_after is not None and not wait(attempts, timeout=hedge_after).done:
+            self._count("hedges")
+            attempts.append(self._pool.submit(self._timed_invoke, prompt, json_mode))
+
+        pending = set(attempts)
+        last_error = None
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for attempt in done:
+                if attempt.exception() is None:
+                    return attempt.result()
+                last_error = attempt.exception()
+        if pending or last_error is None:
+            self._count("timeouts")
+            raise LLMTimeoutError(f"No response from {self.key} within {self.timeout:.1f}s")
+        raise last_error
+
+    def invoke(self, prompt: str, json_mode: bool = False) -> str:
+        self._check_breaker()
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self._attempt(prompt, json_mode)
+            except Exception as e:
+                last_error = e
+                if attempt < self.max_retries:
+                    self._count("retries")
+                    time.sleep(self._backoff(attempt))
+                continue
+            self.breaker.record_success()
+            return response
+        raise self._give_up(last_error) from last_error
+
+    async def _timed_ainvoke(self, prompt: str, json_mode: bool) -> str:
+        start = time.monotonic()
+        response = await self.provider.ainvoke(prompt, json_mode)
+        self.latency.record(time.monotonic() - start)
+        return response
+
+    async def _attempt_async(self, prompt: str, json_mode: bool) -> str:
+        deadline = time.monotonic() + self.timeout
+        attempts = [asyncio.ensure_future(self._timed_ainvoke(prompt, json_mode))]
+        try:
+            hedge_after = self._hedge_after()
+            if hedge_after is not None and not (await asyncio.wait(attempts, timeout=hedge_after))[0]:
+                self._count("hedges")
+                attempts.append(asyncio.ensure_future(self._timed_ainvoke(prompt, json_mode)))
+
+            pending = set(attempts)
+            last_error = None
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    if attempt.exception() is None:
+                        return attempt.result()
+                    last_error = attempt.exception()
+            if pending or last_error is None:
+                self._count("timeouts")
+                raise LLMTimeoutError(f"No response from {self.key} within {self.timeout:.1f}s")
+            raise last_error
+        finally:
+            # Losing and timed-out attempts are cancelled, unlike threads
+            for attempt in attempts:
+                attempt.cancel()
+
+    async def ainvoke(self, prompt: str, json_mode: bool = False) -> str:
+        self._check_breaker()
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self._attempt_async(prompt, json_mode)
+            except Exception as e:
+                last_error = e
+                if attempt < self.max_retries:
+                    self._count("retries")
+                    await asyncio.sleep(self._backoff(attempt))
+                continue
+            self.breaker.record_success()
+            return response
+        raise self._give_up(last_error) from last_error
+
+    def _stream_with_deadline(self, prompt: str) -> Iterator[str]:
+        chunks: "queue.Queue[tuple]" = queue.Queue()
+
+        def produce() -> None:
+            try:
+                for chunk in self.provider.stream(prompt):
+                    chunks.put(("chunk", chunk))
+                chunks.put(("end", None))
+            except Exception as e:
+                chunks.put(("error", e))
+
+        threading.Thread(target=produce, daemon=True).start()
+        while True:
+            try:
+                kind, value = chunks.get(timeout=self.timeout)
+            except queue.Empty:
+                self._count("timeouts")
+                raise LLMTimeoutError(f"No output from {self.key} for {self.timeout:.1f}s")
+            if kind == "end":
+                return
+            if kind == "error":
+                raise value
+            yield value
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        self._check_breaker()
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            started = False
+            try:
+                for chunk in self._stream_with_deadline(prompt):
+                    started = True
+                    yield chunk
+            except Exception as e:
+                if started:
+                    # Part of the response was already handed out; a retry would repeat it
+                    raise self._give_up(e) from e
+                last_error = e
+                if attempt < self.max_retries:
+                    self._count("retries")
+                    time.sleep(self._backoff(attempt))
+                continue
+            self.breaker.record_success()
+            return
+        raise self._give_up(last_error) from last_error
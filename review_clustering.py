@@ -0,0 +1,205 @@
+"""
+Offline sentiment points from review clusters.
+
+Reviews are vectorized with TF-IDF and grouped with mini-batch k-means
+(cosine similarity on L2-normalized vectors). The review closest to the
+centre of each of the largest clusters represents it, so the points cover
+the themes most reviews talk about instead of the first reviews that happen
+to match a keyword. Polarity still comes from the keyword lexicon: positive
+and negative reviews are clustered separately.
+"""
+import re
+from collections import Counter
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sentiment import KeywordSentimentScorer, overall_sentiment
+
+# numpy is imported on first use; short review lists never need it
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+STOP_WORDS = frozenset("""
+a an and are as at be but by for from has have i in is it its it's my of on or so that the this to was were
+with very really just also i'm i've me we you they them our your their than then too
+""".split())
+
+
+def tokenize(review: str) -> List[str]:
+    return [token for token in _TOKEN.findall(review.lower()) if token not in STOP_WORDS]
+
+
+def normalize(review: str) -> str:
+    """
+    Lowercased review without punctuation or extra spaces, so "Good." and "good!" compare equal.
+    """
+    return " ".join(_PUNCTUATION.sub(" ", review.lower()).split())
+
+
+class ReviewClusterer:
+    """
+    TF-IDF vectorizer and mini-batch k-means over review texts.
+
+    The vocabulary is the `max_features` terms found in the most reviews
+    (seen in at least `min_df`), so memory is bounded by reviews x
+    max_features float32 values. k-means is seeded with k-means++ and
+    updated from `batch_size` reviews at a time (Sculley's mini-batch
+    k-means), which keeps clustering tens of thousands of reviews to about a
+    second. Clusters whose centres have a cosine similarity of at least
+    `merge_similarity` are reported as one theme, and themes with less than
+    `min_share` of the reviews (outliers) are not used as points.
+    """
+
+    def __init__(self, max_features: int = 512, min_df: int = 2, batch_size: int = 1024,
+                 iterations: int = 30, merge_similarity: float = 0.5, min_share: float = 0.02,
+                 seed: int = 0):
+        self.max_features = max_features
+        self.min_df = min_df
+        self.batch_size = batch_size
+        self.iterations = iterations
+        self.merge_similarity = merge_similarity
+        self.min_share = min_share
+        self.seed = seed
+
+    def vectorize(self, reviews: Sequence[str]):
+        """
+        L2-normalized TF-IDF matrix (reviews x terms) with sublinear term frequency.
+        """
+        import numpy as np
+        documents = [Counter(tokenize(review)) for review in reviews]
+        document_frequency = Counter(term for document in documents for term in document)
+        terms = [
+            term for term, df in sorted(document_frequency.items(), key=lambda item: (-item[1], item[0]))
+            if df >= self.min_df
+        ][:self.max_features]
+        columns = {term: j for j, term in enumerate(terms)}
+
+        rows, cols, counts = [], [], []
+        for i, document in enumerate(documents):
+            for term, count in document.items():
+                j = columns.get(term)
+                if j is not None:
+                    rows.append(i)
+                    cols.append(j)
+                    counts.append(count)
+        matrix = np.zeros((len(reviews), len(terms)), dtype=np.float32)
+        idf = np.log((1 + len(reviews)) / (1 + np.array([document_frequency[t] for t in terms], dtype=np.float32))) + 1
+        matrix[rows, cols] = (1 + np.log(np.array(counts, dtype=np.float32))) * idf[cols]
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
+
+    def kmeans(self, matrix, k: int):
+        """
+        (centroids, labels) of `k` clusters of the rows of `matrix`.
+        """
+        import numpy as np
+        rng = np.random.default_rng(self.seed)
+        n = matrix.shape[0]
+
+        # k-means++ seeding on a sample of rows
+        sample = matrix[rng.choice(n, size=min(n, max(self.batch_size, 10 * k)), replace=False)]
+        centroids = [sample[rng.integers(len(sample))]]
+        distances = 1 - sample @ centroids[0]
+        for _ in range(1, k):
+            weights = np.maximum(distances, 0)
+            total = weights.sum()
+            index = rng.choice(len(sample), p=weights / total) if total > 0 else rng.integers(len(sample))
+            centroids.append(sample[index])
+            distances = np.minimum(distances, 1 - sample @ sample[index])
+        centroids = np.array(centroids)
+
+        # Mini-batch updates with a per-centre learning rate of 1 / (points seen)
+        seen = np.zeros(k)
+        for _ in range(self.iterations):
+            batch = matrix[rng.choice(n, size=min(n, self.batch_size), replace=False)]
+            nearest = np.argmax(batch @ centroids.T, axis=1)
+            for c in np.unique(nearest):
+                members = batch[nearest == c]
+                seen[c] += len(members)
+                centroids[c] += (members.sum(axis=0) - len(members) * centroids[c]) / seen[c]
+
+        labels = np.concatenate([
+            np.argmax(matrix[start:start + self.batch_size] @ centroids.T, axis=1)
+            for start in range(0, n, self.batch_size)
+        ])
+        return centroids, labels
+
+    def representatives(self, reviews: Sequence[str], k: int) -> List[Tuple[int, str]]:
+        """
+        (size, representative review) of each theme found with `k` clusters, largest first.
+        """
+        import numpy as np
+        matrix = self.vectorize(reviews)
+        centroids, labels = self.kmeans(matrix, min(k, len(reviews)))
+        centres = centroids / np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+        clusters = []
+        for c in range(len(centroids)):
+            members = np.flatnonzero(labels == c)
+            if len(members):
+                closest = members[np.argmax(matrix[members] @ centroids[c])]
+                clusters.append([len(members), int(members[0]), reviews[closest], c])
+        # Largest first; equal sizes keep the order the clusters' first reviews appeared in
+        clusters.sort(key=lambda cluster: (-cluster[0], cluster[1]))
+
+        # A theme split over several clusters is represented by its largest one;
+        # a cluster joins a theme if its centre is close to any of the theme's clusters
+        themes = []
+        for size, first, review, c in clusters:
+            for theme in themes:
+                if max(float(centres[c] @ centres[other]) for other in theme[3]) >= self.merge_similarity:
+                    theme[0] += size
+                    theme[3].append(c)
+                    break
+            else:
+                themes.append([size, first, review, [c]])
+        themes.sort(key=lambda theme: (-theme[0], theme[1]))
+        return [(size, review) for size, _, review, _ in themes]
+
+    def points(self, reviews: Sequence[str], max_points: int = 3) -> List[str]:
+        """
+        Representatives of the `max_points` largest themes among `reviews`.
+        Points are distinct: reviews that differ only in case, spacing or
+        punctuation count once. When fewer themes are large enough (small or
+        one-note review sets), the remaining slots are filled with
+        representatives of the smaller themes, then the next distinct reviews
+        in order, so there are fewer than `max_points` points only if there
+        are fewer distinct reviews.
+        """
+        distinct: Dict[str, str] = {}
+        for review in reviews:
+            distinct.setdefault(normalize(review), review)
+        if len(distinct) <= max_points:
+            return list(distinct.values())
+        # A few more clusters than points, so the largest ones are coherent themes
+        themes = self.representatives(reviews, 2 * max_points)
+        large = [review for size, review in themes if size >= self.min_share * len(reviews)]
+        points: List[str] = []
+        seen = set()
+        for review in chain(large, (review for _, review in themes), distinct.values()):
+            key = normalize(review)
+            if key not in seen:
+                seen.add(key)
+                points.append(review)
+                if len(points) == max_points:
+                    break
+        return points
+
+
+class ClusteredSentimentScorer(KeywordSentimentScorer):
+    """
+    Keyword sentiment scorer whose positive and negative points are cluster
+    representatives rather than the first matching reviews.
+    """
+
+    def __init__(self, *args, clusterer: Optional[ReviewClusterer] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.clusterer = clusterer or ReviewClusterer()
+
+    def summarize(self, reviews: Iterable[str], max_points: int = 3) -> Dict[str, Any]:
+        positive_points, negative_points = self.classify_batch(reviews)
+        return {
+            "overall": overall_sentiment(len(positive_points), len(negative_points)),
+            "positive_points": self.clusterer.points(positive_points, max_points),
+            "negative_points": self.clusterer.points(negative_points, max_points),
+        }
@@ -0,0 +1,137 @@
+import random
+import zlib
+from collections import deque
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# numpy is imported on first use so importing the prompt encoder stays fast
+
+# Character shingles compared by MinHash; short enough to work on one-line reviews
+SHINGLE_SIZE = 5
+NUM_PERMUTATIONS = 32
+# Signatures are split into bands for locality-sensitive hashing: only reviews
+# sharing a whole band with a kept review are compared with it. 8 bands of 4
+# rows find pairs from a Jaccard similarity of about (1/8)^(1/4) = 0.6 up.
+LSH_BANDS = 8
+# Estimated Jaccard similarity at which a review counts as a near-duplicate of a kept one
+NEAR_DUPLICATE_THRESHOLD = 0.6
+# Reviews shorter than this say little ("Good"); longer ones cost tokens for diminishing returns
+IDEAL_REVIEW_CHARS = (40, 240)
+# Reviews considered per call at most, so sampling time does not grow with review volume
+MAX_CANDIDATES = 400
+
+_PRIME = (1 << 31) - 1
+# Fixed seed so the same reviews always give the same prompt (and cache key)
+_random = random.Random(1)
+_PERMUTATIONS = [(_random.randrange(1, _PRIME), _random.randrange(0, _PRIME)) for _ in range(NUM_PERMUTATIONS)]
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    """
+    Hashes of the overlapping `size`-character substrings of the normalized text.
+    """
+    text = " ".join(text.lower().split())
+    if len(text) <= size:
+        return {zlib.crc32(text.encode("utf-8"))}
+    return {zlib.crc32(text[i:i + size].encode("utf-8")) for i in range(len(text) - size + 1)}
+
+
+@lru_cache(maxsize=None)
+def _permutation_arrays():
+    import numpy as np
+    a, b = zip(*_PERMUTATIONS)
+    return np.array(a, dtype=np.uint64)[:, None], np.array(b, dtype=np.uint64)[:, None]
+
+
+def minhash(text: str) -> Tuple[int, ...]:
+    """
+    MinHash signature of the text's shingles, one minimum per hash permutation.
+    """
+    import numpy as np
+    a, b = _permutation_arrays()
+    hashes = np.fromiter(shingles(text), dtype=np.uint64)
+    # a, b < 2^31 and hashes < 2^32, so a * h + b fits in 64 bits
+    return tuple(((a * hashes + b) % _PRIME).min(axis=1).tolist())
+
+
+def similarity(signature: Sequence[int], other: Sequence[int]) -> float:
+    """
+    Estimated Jaccard similarity of two texts from their MinHash signatures.
+    """
+    return sum(x == y for x, y in zip(signature, other)) / len(signature)
+
+
+def informativeness(review: str) -> float:
+    """
+    1.0 for reviews of an informative length, less the shorter or longer they are.
+    """
+    low, high = IDEAL_REVIEW_CHARS
+    if len(review) < low:
+        return len(review) / low
+    if len(review) > high:
+        return high / len(review)
+    return 1.0
+
+
+def _stratum(classify: Optional[Callable[[str], Tuple[bool, bool]]], review: str) -> str:
+    if classify is None:
+        return "all"
+    is_positive, is_negative = classify(review)
+    if is_positive != is_negative:
+        return "positive" if is_positive else "negative"
+    return "neutral"
+
+
+def sample_reviews(reviews: Sequence[str], token_budget: Optional[int] = None,
+                   cost: Callable[[str], int] = len,
+                   classify: Optional[Callable[[str], Tuple[bool, bool]]] = None,
+                   threshold: float = NEAR_DUPLICATE_THRESHOLD,
+                   max_candidates: int = MAX_CANDIDATES) -> List[str]:
+    """
+    A representative, diverse subset of `reviews`, in their original order.
+
+    Reviews are grouped by `classify` (a (is_positive, is_negative) function
+    such as `KeywordSentimentScorer.classify`) into positive, negative and
+    neutral strata, and picked round-robin from the strata, smallest first,
+    so a few critical reviews are not crowded out by many positive ones.
+    Within a stratum, reviews of an informative length come first. A review
+    is skipped if it is a near-duplicate of one already picked, or if its
+    `cost` no longer fits in `token_budget` (no limit if None). Only
+    `max_candidates` reviews, spread evenly over `reviews`, are classified,
+    sorted and compared, which bounds the time taken.
+    """
+    candidates = range(len(reviews))
+    if len(reviews) > max_candidates:
+        candidates = [i * len(reviews) // max_candidates for i in range(max_candidates)]
+    strata: Dict[str, List[int]] = {}
+    for i in candidates:
+        strata.setdefault(_stratum(classify, reviews[i]), []).append(i)
+    queues = [
+        deque(sorted(indices, key=lambda i: (-informativeness(reviews[i]), i)))
+        for indices in sorted(strata.values(), key=len)
+    ]
+
+    picked: List[int] = []
+    signatures: List[Tuple[int, ...]] = []
+    buckets: Dict[Tuple, List[int]] = {}
+    rows = NUM_PERMUTATIONS // LSH_BANDS
+    used = 0
+    while any(queues):
+        for queue in queues:
+            while queue:
+                i = queue.popleft()
+                review_cost = cost(reviews[i])
+                if token_budget is not None and used + review_cost > token_budget:
+                    continue
+                signature = minhash(reviews[i])
+                keys = [(band, signature[band * rows:(band + 1) * rows]) for band in range(LSH_BANDS)]
+                candidates = {j for key in keys for j in buckets.get(key, ())}
+                if any(similarity(signature, signatures[j]) >= threshold for j in candidates):
+                    continue
+                for key in keys:
+                    buckets.setdefault(key, []).append(len(signatures))
+                picked.append(i)
+                signatures.append(signature)
+                used += review_cost
+                break
+    return [reviews[i] for i in sorted(picked)]
@@ -0,0 +1,300 @@
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from html_backends import ParserBackend, get_backend
+
+# Status codes worth retrying: rate limited or a transient server error
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+# Request errors worth retrying: the connection failed, timed out or was cut off mid-response
+RETRYABLE_ERRORS = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/122.0 Safari/537.36"
+    ),
+    "Accept-Language": "en-IN,en;q=0.9",
+}
+
+
+class ScraperError(Exception):
+    """Raised when a listing page cannot be fetched."""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: allows `rate` requests per second on average,
+    with bursts of up to `capacity` requests.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Block until a token is available, then consume it.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def parse_price(text: str) -> Optional[float]:
+    """
+    Parse a price such as "₹1,59,990" into a float.
+    """
+    digits = re.sub(r"[^\d.]", "", text or "")
+    try:
+        return float(digits) if digits else None
+    except ValueError:
+        return None
+
+
+def parse_rating(text: str) -> float:
+    """
+    Parse a rating such as "4.5 out of 5 stars" into a float.
+    """
+    match = re.search(r"\d+(?:\.\d+)?", text or "")
+    return float(match.group()) if match else 0.0
+
+
+class PlatformAdapter(ABC):
+    """
+    Knows how to build search URLs for one platform and parse its listing pages.
+    Subclasses set `card_selector` and implement `search_url` and `parse_card`.
+
+    `parser_backend` names the HTML parser used for this platform (see
+    `html_backends`); `card_strainer` is a (tag, attrs) filter that lets the
+    "+strainer" backends build only the product-card nodes.
+    """
+
+    name = ""
+    aliases: Iterable[str] = ()
+    base_url = ""
+    card_selector = ""
+    card_strainer: Optional[Tuple[str, Dict]] = None
+    parser_backend = "selectolax"
+
+    def __init__(self, base_url: Optional[str] = None, parser_backend: Optional[str] = None):
+        if base_url is not None:
+            self.base_url = base_url.rstrip("/")
+        self.backend = get_backend(parser_backend or self.parser_backend)
+
+    @abstractmethod
+    def search_url(self, category: str, min_price: int, max_price: int, page: int) -> str:
+        ...
+
+    @abstractmethod
+    def parse_card(self, card, backend: ParserBackend) -> Optional[Dict]:
+        ...
+
+    def parse(self, html: str, backend: Optional[ParserBackend] = None) -> List[Dict]:
+        """
+        Parse a listing page into product dicts, skipping cards that are missing a name or price.
+        """
+        return list(self.iter_parse(html, backend))
+
+    def iter_parse(self, html: str, backend: Optional[ParserBackend] = None) -> Iterator[Dict]:
+        """
+        Like `parse`, but yields each product as its card is parsed.
+        """
+        backend = backend or self.backend
+        for card in backend.cards(html, self.card_selector, self.card_strainer):
+            product = self.parse_card(card, backend)
+            if product is not None:
+                yield product
+
+
+class AmazonAdapter(PlatformAdapter):
+    name = "amazon"
+    aliases = ("amazon", "amazon.in", "amazon india")
+    base_url = "https://www.amazon.in"
+    card_selector = 'div[data-component-type="s-search-result"]'
+    card_strainer = ("div", {"data-component-type": "s-search-result"})
+
+    def search_url(self, category: str, min_price: int, max_price: int, page: int) -> str:
+        # Amazon price filters are in paise
+        params = {"k": category, "rh": f"p_36:{min_price * 100}-{max_price * 100}", "page": page}
+        return f"{self.base_url}/s?{urlencode(params)}"
+
+    def parse_card(self, card, backend: ParserBackend) -> Optional[Dict]:
+        name = backend.text(card, "h2")
+        price = parse_price(backend.text(card, "span.a-price span.a-offscreen") or backend.text(card, "span.a-price-whole"))
+        if not name or price is None:
+            return None
+        return {
+            "name": name,
+            "price": price,
+            "features": [],
+            "rating": parse_rating(backend.text(card, "span.a-icon-alt")),
+            "reviews": [],
+        }
+
+
+class FlipkartAdapter(PlatformAdapter):
+    name = "flipkart"
+    aliases = ("flipkart", "flipkart.com")
+    base_url = "https://www.flipkart.com"
+    card_selector = "div[data-id]"
+    card_strainer = ("div", {"data-id": True})
+
+    def search_url(self, category: str, min_price: int, max_price: int, page: int) -> str:
+        params = [
+            ("q", category),
+            ("p[]", f"facets.price_range.from={min_price}"),
+            ("p[]", f"facets.price_range.to={max_price}"),
+            ("page", page),
+        ]
+        return f"{self.base_url}/search?{urlencode(params)}"
+
+    def parse_card(self, card, backend: ParserBackend) -> Optional[Dict]:
+        name = backend.text(card, "div.KzDlHZ") or backend.text(card, "a.wjcEIp")
+        price = parse_price(backend.text(card, "div.Nx9bqj"))
+        if not name or price is None:
+            return None
+        return {
+            "name": name,
+            "price": price,
+            "features": backend.texts(card, "ul.G4BRas li"),
+            "rating": parse_rating(backend.text(card, "div.XQDdHH")),
+            "reviews": [],
+        }
+
+
+class ScraperEngine:
+    """
+    Fetches and parses listing pages for the registered platform adapters.
+
+    All requests share one pooled HTTP session. Each host has its own token
+    bucket, and failed requests are retried with jittered exponential backoff.
+    Pages are fetched concurrently and parsed in page order as soon as they
+    arrive, so parsing overlaps with the remaining downloads.
+    """
+
+    def __init__(self, adapters: Optional[Iterable[PlatformAdapter]] = None,
+                 base_urls: Optional[Dict[str, str]] = None,
+                 parser_backends: Optional[Dict[str, str]] = None,
+                 requests_per_second: float = 1.0, burst: int = 2,
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 10.0,
+                 max_workers: int = 4, timeout: float = 10.0):
+        if adapters is None:
+            base_urls = base_urls or {}
+            parser_backends = parser_backends or {}
+            adapters = [
+                adapter_cls(base_urls.get(adapter_cls.name), parser_backends.get(adapter_cls.name))
+                for adapter_cls in (AmazonAdapter, FlipkartAdapter)
+            ]
+        self._adapters: Dict[str, PlatformAdapter] = {}
+        for adapter in adapters:
+            for alias in (adapter.name, *adapter.aliases):
+                self._adapters[alias.lower()] = adapter
+
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_workers = max_workers
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        pool = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", pool)
+        self.session.mount("https://", pool)
+
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+
+    def adapter_for(self, platform: str) -> PlatformAdapter:
+        adapter = self._adapters.get(platform.strip().lower())
+        if adapter is None:
+            raise ScraperError(f"No scraper registered for platform '{platform}'")
+        return adapter
+
+    def fetch(self, url: str) -> str:
+        """
+        GET `url`, honouring the host's rate limit and retrying transient failures.
+        """
+        bucket = self._bucket_for(urlparse(url).netloc)
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            bucket.acquire()
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+                if response.status_code not in RETRYABLE_STATUS:
+                    response.raise_for_status()
+                    return response.text
+                last_error = ScraperError(f"HTTP {response.status_code} for {url}")
+            except RETRYABLE_ERRORS as e:
+                last_error = e
+            except requests.RequestException as e:
+                # HTTP errors, invalid URLs, redirect loops and the like will not succeed on retry
+                raise ScraperError(f"{type(e).__name__} for {url}: {e}") from e
+            if attempt < self.max_retries:
+                time.sleep(self._backoff(attempt))
+        raise ScraperError(f"Giving up on {url} after {self.max_retries + 1} attempts: {last_error}")
+
+    def scrape(self, platform: str, category: str, min_price: int, max_price: int, pages: int = 1) -> List[Dict]:
+        """
+        Scrape `pages` listing pages of `category` from `platform`, keeping products within the price range.
+        """
+        return list(self.iter_scrape(platform, category, min_price, max_price, pages))
+
+    def iter_scrape(self, platform: str, category: str, min_price: int, max_price: int,
+                    pages: int = 1) -> Iterator[Dict]:
+        """
+        Like `scrape`, but yields products as soon as their page is parsed. Pages
+        are downloaded concurrently and parsed in page order while the later ones
+        are still downloading, so the products (and the analysis cache keys
+        built from them) are the same on every run.
+        """
+        adapter = self.adapter_for(platform)
+        urls = [adapter.search_url(category, min_price, max_price, page) for page in range(1, pages + 1)]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as fetchers:
+            fetches = [fetchers.submit(self.fetch, url) for url in urls]
+            try:
+                for fetch in fetches:
+                    for product in adapter.iter_parse(fetch.result()):
+                        if min_price <= product["price"] <= max_price:
+                            yield product
+            finally:
+                # The consumer may stop early; skip pages not requested yet
+                for fetch in fetches:
+                    fetch.cancel()
+
+    def close(self) -> None:
+        self.session.close()
+
+    def _bucket_for(self, host: str) -> TokenBucket:
+        with self._buckets_lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.requests_per_second, self.burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: a random delay up to the exponential cap
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
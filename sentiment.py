@@ -0,0 +1,97 @@
+import re
+from typing import Any, Dict, Iterable, List, Tuple
+
+# Lexicon entries are regex fragments so common inflections match too
+POSITIVE_KEYWORDS = [
+    "good", "great", "excellent", "amazing", "lov(?:e|es|ed|ely|ing)", "perfect(?:ly)?",
+    "best", "recommend(?:s|ed|ing)?",
+]
+NEGATIVE_KEYWORDS = [
+    "bad", "poor(?:ly)?", "terrible", "disappoint(?:ed|ing|ment)?", "issues?", "problems?",
+    "worst", "avoid",
+]
+
+
+class KeywordSentimentScorer:
+    """
+    Batch keyword sentiment scorer.
+
+    Both lexicons are compiled into one regex matched on whole words, so
+    "good" does not match inside "goodbye". Each review is lowercased once
+    and duplicates are scored once. With `use_vader=True` reviews are scored
+    with NLTK's VADER analyzer instead, if its lexicon is installed
+    (`nltk.download("vader_lexicon")`).
+    """
+
+    def __init__(self, positive: Iterable[str] = POSITIVE_KEYWORDS, negative: Iterable[str] = NEGATIVE_KEYWORDS,
+                 use_vader: bool = False):
+        self._pattern = re.compile(
+            r"\b(?:(?P<pos>{})|(?P<neg>{}))\b".format("|".join(positive), "|".join(negative))
+        )
+        self._vader = self._load_vader() if use_vader else None
+
+    @staticmethod
+    def _load_vader():
+        try:
+            from nltk.sentiment.vader import SentimentIntensityAnalyzer
+            return SentimentIntensityAnalyzer()
+        except (ImportError, LookupError):
+            print("VADER lexicon unavailable (run nltk.download('vader_lexicon')), using keyword sentiment")
+            return None
+
+    def classify(self, review: str) -> Tuple[bool, bool]:
+        """
+        Return (is_positive, is_negative) for one review; a review can be both.
+        """
+        if self._vader is not None:
+            compound = self._vader.polarity_scores(review)["compound"]
+            return compound >= 0.05, compound <= -0.05
+        positive = negative = False
+        for match in self._pattern.finditer(review.lower()):
+            if match.lastgroup == "pos":
+                positive = True
+            else:
+                negative = True
+            if positive and negative:
+                break
+        return positive, negative
+
+    def classify_batch(self, reviews: Iterable[str]) -> Tuple[List[str], List[str]]:
+        """
+        Split reviews into positive and negative ones, deduplicated and in first-seen order.
+        """
+        positive_points: List[str] = []
+        negative_points: List[str] = []
+        for review in dict.fromkeys(reviews):
+            is_positive, is_negative = self.classify(review)
+            if is_positive:
+                positive_points.append(review)
+            if is_negative:
+                negative_points.append(review)
+        return positive_points, negative_points
+
+    def summarize(self, reviews: Iterable[str], max_points: int = 3) -> Dict[str, Any]:
+        """
+        Overall sentiment plus up to `max_points` positive and negative reviews.
+        """
+        positive_points, negative_points = self.classify_batch(reviews)
+        return {
+            "overall": overall_sentiment(len(positive_points), len(negative_points)),
+            "positive_points": positive_points[:max_points],
+            "negative_points": negative_points[:max_points],
+        }
+
+
+def overall_sentiment(positive: int, negative: int) -> str:
+    """
+    Label the balance of positive and negative reviews.
+    """
+    if positive > negative * 2:
+        return "Very Positive"
+    elif positive > negative:
+        return "Positive"
+    elif negative > positive * 2:
+        return "Very Negative"
+    elif negative > positive:
+        return "Negative"
+    return "Mixed"
@@ -0,0 +1,97 @@
+import asyncio
+import copy
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class FlightAbandoned(Exception):
+    """The leading call stopped without a result (cancelled or interrupted)."""
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller (the
+    leader) runs the computation and every caller that arrives while it is in
+    flight waits for and shares its result. Works across threads and asyncio
+    tasks, since waiters block on or await the same `concurrent.futures.Future`.
+
+    Followers receive a deep copy of the leader's result, so callers can
+    mutate what they get back. If the leader raises, followers see the same
+    exception; if it is cancelled or interrupted, followers run the
+    computation themselves instead.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+
+    def begin(self, key: Hashable) -> Tuple[Future, bool]:
+        """
+        Join the flight for `key`. Returns (future, is_leader); the leader must
+        call `finish` exactly once.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            return future, True
+
+    def finish(self, key: Hashable, future: Future, result: Any = None, error: BaseException = None) -> None:
+        """
+        Publish the leader's result (or error) and close the flight.
+        """
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+        if error is None:
+            future.set_result(result)
+        elif isinstance(error, Exception):
+            future.set_exception(error)
+        else:
+            future.set_exception(FlightAbandoned(repr(error)))
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run `fn(*args, **kwargs)` unless a call with `key` is already in flight, and return its result.
+        """
+        while True:
+            future, leader = self.begin(key)
+            if leader:
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException as e:
+                    self.finish(key, future, error=e)
+                    raise
+                self.finish(key, future, result=result)
+                return result
+            try:
+                return copy.deepcopy(future.result())
+            except FlightAbandoned:
+                continue
+
+    async def do_async(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        Async variant of `do`: awaits `fn(*args, **kwargs)` or the in-flight call with `key`.
+        """
+        while True:
+            future, leader = self.begin(key)
+            if leader:
+                try:
+                    result = await fn(*args, **kwargs)
+                except BaseException as e:
+                    self.finish(key, future, error=e)
+                    raise
+                self.finish(key, future, result=result)
+                return result
+            try:
+                # shield: a cancelled waiter must not cancel the shared future
+                return copy.deepcopy(await asyncio.shield(asyncio.wrap_future(future)))
+            except FlightAbandoned:
+                continue
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
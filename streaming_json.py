@@ -0,0 +1,142 @@
+import json
+from typing import Any, Iterable, List, Optional, Tuple
+
+# Path element matching any object key or array index
+ANY = "*"
+
+
+class _Frame:
+    __slots__ = ("kind", "path", "start", "key", "index", "expect")
+
+    def __init__(self, kind: str, path: Tuple, start: int):
+        self.kind = kind
+        self.path = path
+        self.start = start
+        self.key: Optional[str] = None
+        self.index = 0
+        self.expect = "key" if kind == "{" else "value"
+
+    def child_path(self) -> Tuple:
+        return self.path + ((self.key,) if self.kind == "{" else (self.index,))
+
+
+class IncrementalJSONParser:
+    """
+    Parses a JSON document as it streams in and reports watched values as soon
+    as each one is complete.
+
+    Watched paths are tuples of object keys and array indexes, with `ANY`
+    as a wildcard, e.g. ("top_products", ANY) reports every element of the
+    top-level "top_products" array. Text before the root value (such as a
+    code fence) and `//` comments are skipped; a watched value that is not
+    valid JSON on its own is dropped.
+    """
+
+    def __init__(self, watch: Iterable[Tuple]):
+        self._watch = [tuple(path) for path in watch]
+        self._text = ""
+        self._pos = 0
+        self._stack: List[_Frame] = []
+        self._done = False
+        self._in_comment = False
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._string_is_key = False
+        self._string_path: Tuple = ()
+        self._scalar_start: Optional[int] = None
+        self._scalar_path: Tuple = ()
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def feed(self, chunk: str) -> List[Tuple[Tuple, Any]]:
+        """
+        Consume the next chunk of text and return (path, value) for every
+        watched value completed by it.
+        """
+        self._text += chunk
+        events: List[Tuple[Tuple, Any]] = []
+        text = self._text
+        for i in range(self._pos, len(text)):
+            self._step(text, i, text[i], events)
+        self._pos = len(text)
+        return events
+
+    def _step(self, text: str, i: int, c: str, events: List) -> None:
+        if self._done:
+            return
+        if self._in_comment:
+            self._in_comment = c != "\n"
+            return
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif c == "\\":
+                self._escape = True
+            elif c == '"':
+                self._in_string = False
+                if self._string_is_key:
+                    self._stack[-1].key = json.loads(text[self._string_start:i + 1])
+                    self._stack[-1].expect = "colon"
+                else:
+                    self._value_done(self._string_path, self._string_start, i + 1, events)
+            return
+        if self._scalar_start is not None:
+            if c not in ",]}/" and not c.isspace():
+                return
+            self._value_done(self._scalar_path, self._scalar_start, i, events)
+            self._scalar_start = None
+
+        if c.isspace():
+            return
+        if c == "/":
+            self._in_comment = True
+            return
+        if not self._stack:
+            # Skip anything before the root container
+            if c in "{[":
+                self._stack.append(_Frame(c, (), i))
+            return
+
+        frame = self._stack[-1]
+        if c in "{[":
+            self._stack.append(_Frame(c, frame.child_path(), i))
+            frame.expect = "comma"
+        elif c in "}]":
+            self._stack.pop()
+            self._value_done(frame.path, frame.start, i + 1, events)
+            if not self._stack:
+                self._done = True
+        elif c == ":":
+            frame.expect = "value"
+        elif c == ",":
+            if frame.kind == "[":
+                frame.index += 1
+                frame.expect = "value"
+            else:
+                frame.expect = "key"
+        elif c == '"':
+            self._in_string = True
+            self._string_start = i
+            self._string_is_key = frame.kind == "{" and frame.expect == "key"
+            if not self._string_is_key:
+                self._string_path = frame.child_path()
+                frame.expect = "comma"
+        else:
+            self._scalar_start = i
+            self._scalar_path = frame.child_path()
+            frame.expect = "comma"
+
+    def _value_done(self, path: Tuple, start: int, end: int, events: List) -> None:
+        if not any(self._matches(pattern, path) for pattern in self._watch):
+            return
+        try:
+            events.append((path, json.loads(self._text[start:end])))
+        except ValueError:
+            pass
+
+    @staticmethod
+    def _matches(pattern: Tuple, path: Tuple) -> bool:
+        return len(pattern) == len(path) and all(p == ANY or p == q for p, q in zip(pattern, path))
@@ -0,0 +1,33 @@
+import os
+import sys
+import time
+
+import pytest
+
+# The modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Tests run offline: analyzers default to the canned local LLM and never touch Groq
+os.environ.setdefault("LLM_PROVIDER", "local")
+
+
+@pytest.fixture
+def make_analyzer(tmp_path, monkeypatch):
+    """
+    Factory for analyzers with their own cache file and metrics, answered by
+    the local LLM stand-in (or `provider`) and without price bands by default.
+    """
+    from llm_cache import LLMCache
+    from llm_providers import LocalProvider
+    from metrics import Metrics
+    from product_analyzer import ProductAnalyzer
+
+    # The catalog path simulates network latency
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+
+    def make(name="cache", provider=None, **kwargs):
+        kwargs.setdefault("price_band_width", 0)
+        return ProductAnalyzer(cache=LLMCache(str(tmp_path / f"{name}.sqlite")), provider=provider or LocalProvider(),
+                               metrics=Metrics(), **kwargs)
+
+    return make
@@ -0,0 +1,17 @@
+def llm_calls(analyzer):
+    """
+    LLM calls made by an analyzer built by the `make_analyzer` fixture.
+    """
+    return analyzer.metrics.counter("analyzer_llm_calls_total", provider="local:canned")
+
+
+def check_result(result, min_price, max_price):
+    """
+    Assert that `result` is a well-formed analysis of products priced within the range.
+    """
+    assert 0 < len(result["top_products"]) <= 3
+    ratings = [product["rating"] for product in result["top_products"]]
+    assert ratings == sorted(ratings, reverse=True)
+    price_range = result["price_range"]
+    assert min_price <= price_range["min"] <= price_range["average"] <= price_range["max"] <= max_price
+    assert result["sentiment"]["overall"]
@@ -0,0 +1,91 @@
+import pytest
+
+from helpers import check_result, llm_calls
+from llm_providers import LLMProvider, LocalProvider, get_provider
+from local_analysis import compute_price_range
+
+
+@pytest.mark.parametrize("mode", ["llm", "hybrid", "local"])
+def test_analyze_products_offline(make_analyzer, mode):
+    analyzer = make_analyzer(analysis_mode=mode)
+    result = analyzer.analyze_products("amazon", "Gaming Laptop", 50_000, 200_000)
+    check_result(result, 50_000, 200_000)
+    products = analyzer._scrape_products("amazon", "laptop", 50_000, 200_000)
+    assert result["price_range"] == compute_price_range(products)
+    assert llm_calls(analyzer) == (0 if mode == "local" else 1)
+
+
+def test_local_provider_answers_the_analysis_schema(make_analyzer):
+    analyzer = make_analyzer()
+    products = analyzer._scrape_products("amazon", "laptop", 0, 500_000)
+    result = analyzer._analyze_with_llm(products).dict()
+    assert [p["name"] for p in result["top_products"]] == [
+        p["name"] for p in sorted(products, key=lambda p: p["rating"], reverse=True)[:3]
+    ]
+    assert result["price_range"] == compute_price_range(products)
+
+
+def test_get_provider_parses_provider_and_model():
+    provider = get_provider("local:other-model")
+    assert isinstance(provider, LocalProvider)
+    assert provider.key == "local:other-model"
+    assert get_provider("local").key == "local:canned"
+
+
+def test_providers_must_implement_invoke():
+    class Incomplete(LLMProvider):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_stream_ends_with_the_same_result(make_analyzer):
+    events = list(make_analyzer().analyze_products_stream("amazon", "earbuds", 1_000, 30_000))
+    assert events[-1][0] == "result"
+    assert {"product", "price_range", "overall"} <= {event for event, _ in events}
+    assert events[-1][1] == make_analyzer("fresh").analyze_products("amazon", "earbuds", 1_000, 30_000)
+
+
+def test_prompt_report_is_computed_on_request(make_analyzer):
+    analyzer = make_analyzer()
+    products = analyzer._scrape_products("amazon", "laptop", 0, 500_000)
+    report = analyzer.prompt_report(products)
+    assert report["products"] == len(products)
+    assert 0 < report["tokens_after"] < report["tokens_before"]
+    assert analyzer.prompt_report(products, sentiment_only=True)["tokens_after"] < report["tokens_after"]
+
+
+def test_price_bands_answer_exact_ranges(make_analyzer):
+    analyzer = make_analyzer(price_band_width=25_000)
+    check_result(analyzer.analyze_products("amazon", "tv", 10_000, 90_000), 10_000, 90_000)
+    # A narrower range inside the same bands needs no new LLM calls
+    calls = llm_calls(analyzer)
+    assert calls > 0
+    check_result(analyzer.analyze_products("amazon", "tv", 30_000, 80_000), 30_000, 80_000)
+    assert llm_calls(analyzer) == calls
+
+
+def test_map_reduce_matches_a_single_prompt(make_analyzer):
+    whole = make_analyzer("whole", analysis_mode="hybrid")
+    whole.llm_chunk_size = 0
+    chunked = make_analyzer("chunked", analysis_mode="hybrid")
+    chunked.llm_chunk_size = 2
+    expected = whole.analyze_products("amazon", "laptop", 0, 500_000)
+    result = chunked.analyze_products("amazon", "laptop", 0, 500_000)
+    assert llm_calls(chunked) > llm_calls(whole) == 1
+    assert result["top_products"] == expected["top_products"]
+    assert result["price_range"]["min"] == expected["price_range"]["min"]
+    assert result["price_range"]["max"] == expected["price_range"]["max"]
+    assert result["price_range"]["average"] == pytest.approx(expected["price_range"]["average"])
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_price_bands_keep_generic_categories_in_range(make_analyzer, stream):
+    analyzer = make_analyzer(price_band_width=25_000)
+    assert analyzer.router.resolve("kitchen mixer") not in analyzer.catalog
+    if stream:
+        result = list(analyzer.analyze_products_stream("amazon", "kitchen mixer", 0, 5_000))[-1][1]
+    else:
+        result = analyzer.analyze_products("amazon", "kitchen mixer", 0, 5_000)
+    check_result(result, 0, 5_000)
@@ -0,0 +1,67 @@
+import asyncio
+import threading
+
+from helpers import check_result, llm_calls
+
+REQUESTS = [
+    {"platform": "amazon", "category": category, "min_price": 0, "max_price": 500_000}
+    for category in ("laptop", "tv", "earbuds")
+]
+
+
+def test_analyze_products_async_matches_the_sync_api(make_analyzer):
+    result = asyncio.run(make_analyzer("async").analyze_products_async(**REQUESTS[0]))
+    assert result == make_analyzer("sync").analyze_products(**REQUESTS[0])
+
+
+def test_analyze_many_yields_every_request(make_analyzer):
+    analyzer = make_analyzer(analysis_mode="hybrid")
+
+    async def collect():
+        return [pair async for pair in analyzer.analyze_many(REQUESTS, max_concurrency=8)]
+
+    results = asyncio.run(collect())
+    assert sorted(request["category"] for request, _ in results) == sorted(r["category"] for r in REQUESTS)
+    for _, result in results:
+        check_result(result, 0, 500_000)
+
+
+def test_analyze_many_reports_failures_in_place(make_analyzer):
+    analyzer = make_analyzer()
+    requests = REQUESTS[:1] + [{"platform": "amazon", "category": "laptop", "min_price": 0}]
+
+    async def collect():
+        return [pair async for pair in analyzer.analyze_many(requests)]
+
+    results = dict((request["category"] + str(len(request)), result) for request, result in asyncio.run(collect()))
+    assert isinstance(results["laptop3"], TypeError)
+    check_result(results["laptop4"], 0, 500_000)
+
+
+def test_identical_concurrent_requests_share_one_analysis(make_analyzer):
+    analyzer = make_analyzer()
+
+    async def run():
+        return await asyncio.gather(*(analyzer.analyze_products_async(**REQUESTS[0]) for _ in range(4)))
+
+    results = asyncio.run(run())
+    assert all(result == results[0] for result in results)
+    assert llm_calls(analyzer) == 1
+
+
+def test_cache_io_runs_off_the_event_loop(make_analyzer, monkeypatch):
+    analyzer = make_analyzer()
+    threads = []
+    for name in ("get", "set"):
+        method = getattr(analyzer.cache, name)
+
+        def record(*args, _method=method, **kwargs):
+            threads.append(threading.current_thread())
+            return _method(*args, **kwargs)
+
+        monkeypatch.setattr(analyzer.cache, name, record)
+
+    for _ in range(2):
+        check_result(asyncio.run(analyzer.analyze_products_async(**REQUESTS[0])), 0, 500_000)
+    assert llm_calls(analyzer) == 1
+    assert threads and threading.main_thread() not in threads
@@ -0,0 +1,21 @@
+import pyarrow.parquet as pq
+
+from batch_runner import ParquetResultWriter
+
+
+def record(number):
+    return {"id": str(number), "platform": "amazon", "category": "tv", "min_price": 0,
+            "max_price": 10_000, "result": {"n": number}, "error": None}
+
+
+def test_parquet_rows_are_readable_as_soon_as_they_are_flushed(tmp_path):
+    writer = ParquetResultWriter(str(tmp_path / "out.parquet"), batch_size=2)
+    assert writer.write(record(1)) == []
+    assert [r["id"] for r in writer.write(record(2))] == ["1", "2"]
+    # The flushed rows are in a complete file before the writer is closed
+    assert pq.read_table(str(tmp_path / "out.parquet")).column("id").to_pylist() == ["1", "2"]
+    writer.write(record(3))
+    assert [r["id"] for r in writer.close()] == ["3"]
+    table = pq.read_table(str(tmp_path / "out.parquet"))
+    assert sorted(table.column("id").to_pylist()) == ["1", "2", "3"]
+    assert not [p for p in (tmp_path / "out.parquet").iterdir() if p.name.startswith(".")]
@@ -0,0 +1,31 @@
+from helpers import check_result, llm_calls
+from llm_providers import LocalProvider
+
+REQUESTS = [
+    {"platform": "amazon", "category": "laptop", "min_price": 50_000, "max_price": 200_000},
+    {"platform": "amazon", "category": "earbuds", "min_price": 1_000, "max_price": 30_000},
+]
+
+
+class NoBatchedCalls(LocalProvider):
+    def invoke(self, prompt, json_mode=False):
+        if "each product list" in prompt:
+            raise RuntimeError("connection reset")
+        return super().invoke(prompt, json_mode)
+
+
+def test_batch_results_match_single_analyses(make_analyzer):
+    analyzer = make_analyzer(analysis_mode="hybrid")
+    results = analyzer.analyze_products_batch(REQUESTS, batch_size=2)
+    assert llm_calls(analyzer) == 1
+    single = make_analyzer("single", analysis_mode="hybrid")
+    for request, result in zip(REQUESTS, results):
+        assert result["price_range"] == single.analyze_products(**request)["price_range"]
+
+
+def test_failed_batched_calls_are_not_counted_as_parse_failures(make_analyzer, monkeypatch):
+    monkeypatch.setenv("LLM_MAX_RETRIES", "0")
+    analyzer = make_analyzer(provider=NoBatchedCalls(), analysis_mode="hybrid")
+    for result in analyzer.analyze_products_batch(REQUESTS, batch_size=2):
+        check_result(result, 0, 500_000)
+    assert analyzer.parse_stats == {"parsed": 2, "repaired": 0, "failed": 0}
@@ -0,0 +1,57 @@
+import pytest
+
+from category_router import CategoryRouter, build_default_router
+
+
+@pytest.fixture(scope="module")
+def router():
+    return build_default_router()
+
+
+@pytest.mark.parametrize("query, category", [
+    ("Laptop", "laptop"),
+    ("gaming laptops", "laptop"),
+    ("  Smart   Watch ", "smartwatch"),
+    ("wireless earbuds", "earbuds"),
+    ("bluetooth headphones", "earbuds"),
+    ("iPhone 15", "smartphone"),
+    ("front load washing machine", "washing_machine"),
+    ("split AC 1.5 ton", "ac"),
+    ("55 inch smart tv", "tv"),
+])
+def test_resolves_free_text_queries(router, query, category):
+    assert router.resolve(query) == category
+
+
+def test_keywords_only_match_whole_words(router):
+    # "phone" must not match inside "headphones"; plurals still match
+    assert "smartphone" not in router.scores("headphones")
+    assert router.resolve("smartphones") == "smartphone"
+    assert router.resolve("watches") == "smartwatch"
+
+
+@pytest.mark.parametrize("query", ["", "kitchen knives", "accessories", "vacuum"])
+def test_unknown_queries_resolve_to_none(router, query):
+    assert router.resolve(query) is None
+
+
+def test_highest_weight_wins_then_longest_match_then_registration_order():
+    router = CategoryRouter()
+    router.register("a", ["red"])
+    router.register("b", ["red apple"])
+    router.register("c", ["green"], weight=2.0)
+    assert router.resolve("red apple") == "b"
+    assert router.resolve("red apple green") == "c"
+
+    tied = CategoryRouter()
+    tied.register("first", ["foo"])
+    tied.register("second", ["bar"])
+    assert tied.resolve("bar foo") == "first"
+
+
+def test_reregistered_keyword_moves_to_the_latest_category():
+    router = CategoryRouter()
+    router.register("old", ["tab"])
+    router.register("new", ["tab"])
+    assert router.resolve("tab") == "new"
+    assert router.categories() == ["old", "new"]
@@ -0,0 +1,36 @@
+import sys
+
+import pytest
+
+from html_backends import BACKENDS, SoupBackend, available_backends, get_backend
+
+HTML = '<div class="card"><h2>Phone</h2><span>₹ 9,999</span></div><div class="card"><h2>TV</h2></div>'
+
+
+@pytest.fixture
+def no_fast_parsers(monkeypatch):
+    # A None entry in sys.modules makes the package look uninstalled
+    monkeypatch.setitem(sys.modules, "selectolax", None)
+    monkeypatch.setitem(sys.modules, "lxml", None)
+
+
+def test_missing_parsers_fall_back_to_html_parser(no_fast_parsers):
+    assert available_backends() == ["html.parser", "html.parser+strainer"]
+    backend = get_backend("selectolax")
+    assert isinstance(backend, SoupBackend)
+    assert backend.name == "html.parser+strainer"
+    assert get_backend("lxml").name == "html.parser"
+
+
+@pytest.mark.parametrize("name", list(BACKENDS))
+def test_backends_read_the_same_cards(name):
+    backend = get_backend(name)
+    cards = backend.cards(HTML, "div.card", ("div", {"class": "card"}))
+    assert [backend.text(card, "h2") for card in cards] == ["Phone", "TV"]
+    assert backend.texts(cards[0], "h2, span") == ["Phone", "₹ 9,999"]
+    assert backend.text(cards[1], "span") == ""
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_backend("regex")
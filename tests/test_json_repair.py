@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+from json_repair import loads_lenient, repair_json
+
+
+def test_valid_json_is_not_repaired():
+    assert loads_lenient('{"a": [1, 2]}') == ({"a": [1, 2]}, False)
+
+
+def test_strips_code_fences_comments_and_trailing_commas():
+    text = '```json\n{"a": [1, 2,], // note\n "b": /* inline */ "x//y",}\n```\nHope this helps!'
+    assert loads_lenient(text) == ({"a": [1, 2], "b": "x//y"}, True)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"a": {"b": [1, 2', {"a": {"b": [1, 2]}}),
+    ('{"a": "trunc', {"a": "trunc"}),
+    ('{"a": [1, 2,', {"a": [1, 2]}),
+])
+def test_closes_truncated_output(text, expected):
+    assert json.loads(repair_json(text)) == expected
+
+
+def test_leaves_string_contents_alone():
+    text = '{"a": "braces } and ] and , inside", "b": "escaped \\" quote // not a comment"}'
+    assert loads_lenient(text) == (json.loads(text), False)
+    assert json.loads(repair_json(text)) == json.loads(text)
+
+
+def test_stops_at_the_end_of_the_outermost_object():
+    assert json.loads(repair_json('{"a": 1} {"b": 2}')) == {"a": 1}
+
+
+def test_unrepairable_text_raises_value_error():
+    with pytest.raises(ValueError):
+        loads_lenient("no json here")
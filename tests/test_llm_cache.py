@@ -0,0 +1,57 @@
+import time
+
+from llm_cache import LLMCache
+
+
+def test_keys_depend_on_products_template_and_model():
+    key = LLMCache.make_key([{"name": "A", "price": 1}], "template", "groq:model")
+    assert key == LLMCache.make_key([{"price": 1, "name": "A"}], "template", "groq:model")
+    assert key != LLMCache.make_key([{"name": "A", "price": 2}], "template", "groq:model")
+    assert key != LLMCache.make_key([{"name": "A", "price": 1}], "other template", "groq:model")
+    assert key != LLMCache.make_key([{"name": "A", "price": 1}], "template", "local:canned")
+
+
+def test_get_set_and_stats(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = LLMCache(path)
+    assert cache.get("key") is None
+    cache.set("key", {"sentiment": {"overall": "Positive"}})
+    assert cache.get("key") == {"sentiment": {"overall": "Positive"}}
+    assert LLMCache.read_stats(path) == {"hits": 1, "misses": 1, "evictions": 0, "entries": 1}
+
+
+def test_entries_persist_across_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    LLMCache(path).set("key", {"a": 1})
+    assert LLMCache(path).get("key") == {"a": 1}
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.sqlite"), ttl_seconds=0.05)
+    cache.set("key", {"a": 1})
+    time.sleep(0.1)
+    assert cache.get("key") is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.sqlite"), max_entries=2)
+    cache.set("a", {"v": 1})
+    time.sleep(0.01)
+    cache.set("b", {"v": 2})
+    time.sleep(0.01)
+    cache.get("a")
+    time.sleep(0.01)
+    cache.set("c", {"v": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1} and cache.get("c") == {"v": 3}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_second_analysis_is_served_from_the_cache(make_analyzer):
+    analyzer = make_analyzer()
+    first = analyzer.analyze_products("amazon", "laptop", 50_000, 200_000)
+    # A new analyzer (e.g. after a restart) reads the same cache file
+    restarted = make_analyzer()
+    assert restarted.analyze_products("amazon", "laptop", 50_000, 200_000) == first
+    assert restarted.metrics.counter("analyzer_cache_total", result="hit") == 1
+    assert restarted.metrics.counter("analyzer_llm_calls_total", provider="local:canned") == 0
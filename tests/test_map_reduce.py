@@ -0,0 +1,52 @@
+from local_analysis import compute_price_range, top_products_by_rating
+from map_reduce import chunked, merge_analyses, merge_price_ranges, merge_top_products
+
+
+def product(name, price, rating):
+    return {"name": name, "price": price, "rating": rating}
+
+
+PRODUCTS = [product(f"P{i}", 1000 + 137 * i % 5000, round(3 + (i * 7 % 20) / 10, 1)) for i in range(23)]
+
+
+def test_chunked():
+    assert chunked([1, 2, 3, 4, 5], 2) == [[1, 2], [3, 4], [5]]
+    assert chunked([], 3) == []
+
+
+def test_merged_price_range_is_exact():
+    chunks = chunked(PRODUCTS, 5)
+    merged = merge_price_ranges([(len(chunk), compute_price_range(chunk)) for chunk in chunks])
+    expected = compute_price_range(PRODUCTS)
+    assert merged["min"] == expected["min"] and merged["max"] == expected["max"]
+    assert abs(merged["average"] - expected["average"]) < 1e-9
+
+
+def test_empty_chunks_are_ignored():
+    assert merge_price_ranges([(0, {"min": 0, "max": 0, "average": 0})]) == {"min": 0, "max": 0, "average": 0}
+    assert merge_price_ranges([(2, {"min": 5, "max": 7, "average": 6}), (0, {"min": 0, "max": 0, "average": 0})]) \
+        == {"min": 5, "max": 7, "average": 6}
+
+
+def test_merged_top_products_are_exact():
+    chunks = chunked(PRODUCTS, 4)
+    merged = merge_top_products([top_products_by_rating(chunk) for chunk in chunks])
+    assert [p["rating"] for p in merged] == [p["rating"] for p in top_products_by_rating(PRODUCTS)]
+
+
+def test_duplicate_products_are_listed_once():
+    merged = merge_top_products([[product("Phone X", 10, 4.9)], [product(" phone x ", 10, 4.9), product("Y", 5, 4.0)]])
+    assert [p["name"] for p in merged] == ["Phone X", "Y"]
+
+
+def test_merge_analyses():
+    partials = [
+        (3, {"top_products": [product("A", 10, 4.5)], "price_range": {"min": 10, "max": 30, "average": 20},
+             "sentiment": {"overall": "Positive", "positive_points": ["good"], "negative_points": []}}),
+        (1, {"top_products": [product("B", 50, 4.8)], "price_range": {"min": 50, "max": 50, "average": 50},
+             "sentiment": {"overall": "Positive", "positive_points": ["Good", "sturdy"], "negative_points": ["heavy"]}}),
+    ]
+    merged = merge_analyses(partials)
+    assert [p["name"] for p in merged["top_products"]] == ["B", "A"]
+    assert merged["price_range"] == {"min": 10, "max": 50, "average": 27.5}
+    assert merged["sentiment"] == {"overall": "Positive", "positive_points": ["good", "sturdy"], "negative_points": ["heavy"]}
@@ -0,0 +1,40 @@
+from price_bands import merge_sentiments, price_bands, split_into_bands
+
+
+def test_price_bands_cover_the_range_with_canonical_buckets():
+    assert price_bands(10_000, 60_000, 25_000) == [(0, 25_000), (25_000, 50_000), (50_000, 75_000)]
+    assert price_bands(25_000, 49_999, 25_000) == [(25_000, 50_000)]
+
+
+def test_split_into_bands_drops_products_outside_every_band():
+    bands = [(0, 100), (100, 200)]
+    products = [{"price": 50}, {"price": 100}, {"price": 199.5}, {"price": 200}, {"price": -1}]
+    assert split_into_bands(products, bands) == [[{"price": 50}], [{"price": 100}, {"price": 199.5}]]
+    assert split_into_bands(products, []) == []
+
+
+def test_identical_labels_are_kept_as_is():
+    merged = merge_sentiments([(3, {"overall": "Mostly positive"}), (1, {"overall": "Mostly positive"})])
+    assert merged["overall"] == "Mostly positive"
+
+
+def test_overall_label_is_the_weighted_average():
+    merged = merge_sentiments([(9, {"overall": "Very Positive"}), (1, {"overall": "Negative"})])
+    assert merged["overall"] == "Very Positive"
+    merged = merge_sentiments([(1, {"overall": "Very Positive"}), (1, {"overall": "Very Negative"})])
+    assert merged["overall"] == "Mixed"
+
+
+def test_points_are_taken_round_robin_heaviest_first_without_duplicates():
+    merged = merge_sentiments([
+        (1, {"overall": "Positive", "positive_points": ["light", "cheap"], "negative_points": []}),
+        (5, {"sentiment": {"overall": "Positive", "positive_points": ["Cheap", "fast", "quiet"],
+                           "negative_points": ["loud fan"]}}),
+    ])
+    assert merged["positive_points"] == ["Cheap", "light", "fast"]
+    assert merged["negative_points"] == ["loud fan"]
+
+
+def test_nothing_to_merge():
+    assert merge_sentiments([]) is None
+    assert merge_sentiments([(0, {"overall": "Positive"})]) is None
@@ -0,0 +1,156 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from llm_providers import LLMProvider
+from resilience import CircuitBreaker, CircuitOpenError, LatencyTracker, LLMTimeoutError, LLMUnavailableError, ResilientProvider
+
+
+class ScriptedProvider(LLMProvider):
+    """
+    Plays back `script`, one entry per call: an exception to raise, a number
+    of seconds to sleep before answering, or a response string.
+    """
+
+    name = "scripted"
+    default_model = "test"
+
+    def __init__(self, *script, delay: float = 0.0):
+        super().__init__()
+        self.script = list(script)
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _next(self):
+        with self._lock:
+            self.calls += 1
+            return self.script.pop(0) if self.script else "ok"
+
+    def invoke(self, prompt: str, json_mode: bool = False) -> str:
+        step = self._next()
+        if isinstance(step, Exception):
+            raise step
+        if isinstance(step, (int, float)):
+            time.sleep(step)
+            return f"slept {step}"
+        return step
+
+
+def resilient(provider, **kwargs):
+    kwargs.setdefault("timeout", 1.0)
+    kwargs.setdefault("backoff_base", 0)
+    return ResilientProvider(provider, **kwargs)
+
+
+def test_breaker_opens_after_consecutive_failures_and_half_opens_after_reset():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.state == "half-open"
+    # Only one trial call is let through
+    assert breaker.allow() and not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_failed_trial_reopens_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_latency_tracker_percentiles():
+    tracker = LatencyTracker(window=100, min_samples=10)
+    for i in range(9):
+        tracker.record(i)
+    assert tracker.percentile(0.5) is None
+    for i in range(9, 100):
+        tracker.record(i)
+    assert tracker.percentile(0.5) == 50
+    assert tracker.percentile(0.95) == 95
+
+
+def test_retries_transient_failures():
+    provider = ScriptedProvider(RuntimeError("503"), RuntimeError("503"), "answer")
+    wrapped = resilient(provider, max_retries=2)
+    assert wrapped.invoke("prompt") == "answer"
+    assert provider.calls == 3
+    assert wrapped.stats["retries"] == 2
+    assert wrapped.breaker.state == "closed"
+
+
+def test_gives_up_after_max_retries():
+    provider = ScriptedProvider(*[RuntimeError("down")] * 5)
+    wrapped = resilient(provider, max_retries=1)
+    with pytest.raises(LLMUnavailableError):
+        wrapped.invoke("prompt")
+    assert provider.calls == 2
+
+
+def test_open_circuit_rejects_calls_without_calling_the_provider():
+    provider = ScriptedProvider(*[RuntimeError("down")] * 5)
+    wrapped = resilient(provider, max_retries=0, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60))
+    with pytest.raises(LLMUnavailableError):
+        wrapped.invoke("prompt")
+    with pytest.raises(CircuitOpenError):
+        wrapped.invoke("prompt")
+    assert provider.calls == 1
+    assert wrapped.stats["rejected"] == 1
+
+
+def test_deadline_turns_slow_calls_into_timeouts():
+    wrapped = resilient(ScriptedProvider(0.5), timeout=0.05, max_retries=0)
+    started = time.monotonic()
+    with pytest.raises(LLMUnavailableError) as error:
+        wrapped.invoke("prompt")
+    assert time.monotonic() - started < 0.4
+    assert isinstance(error.value.__cause__, LLMTimeoutError)
+    assert wrapped.stats["timeouts"] == 1
+
+
+def test_hedged_request_wins_over_a_slow_first_attempt():
+    provider = ScriptedProvider(0.5, "hedged")
+    wrapped = resilient(provider, max_retries=0, hedge=True, hedge_delay=0.05)
+    started = time.monotonic()
+    assert wrapped.invoke("prompt") == "hedged"
+    assert time.monotonic() - started < 0.4
+    assert wrapped.stats["hedges"] == 1
+    assert provider.calls == 2
+
+
+def test_async_calls_retry_too():
+    provider = ScriptedProvider(RuntimeError("503"), "answer")
+    wrapped = resilient(provider, max_retries=1)
+    assert asyncio.run(wrapped.ainvoke("prompt")) == "answer"
+    assert wrapped.stats["retries"] == 1
+
+
+def test_streams_are_retried_only_before_the_first_chunk():
+    class FlakyStream(ScriptedProvider):
+        def stream(self, prompt):
+            step = self._next()
+            if step == "fail-early":
+                raise RuntimeError("no connection")
+            yield "first "
+            if step == "fail-late":
+                raise RuntimeError("connection reset")
+            yield "second"
+
+    wrapped = resilient(FlakyStream("fail-early", "ok"), max_retries=1)
+    assert "".join(wrapped.stream("prompt")) == "first second"
+
+    wrapped = resilient(FlakyStream("fail-late", "ok"), max_retries=1)
+    chunks = []
+    with pytest.raises(LLMUnavailableError):
+        for chunk in wrapped.stream("prompt"):
+            chunks.append(chunk)
+    assert chunks == ["first "]
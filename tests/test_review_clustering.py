@@ -0,0 +1,24 @@
+from review_clustering import ReviewClusterer, normalize
+
+
+def test_normalize_ignores_case_spacing_and_punctuation():
+    assert normalize("good") == normalize("  Good. ") == normalize("good!") == "good"
+    assert normalize("Battery, not great...") == "battery not great"
+
+
+def test_repeated_reviews_are_one_point():
+    clusterer = ReviewClusterer()
+    assert clusterer.points(["good", "good!", "Good.", "GOOD"]) == ["good"]
+    points = clusterer.points(["good", "good!", "Good.", "great screen", "great screen!!", "fast"])
+    assert sorted(map(normalize, points)) == ["fast", "good", "great screen"]
+
+
+def test_points_are_cluster_representatives():
+    reviews = (["Battery lasts two full days, battery life is excellent"] * 30
+               + ["Screen is bright and sharp, lovely screen"] * 20
+               + ["Arrived quickly"] * 1
+               + [f"Battery life is excellent, lasts day {i}" for i in range(10)])
+    points = ReviewClusterer().points(reviews, max_points=2)
+    assert len(points) == 2
+    assert {"battery" in normalize(p) for p in points} == {True, False}
+    assert any("screen" in normalize(p) for p in points)
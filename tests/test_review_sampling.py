@@ -0,0 +1,26 @@
+from review_sampling import sample_reviews
+from sentiment import KeywordSentimentScorer
+
+
+def test_near_duplicates_are_dropped_and_minority_views_kept():
+    reviews = ["Great battery life and a bright screen, very happy"] * 20 + [
+        "Great battery life and a bright screen, very happy!",
+        "Stopped charging after a week, poor build quality",
+    ]
+    picked = sample_reviews(reviews, classify=KeywordSentimentScorer().classify)
+    assert picked == [reviews[0], reviews[-1]]
+
+
+def test_only_max_candidates_reviews_are_classified():
+    classified = []
+
+    def classify(review):
+        classified.append(review)
+        return True, False
+
+    reviews = [f"Review number {i} of a long list of reviews" for i in range(10_000)]
+    picked = sample_reviews(reviews, token_budget=200, classify=classify, max_candidates=50)
+    assert len(classified) == 50
+    # The candidates are spread over the whole list, not just its start
+    assert classified[-1] == reviews[9_800]
+    assert picked and sum(map(len, picked)) <= 200
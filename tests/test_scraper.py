@@ -0,0 +1,112 @@
+import os
+import time
+
+import pytest
+import requests
+
+from fixture_server import DEFAULT_FIXTURES_DIR, FixtureServer
+from scraper import AmazonAdapter, FlipkartAdapter, ScraperEngine, ScraperError
+
+
+def read_fixture(platform, page):
+    with open(os.path.join(DEFAULT_FIXTURES_DIR, platform, f"page{page}.html"), encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture(scope="module")
+def server():
+    with FixtureServer() as server:
+        yield server
+
+
+@pytest.fixture
+def engine(server):
+    engine = ScraperEngine(base_urls=server.base_urls(), requests_per_second=1000, burst=10,
+                           max_retries=0, timeout=5)
+    yield engine
+    engine.close()
+
+
+def test_fixture_server_serves_pages_per_platform(server):
+    assert server.base_urls() == {"amazon": f"{server.url}/amazon", "flipkart": f"{server.url}/flipkart"}
+    response = requests.get(f"{server.url}/amazon/s?k=laptop&page=2", timeout=5)
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith("text/html")
+    with open(os.path.join(DEFAULT_FIXTURES_DIR, "amazon", "page2.html"), "rb") as f:
+        assert response.content == f.read()
+
+
+@pytest.mark.parametrize("path", ["/amazon/s?page=9", "/amazon/s?page=x", "/nowhere/s?page=1", "/"])
+def test_fixture_server_404s_unknown_pages(server, path):
+    assert requests.get(server.url + path, timeout=5).status_code == 404
+
+
+@pytest.mark.parametrize("platform, adapter_cls", [("amazon", AmazonAdapter), ("flipkart", FlipkartAdapter)])
+def test_scrape_round_trip(engine, platform, adapter_cls):
+    adapter = adapter_cls()
+    expected = adapter.parse(read_fixture(platform, 1)) + adapter.parse(read_fixture(platform, 2))
+    assert expected
+    assert engine.scrape(platform, "laptop", 0, 10_000_000, pages=2) == expected
+
+
+def test_scrape_filters_by_price(engine):
+    products = engine.scrape("amazon", "laptop", 50_000, 100_000, pages=2)
+    assert products
+    assert all(50_000 <= product["price"] <= 100_000 for product in products)
+
+
+def test_iter_scrape_yields_in_page_order(engine):
+    # Page 1 arrives last, but its products still come first
+    fetch = engine.fetch
+
+    def slow_first_page(url):
+        if url.endswith("page=1"):
+            time.sleep(0.3)
+        return fetch(url)
+
+    engine.fetch = slow_first_page
+    adapter = AmazonAdapter()
+    expected = adapter.parse(read_fixture("amazon", 1)) + adapter.parse(read_fixture("amazon", 2))
+    assert list(engine.iter_scrape("amazon", "laptop", 0, 10_000_000, pages=2)) == expected
+
+
+def test_missing_page_raises_scraper_error(engine):
+    with pytest.raises(ScraperError):
+        engine.scrape("amazon", "laptop", 0, 10_000_000, pages=3)
+
+
+def test_unknown_platform(engine):
+    with pytest.raises(ScraperError):
+        engine.scrape("ebay", "laptop", 0, 1000)
+
+
+def flaky_get(engine, monkeypatch, *errors):
+    # Fail with each of `errors` in turn, then fetch normally
+    calls = []
+    real_get = engine.session.get
+
+    def get(url, **kwargs):
+        calls.append(url)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return real_get(url, **kwargs)
+
+    monkeypatch.setattr(engine.session, "get", get)
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    return calls
+
+
+def test_transient_request_errors_are_retried(engine, monkeypatch):
+    engine.max_retries = 3
+    calls = flaky_get(engine, monkeypatch, requests.exceptions.ChunkedEncodingError("cut off"),
+                      requests.ConnectionError("reset"), requests.Timeout("slow"))
+    assert engine.scrape("amazon", "laptop", 0, 10_000_000)
+    assert len(calls) == 4
+
+
+def test_other_request_errors_raise_scraper_error(engine, monkeypatch):
+    engine.max_retries = 3
+    calls = flaky_get(engine, monkeypatch, requests.TooManyRedirects("redirect loop"))
+    with pytest.raises(ScraperError, match="TooManyRedirects"):
+        engine.scrape("amazon", "laptop", 0, 10_000_000)
+    assert len(calls) == 1
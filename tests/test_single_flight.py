@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from single_flight import FlightAbandoned, SingleFlight
+
+
+def test_concurrent_calls_share_one_computation():
+    flights = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def compute():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return {"items": [1, 2]}
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        leader = pool.submit(flights.do, "key", compute)
+        started.wait()
+        followers = [pool.submit(flights.do, "key", compute) for _ in range(3)]
+        results = [leader.result()] + [follower.result() for follower in followers]
+    assert len(calls) == 1
+    assert all(result == {"items": [1, 2]} for result in results)
+    # Followers get copies they can mutate
+    assert all(result is not results[0] for result in results[1:])
+    assert flights.in_flight() == 0
+
+
+def test_different_keys_do_not_coalesce():
+    flights = SingleFlight()
+    assert flights.do("a", lambda: 1) == 1
+    assert flights.do("b", lambda: 2) == 2
+
+
+def test_followers_see_the_leaders_exception():
+    flights = SingleFlight()
+    future, leader = flights.begin("key")
+    follower_future, follower_is_leader = flights.begin("key")
+    assert leader and not follower_is_leader and follower_future is future
+    flights.finish("key", future, error=ValueError("boom"))
+    with pytest.raises(ValueError):
+        future.result()
+    assert flights.in_flight() == 0
+
+
+def test_followers_retry_when_the_leader_is_interrupted():
+    flights = SingleFlight()
+    future, _ = flights.begin("key")
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        follower = pool.submit(flights.do, "key", lambda: "recomputed")
+        time.sleep(0.05)
+        flights.finish("key", future, error=KeyboardInterrupt())
+        assert follower.result(timeout=1) == "recomputed"
+    with pytest.raises(FlightAbandoned):
+        future.result()
+
+
+def test_do_async_coalesces_tasks():
+    flights = SingleFlight()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def main():
+        return await asyncio.gather(*(flights.do_async("key", compute) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["done"] * 5
+    assert len(calls) == 1
@@ -0,0 +1,49 @@
+from streaming_json import ANY, IncrementalJSONParser
+
+WATCH = [("top_products", ANY), ("price_range",), ("sentiment", "overall"), ("sentiment", "positive_points", ANY)]
+
+DOCUMENT = (
+    '```json\n{"top_products": [{"name": "A", "price": 1}, {"name": "B}", "price": 2}], '
+    '"price_range": {"min": 1, "max": 2}, // comment\n'
+    '"sentiment": {"overall": "Positive", "positive_points": ["good \\"x\\"", "ok"], "negative_points": []}}\n```'
+)
+
+
+def feed_in_chunks(parser, text, size):
+    events = []
+    for start in range(0, len(text), size):
+        events += parser.feed(text[start:start + size])
+    return events
+
+
+def test_reports_watched_values_in_document_order():
+    parser = IncrementalJSONParser(WATCH)
+    assert feed_in_chunks(parser, DOCUMENT, 3) == [
+        (("top_products", 0), {"name": "A", "price": 1}),
+        (("top_products", 1), {"name": "B}", "price": 2}),
+        (("price_range",), {"min": 1, "max": 2}),
+        (("sentiment", "overall"), "Positive"),
+        (("sentiment", "positive_points", 0), 'good "x"'),
+        (("sentiment", "positive_points", 1), "ok"),
+    ]
+    assert parser.text == DOCUMENT
+
+
+def test_chunking_does_not_change_the_events():
+    expected = IncrementalJSONParser(WATCH).feed(DOCUMENT)
+    for size in (1, 2, 7, 64):
+        assert feed_in_chunks(IncrementalJSONParser(WATCH), DOCUMENT, size) == expected
+
+
+def test_values_are_reported_as_soon_as_they_are_complete():
+    parser = IncrementalJSONParser(WATCH)
+    first_product_end = DOCUMENT.index("}") + 1
+    assert parser.feed(DOCUMENT[:first_product_end - 1]) == []
+    assert parser.feed(DOCUMENT[first_product_end - 1:first_product_end + 1]) == [
+        (("top_products", 0), {"name": "A", "price": 1}),
+    ]
+
+
+def test_unwatched_paths_are_ignored():
+    parser = IncrementalJSONParser([("sentiment", "overall")])
+    assert parser.feed(DOCUMENT) == [(("sentiment", "overall"), "Positive")]